@@ -1,16 +1,25 @@
 import numpy as np
+import scipy.sparse as sp
 
-def apply_dirichlet(K, F, vertices):
+def apply_dirichlet(K, F, vertices, elements=None, element_type=None, boundary_nodes=None, boundary_tags=None):
     """
     Aplica as condições de contorno de Dirichlet em uma matriz rigidez (K) e um vetor força (F), 
     considerando que as condições de contorno são impostas na borda do domínio delimitado 
     pelos vértices dados em 'vertices'.
+
+    Os nós de contorno são, nesta ordem de preferência: boundary_nodes; os nós das arestas que
+    pertencem a um único elemento (com os nós de ordem alta), se a conectividade for dada; ou,
+    sem conectividade, os nós sobre a caixa envolvente dos vértices (domínios retangulares).
     
     Parameters:
-    K (numpy array): Matriz de rigidez do sistema.
+    K (numpy array ou scipy.sparse matrix): Matriz de rigidez do sistema.
     F (numpy array): Vetor de força do sistema.
     vertices (list of tuples): Lista de vértices do domínio, onde cada vértice é uma tupla (x, y) 
         com as coordenadas do vértice.
+    elements (numpy array): Conectividade da malha (opcional; exige element_type).
+    element_type (str): Tipo de elemento ('tri' ou 'quad').
+    boundary_nodes (array): Índices dos nós de Dirichlet já conhecidos (por exemplo, Mesh.boundary_nodes()).
+    boundary_tags (int ou iterável): Com uma malha mesh_topology.Mesh em vertices, os lados de Dirichlet.
     
     Returns:
     K (numpy array): Matriz de rigidez do sistema com as condições de contorno de Dirichlet 
@@ -34,15 +43,45 @@ def apply_dirichlet(K, F, vertices):
     if K.shape[0] != K.shape[1] or K.shape[0] != F.shape[0]:
         raise ValueError("Matriz K e vetor F devem ter as mesmas dimensões")
 
-    # Aplica as condições de contorno de Dirichlet    
-    boundary_nodes = [i for i, (x, y) in enumerate(vertices) if x in [0, 1] or y in [0, 1]]
+    # Nós de contorno pela topologia da malha (ou pela caixa envolvente, sem conectividade)
+    if boundary_nodes is None:
+        boundary_nodes = find_boundary_nodes(vertices, elements, element_type, boundary_tags)
+    boundary_nodes = np.asarray(boundary_nodes, dtype=np.int64)
+    if np.any(boundary_nodes < 0) or np.any(boundary_nodes >= len(F)):
+        raise IndexError("Índice de nó fora do intervalo")
+
+    # Aplica as condições de contorno de Dirichlet: linhas e colunas anuladas e diagonal 1
+    if sp.issparse(K):
+        free = np.ones(K.shape[0])
+        free[boundary_nodes] = 0.0
+        K = (sp.diags(free) @ K @ sp.diags(free) + sp.diags(1.0 - free)).asformat(K.format)
+    else:
+        K[boundary_nodes, :] = 0
+        K[:, boundary_nodes] = 0
+        K[boundary_nodes, boundary_nodes] = 1
+    F[boundary_nodes] = 0
+
+    return K, F
+
+def find_boundary_nodes(vertices, elements=None, element_type=None, boundary_tags=None):
+    """
+    Nós de contorno: pela topologia quando há conectividade (ou uma mesh_topology.Mesh em vertices),
+    senão os nós sobre a caixa envolvente dos vértices.
+
+    Returns:
+    - boundary_nodes (ndarray): Índices ordenados dos nós de contorno.
+    """
+    from mesh_topology import Mesh
 
-    for node in boundary_nodes:
-        if node < 0 or node >= len(F):
-            raise IndexError("Índice de nó fora do intervalo")
-        K[node, :] = 0
-        K[:, node] = 0
-        K[node, node] = 1
-        F[node] = 0
+    if isinstance(vertices, Mesh):
+        return vertices.boundary_nodes(boundary_tags)
+    if elements is not None:
+        if element_type is None:
+            raise ValueError("O tipo de elemento é necessário para encontrar o contorno pela conectividade")
+        return Mesh(vertices, elements, element_type).boundary_nodes()
 
-    return K, F    
\ No newline at end of file
+    vertices = np.asarray(vertices, dtype=float)[:, :2]
+    low, high = vertices.min(axis=0), vertices.max(axis=0)
+    tol = 1e-10 * max(np.max(high - low), 1.0)
+    on_boundary = np.any((np.abs(vertices - low) < tol) | (np.abs(vertices - high) < tol), axis=1)
+    return np.flatnonzero(on_boundary)    
\ No newline at end of file
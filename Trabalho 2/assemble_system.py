@@ -2,12 +2,14 @@ import numpy as np
 import scipy as sp
 from scipy.sparse import lil_matrix
 from calculate_polygon_vertices import calculate_polygon_vertices
-from gauss_quadrature_points2 import gauss_quadrature_points2
-from shape_functions import shape_functions
-from numpy.linalg import matrix_rank
+from reference_tables import reference_tables
+from assemble_system_vectorized import assemble_system_vectorized
+from parallel_assembly import assemble_system_parallel
+from quadrature_selection import quadrature_degrees
 
 # Função para montar o sistema FEM
-def assemble_system(vertices, elements, order, type_element):
+def assemble_system(vertices, elements, order, type_element, engine='vectorized', num_workers=None, basis='lagrange',
+                    quadrature_degree=None):
     """
     Monta o sistema FEM para um problema de equação de Poisson.
 
@@ -16,10 +18,17 @@ def assemble_system(vertices, elements, order, type_element):
     - elements (lista de array): Conectividade da malha onde cada entrada lista os índices de vértices de um elemento.
     - order (int): A ordem polinomial para as funções de forma.
     - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - engine (str): 'vectorized' monta todos os elementos de uma só vez (padrão); 'parallel' divide os
+      elementos em blocos montados em processos separados; 'loop' itera elemento a elemento.
+    - num_workers (int): Número de processos do modo 'parallel'. Se None, usa o número de CPUs.
+    - basis (str): 'lagrange' (nodal) ou 'hierarchical' (modos de vértice, aresta e bolha; modos 'vectorized' e 'parallel').
+    - quadrature_degree (int ou dict): Grau da quadratura. Se None, é escolhido pelo grau p da base (2p - 2 na rigidez
+      de triângulos afins, 2p na fonte; ver quadrature_selection); um inteiro ou um dicionário
+      {'stiffness': ..., 'load': ...} substitui a escolha.
 
     Saída:
     - tupla: Uma tupla contendo:
-        - K (scipy.sparse.csc_matrix): A matriz de rigidez global montada em formato de coluna esparsa compactada.
+        - K (scipy.sparse matrix): A matriz de rigidez global montada (CSR nos modos 'vectorized' e 'parallel', CSC no modo 'loop').
         - F (numpy.ndarray): O vetor de força global montado.
     """
     # Verifica se as entradas são vazias
@@ -37,6 +46,22 @@ def assemble_system(vertices, elements, order, type_element):
     # Verifica se os elementos da malha são triângulos ou quadriláteros
     if type_element not in ['tri', 'quad']:
         raise ValueError("Tipo de elemento inválido. Deve ser 'tri' ou 'quad'")
+
+    # Verifica o modo de montagem
+    if engine not in ['vectorized', 'parallel', 'loop']:
+        raise ValueError("Modo de montagem inválido. Deve ser 'vectorized', 'parallel' ou 'loop'")
+
+    # Monta todos os elementos de uma só vez
+    if engine == 'vectorized':
+        return assemble_system_vectorized(vertices, elements, order, type_element, basis=basis, quadrature_degree=quadrature_degree)
+
+    # Monta blocos de elementos em paralelo
+    if engine == 'parallel':
+        return assemble_system_parallel(vertices, elements, order, type_element, num_workers, basis=basis,
+                                        quadrature_degree=quadrature_degree)
+
+    if basis != 'lagrange':
+        raise ValueError("O modo 'loop' usa apenas a base de Lagrange.")
     
     # Número de nós
     num_nodes = len(vertices)
@@ -48,11 +73,11 @@ def assemble_system(vertices, elements, order, type_element):
     # Função de fonte
     source_function = lambda x, y: 2 * np.pi**2 * np.sin(np.pi * x) * np.sin(np.pi * y) 
 
-    # Calcula os pontos de Gauss e seus pesos para o triângulo ou quadrilátero
-    gauss_points = gauss_quadrature_points2(type_element, order)
-    
-    # Calcula as funções de forma e seus gradientes
-    shape_funcs, grad_shape_funcs = shape_functions(order)
+    # Pontos de Gauss, pesos e tabela das funções de forma e gradientes no elemento de referência
+    # (uma regra para a rigidez e outra para a fonte, como no modo 'vectorized')
+    degrees = quadrature_degrees(vertices, elements, type_element, ('stiffness', 'load'), quadrature_degree=quadrature_degree)
+    _, weights, _, dN = reference_tables(type_element, degrees['stiffness'], np.shape(elements)[1])
+    _, weights_load, N_load, dN_load = reference_tables(type_element, degrees['load'], np.shape(elements)[1])
 
     # Itera sobre os elementos
     for element in elements:
@@ -64,17 +89,14 @@ def assemble_system(vertices, elements, order, type_element):
         K_element = np.zeros((num_element_nodes, num_element_nodes))
         F_element = np.zeros(num_element_nodes)
 
-        # Itera sobre os pontos de Gauss
-        for (xi, yi, weight) in gauss_points:
-            x_gauss = sum(node_coords[i][0] * shape_funcs[i](xi, yi) for i in range(num_element_nodes))
-            y_gauss = sum(node_coords[i][1] * shape_funcs[i](xi, yi) for i in range(num_element_nodes))
-
+        # Itera sobre os pontos de Gauss da rigidez
+        for q, weight in enumerate(weights):
             # Calcula o Jacobiano
             J = np.array([
-                [sum(node_coords[i][0] * grad_shape_funcs[i][0](xi, yi) for i in range(num_element_nodes)),
-                 sum(node_coords[i][0] * grad_shape_funcs[i][1](xi, yi) for i in range(num_element_nodes))],
-                [sum(node_coords[i][1] * grad_shape_funcs[i][0](xi, yi) for i in range(num_element_nodes)),
-                 sum(node_coords[i][1] * grad_shape_funcs[i][1](xi, yi) for i in range(num_element_nodes))]
+                [sum(node_coords[i][0] * dN[q, i, 0] for i in range(num_element_nodes)),
+                 sum(node_coords[i][0] * dN[q, i, 1] for i in range(num_element_nodes))],
+                [sum(node_coords[i][1] * dN[q, i, 0] for i in range(num_element_nodes)),
+                 sum(node_coords[i][1] * dN[q, i, 1] for i in range(num_element_nodes))]
             ])
 
             # Calcula o determinante do Jacobiano
@@ -85,21 +107,23 @@ def assemble_system(vertices, elements, order, type_element):
             # Calcula a inversa do Jacobiano
             invJ = np.linalg.inv(J)
 
-            # Calcula a área do elemento
-            if type_element == 'tri':
-                element_area = 0.5 * abs(detJ)
-            elif type_element == 'quad':
-                element_area = abs(detJ)
-            else:
-                raise ValueError("Tipo de elemento desconhecido.")
+            # Calcula a área do elemento (os pesos do triângulo de referência somam 1/2)
+            element_area = abs(detJ)
             
             # Itera sobre as funções de forma
             for i in range(num_element_nodes):
                 for j in range(num_element_nodes):
-                    grad_Ni = invJ.T @ np.array([grad_shape_funcs[i][0](xi, yi), grad_shape_funcs[i][1](xi, yi)])
-                    grad_Nj = invJ.T @ np.array([grad_shape_funcs[j][0](xi, yi), grad_shape_funcs[j][1](xi, yi)])
+                    grad_Ni = invJ.T @ dN[q, i]
+                    grad_Nj = invJ.T @ dN[q, j]
                     K_element[i, j] += (grad_Ni @ grad_Nj) * element_area * weight
-                F_element[i] += source_function(x_gauss, y_gauss) * shape_funcs[i](xi, yi) * element_area * weight
+
+        # Itera sobre os pontos de Gauss da fonte
+        for q, weight in enumerate(weights_load):
+            x_gauss = sum(node_coords[i][0] * N_load[q, i] for i in range(num_element_nodes))
+            y_gauss = sum(node_coords[i][1] * N_load[q, i] for i in range(num_element_nodes))
+            detJ = np.linalg.det(node_coords[:, :2].T @ dN_load[q])
+            for i in range(num_element_nodes):
+                F_element[i] += source_function(x_gauss, y_gauss) * N_load[q, i] * abs(detJ) * weight
 
         # Adiciona a matriz de rigidez e o vetor de força ao sistema global
         for i in range(num_element_nodes):
@@ -107,47 +131,8 @@ def assemble_system(vertices, elements, order, type_element):
                 K_global[node_indices[i], node_indices[j]] += K_element[i, j]
             F_global[node_indices[i]] += F_element[i]
         
-        # Verifica se a matriz de rigidez global é esparsa
-        if K_global.getnnz() == 0:
-            raise ValueError("Matriz de rigidez global é esparsa.")
-        
-        n = K_global.shape[0]
-
-        # Verifica se a matriz de rigidez global é singular
-        try:
-            if(np.linalg.matrix_rank(K_global.toarray()) < n):
-                raise ValueError("Matriz de rigidez global é singular. Tentativa de 'regularização'.")
-            K_global += 1e-6 * np.eye(n)
-        except:
-            pass
-        
-        try:
-            if(np.linalg.matrix_rank(K_global.toarray()) < n):
-                raise ValueError("Matriz de rigidez global é singular. Tentativa de aplicação de 'técnica de pre-condicionamento'.")
-            K_global = preconditioner(K_global)
-        except:
-            pass    
-        
-        try:
-            if(np.linalg.matrix_rank(K_global.toarray()) < n):
-                raise ValueError("Matriz de rigidez global é singular. Provavelmente a matriz é singular por natureza.")
-        except:
-            pass
-    
     return K_global.tocsc(), F_global
 
-def preconditioner(K):
-    """
-    Preconditioner diagonal para o sistema linear.
-    
-    Parameters:
-    K (scipy.sparse matrix): Matriz de rigidez do sistema.
-    
-    Returns:
-    (numpy array): Inversa da diagonal da matriz de rigidez.
-    """
-    return np.linalg.inv(K.diagonal())
-
 # # Exemplo de uso
 # type_element = 'quad'  # Tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero
 # order = 1  # Grau do polinômio
@@ -0,0 +1,268 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from element_geometry import element_geometry
+from hierarchical_basis import check_basis, edge_orientation, orient_local_systems
+from memory_mode import as_index_array
+from numba_kernels import assemble_numba, numba_enabled
+from quadrature_selection import quadrature_degrees
+from reference_tables import reference_tables
+from reference_tensors import affine_stiffness_matrices
+from sparsity_pattern import get_sparsity_pattern, numeric_assembly
+from sum_factorization import check_sum_factorization, sum_factorized_local_systems
+
+# Função de fonte padrão do problema de Poisson (definida com def para poder ser enviada a outros processos)
+def default_source_function(x, y):
+    return 2 * np.pi**2 * np.sin(np.pi * x) * np.sin(np.pi * y)
+
+# Função para montar o sistema FEM de todos os elementos de uma só vez
+def assemble_system_vectorized(vertices, elements, order, type_element, source_function=None, coefficient=1.0, affine='auto', kernel='standard',
+                               basis='lagrange', quadrature_degree=None):
+    """
+    Monta o sistema FEM para um problema de equação de Poisson processando todos os elementos
+    e pontos de Gauss simultaneamente.
+
+    O padrão de esparsidade de K é calculado uma única vez por malha (fase simbólica) e
+    reaproveitado; novas fontes ou coeficientes na mesma malha custam apenas a fase numérica.
+
+    Args:
+    - vertices (ndarray): Coordenadas dos nós da malha, formato (n_nos, 2).
+    - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento).
+    - order (int): A ordem polinomial para as funções de forma.
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - source_function (callable): Função de fonte f(x, y). Se None, usa default_source_function.
+    - coefficient (float ou callable): Coeficiente de difusão k ou função k(x, y).
+    - affine (bool ou str): Detecção de elementos afins ('auto'), malha toda afim (True) ou caminho geral (False).
+    - kernel (str): 'standard' (quadratura tabelada) ou 'sum_factorization' (quadriláteros Q_p, contrações 1D).
+    - basis (str): 'lagrange' (nodal) ou 'hierarchical' (modos de vértice, aresta e bolha nas mesmas posições
+      locais dos nós; ver hierarchical_basis).
+    - quadrature_degree (int ou dict): Grau da quadratura. Se None, é escolhido por integrando (2p - 2 na
+      rigidez de triângulos afins, 2p na fonte; ver quadrature_selection); um inteiro vale para todos os
+      integrandos e um dicionário {'stiffness': ..., 'load': ...} substitui apenas os listados.
+
+    Returns:
+    - K (scipy.sparse.csr_matrix): A matriz de rigidez global em formato de linha esparsa compactada.
+    - F (numpy.ndarray): O vetor de força global.
+    """
+    # Verifica se as entradas são vazias
+    if vertices is None or elements is None:
+        raise ValueError("Matriz K, vetor F, ou vértices não podem ser vazios")
+
+    # Verifica se os elementos da malha são triângulos ou quadriláteros
+    if type_element not in ['tri', 'quad']:
+        raise ValueError("Tipo de elemento inválido. Deve ser 'tri' ou 'quad'")
+
+    vertices = np.asarray(vertices, dtype=float)[:, :2]
+    elements = as_index_array(elements)
+    num_nodes = len(vertices)
+
+    # Backend Numba: geometria, matrizes locais e soma global fundidas em um único laço compilado
+    if numba_enabled() and kernel == 'standard' and basis == 'lagrange':
+        return assemble_system_numba(vertices, elements, order, type_element, source_function, coefficient, quadrature_degree)
+
+    # Matrizes e vetores locais de todos os elementos
+    K_local, F_local = compute_local_systems(vertices, elements, order, type_element, source_function, coefficient, affine, kernel,
+                                             basis, quadrature_degree)
+
+    # Fase simbólica (em cache por malha) e fase numérica
+    pattern = get_sparsity_pattern(elements, num_nodes)
+    K_global = numeric_assembly(pattern, K_local, num_nodes)
+    F_global = np.bincount(elements.ravel(), weights=F_local.ravel(), minlength=num_nodes)
+
+    return K_global, F_global
+
+def assemble_load_vector(vertices, elements, order, type_element, source_function=None, basis='lagrange', quadrature_degree=None):
+    """
+    Monta apenas o vetor de força global, sem recalcular a matriz de rigidez (por exemplo,
+    quando somente a fonte mudou).
+
+    Args:
+    - vertices (ndarray): Coordenadas dos nós da malha, formato (n_nos, 2).
+    - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento).
+    - order (int): A ordem polinomial para as funções de forma.
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - source_function (callable): Função de fonte f(x, y). Se None, usa default_source_function.
+    - basis (str): 'lagrange' ou 'hierarchical'.
+    - quadrature_degree (int ou dict): Grau da quadratura da fonte (None: 2p; ver quadrature_selection).
+
+    Returns:
+    - F (numpy.ndarray): O vetor de força global.
+    """
+    if source_function is None:
+        source_function = default_source_function
+    check_basis(basis)
+
+    vertices = np.asarray(vertices, dtype=float)[:, :2]
+    elements = as_index_array(elements)
+
+    degrees = quadrature_degrees(vertices, elements, type_element, ('load',), quadrature_degree=quadrature_degree)
+    F_local = local_load_vectors(vertices[elements], type_element, degrees['load'], source_function, basis)
+    if basis == 'hierarchical':
+        local_index, signs = edge_orientation(elements, type_element)
+        F_local = np.take_along_axis(F_local, local_index, axis=1) * signs
+
+    return np.bincount(elements.ravel(), weights=F_local.ravel(), minlength=len(vertices))
+
+def local_load_vectors(node_coords, type_element, quadrature_degree, source_function, basis='lagrange'):
+    """
+    Vetores de força locais de todos os elementos, nas funções de referência da base (com a base
+    hierárquica, antes da orientação das arestas).
+
+    Args:
+    - node_coords (ndarray): Coordenadas dos nós de cada elemento, formato (n_elementos, n_nos, 2).
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - quadrature_degree (int): Grau da quadratura.
+    - source_function (callable): Função de fonte f(x, y).
+    - basis (str): 'lagrange' ou 'hierarchical'.
+
+    Returns:
+    - F_local (ndarray): Vetores de força locais, formato (n_elementos, n_nos).
+    """
+    num_element_nodes = node_coords.shape[1]
+
+    # Medida de integração em cada ponto de Gauss
+    points, weights, N, dN = reference_tables(type_element, quadrature_degree, num_element_nodes)
+    _, detJ, _, _ = element_geometry(node_coords, dN, affine_gradients=False)
+    dx = np.abs(detJ) * weights
+
+    x_gauss = np.einsum('eai,qa->eqi', node_coords, N)
+    if basis != 'lagrange':
+        _, _, N, _ = reference_tables(type_element, quadrature_degree, num_element_nodes, basis)
+    return np.einsum('eq,qa->ea', source_function(x_gauss[..., 0], x_gauss[..., 1]) * dx, N)
+
+def assemble_system_numba(vertices, elements, order, type_element, source_function=None, coefficient=1.0, quadrature_degree=None):
+    """
+    Monta o sistema FEM com o núcleo Numba (ver numba_kernels). A fonte e o coeficiente são
+    avaliados nos pontos de Gauss com NumPy; o restante é feito no laço compilado, em paralelo
+    por cores de elementos sem nós compartilhados.
+
+    Args e Returns: ver assemble_system_vectorized.
+    """
+    if source_function is None:
+        source_function = default_source_function
+
+    num_nodes = len(vertices)
+
+    # Regra da rigidez no laço compilado; se a fonte pede outra regra, F é montado à parte
+    degrees = quadrature_degrees(vertices, elements, type_element, ('stiffness', 'load'), quadrature_degree=quadrature_degree)
+    points, weights, N, dN = reference_tables(type_element, degrees['stiffness'], elements.shape[1])
+    fused_load = degrees['load'] == degrees['stiffness']
+
+    # Fonte e coeficiente nos pontos de Gauss
+    node_coords = vertices[elements]
+    x_gauss = np.einsum('eai,qa->eqi', node_coords, N)
+    if fused_load:
+        f_values = np.broadcast_to(source_function(x_gauss[..., 0], x_gauss[..., 1]), x_gauss.shape[:2])
+    else:
+        f_values = np.zeros(x_gauss.shape[:2])
+    if callable(coefficient):
+        k_values = np.broadcast_to(coefficient(x_gauss[..., 0], x_gauss[..., 1]), x_gauss.shape[:2])
+    else:
+        k_values = np.full(x_gauss.shape[:2], float(coefficient))
+
+    pattern = get_sparsity_pattern(elements, num_nodes)
+    data, F_global = assemble_numba(node_coords, elements, dN, N, weights, k_values, f_values,
+                                    pattern, num_nodes)
+    K_global = csr_matrix((data, pattern[1], pattern[0]), shape=(num_nodes, num_nodes))
+
+    if not fused_load:
+        F_local = local_load_vectors(node_coords, type_element, degrees['load'], source_function)
+        F_global = np.bincount(elements.ravel(), weights=F_local.ravel(), minlength=num_nodes)
+
+    return K_global, F_global
+
+def compute_local_systems(vertices, elements, order, type_element, source_function=None, coefficient=1.0, affine='auto', kernel='standard',
+                          basis='lagrange', quadrature_degree=None):
+    """
+    Calcula as matrizes de rigidez e os vetores de força de todos os elementos.
+
+    Args:
+    - vertices (ndarray): Coordenadas dos nós da malha, formato (n_nos, 2).
+    - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento).
+    - order (int): A ordem polinomial para as funções de forma.
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - source_function (callable): Função de fonte f(x, y). Se None, usa default_source_function.
+    - coefficient (float ou callable): Coeficiente de difusão k ou função k(x, y).
+    - affine (bool ou str): Detecção de elementos afins ('auto'), malha toda afim (True) ou caminho geral (False).
+    - kernel (str): 'standard' (quadratura tabelada) ou 'sum_factorization' (quadriláteros Q_p, contrações 1D).
+    - basis (str): 'lagrange' ou 'hierarchical'. Com a base hierárquica, as matrizes e vetores já saem
+      nas posições locais da malha, com a orientação das arestas aplicada (ver edge_orientation).
+    - quadrature_degree (int ou dict): Grau da quadratura. Se None, é escolhido por integrando (2p - 2 na
+      rigidez de triângulos afins, 2p na fonte; ver quadrature_selection); um inteiro vale para todos os
+      integrandos e um dicionário {'stiffness': ..., 'load': ...} substitui apenas os listados.
+
+    Returns:
+    - K_local (ndarray): Matrizes de rigidez locais, formato (n_elementos, n_nos_elemento, n_nos_elemento).
+    - F_local (ndarray): Vetores de força locais, formato (n_elementos, n_nos_elemento).
+    """
+    if source_function is None:
+        source_function = default_source_function
+
+    if kernel not in ['standard', 'sum_factorization']:
+        raise ValueError("Núcleo inválido. Deve ser 'standard' ou 'sum_factorization'")
+    check_basis(basis)
+
+    num_element_nodes = elements.shape[1]
+
+    # Graus da quadratura da rigidez e da fonte
+    degrees = quadrature_degrees(vertices, elements, type_element, ('stiffness', 'load'), affine, quadrature_degree)
+
+    # Quadriláteros Q_p: núcleo de fatoração de somas, uma regra tensorial para K e F
+    if kernel == 'sum_factorization':
+        if basis != 'lagrange':
+            raise ValueError("O núcleo 'sum_factorization' usa apenas a base de Lagrange.")
+        degree = check_sum_factorization(type_element, num_element_nodes)
+        num_points_1d = max(degrees.values()) // 2 + 1
+        return sum_factorized_local_systems(vertices[elements], degree, num_points_1d, source_function, coefficient)
+
+    # Pontos de Gauss, pesos e tabela das funções de forma no elemento de referência
+    points, weights, N, dN = reference_tables(type_element, degrees['stiffness'], num_element_nodes)
+
+    # Funções da solução: as de Lagrange (as mesmas da geometria) ou os modos hierárquicos
+    if basis == 'lagrange':
+        N_basis, dN_basis = N, dN
+    else:
+        _, _, N_basis, dN_basis = reference_tables(type_element, degrees['stiffness'], num_element_nodes, basis)
+
+    # Coordenadas dos nós de cada elemento, formato (n_elementos, n_nos_elemento, 2)
+    node_coords = vertices[elements]
+
+    # Com coeficiente constante, a rigidez dos elementos afins vem dos tensores de referência
+    use_reference_tensors = affine is not False and not callable(coefficient)
+
+    # Jacobianos, determinantes e gradientes físicos de todos os elementos
+    _, detJ, grad_N, is_affine = element_geometry(node_coords, dN, affine, affine_gradients=not use_reference_tensors,
+                                                  basis_gradients=dN_basis)
+
+    # Medida de integração em cada ponto de Gauss
+    dx = np.abs(detJ) * weights
+
+    # Coordenadas físicas dos pontos de Gauss
+    x_gauss = np.einsum('eai,qa->eqi', node_coords, N)
+
+    # Coeficiente de difusão nos pontos de Gauss
+    if callable(coefficient):
+        k_dx = coefficient(x_gauss[..., 0], x_gauss[..., 1]) * dx
+    else:
+        k_dx = coefficient * dx
+
+    # Matrizes de rigidez: elementos afins por produto com os tensores de referência, os demais por
+    # quadratura (contração sem 'optimize', para que o resultado não dependa do tamanho do bloco)
+    quadrature = ~is_affine if use_reference_tensors else np.ones(len(elements), dtype=bool)
+    K_local = np.empty((len(elements), num_element_nodes, num_element_nodes))
+    if np.any(~quadrature):
+        K_local[~quadrature] = affine_stiffness_matrices(node_coords[~quadrature], type_element, degrees['stiffness'], coefficient,
+                                                         basis)
+    if np.any(quadrature):
+        K_local[quadrature] = np.einsum('eqai,eqbi->eab', grad_N[quadrature] * k_dx[quadrature, :, None, None], grad_N[quadrature])
+
+    # Vetores de força de todos os elementos (com a mesma regra da rigidez, a geometria é reaproveitada)
+    if degrees['load'] == degrees['stiffness']:
+        F_local = np.einsum('eq,qa->ea', source_function(x_gauss[..., 0], x_gauss[..., 1]) * dx, N_basis)
+    else:
+        F_local = local_load_vectors(node_coords, type_element, degrees['load'], source_function, basis)
+
+    # Base hierárquica: modos de referência levados às posições locais da malha
+    if basis == 'hierarchical':
+        K_local, F_local = orient_local_systems(K_local, F_local, *edge_orientation(elements, type_element))
+
+    return K_local, F_local
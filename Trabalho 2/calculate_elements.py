@@ -32,10 +32,11 @@ def calculate_elements(type_element):
     
     return faces
 
-# Exemplo de uso
-type_element = 'tri'
-vertices = calculate_polygon_vertices(type_element)
-faces = calculate_elements(type_element)
+if __name__ == '__main__':
+    # Exemplo de uso
+    type_element = 'tri'
+    vertices = calculate_polygon_vertices(type_element)
+    faces = calculate_elements(type_element)
 
-#print("Vértices do polígono:", vertices)
-print("Faces do polígono:", faces)
\ No newline at end of file
+    #print("Vértices do polígono:", vertices)
+    print("Faces do polígono:", faces)
@@ -1,10 +1,11 @@
 import numpy as np
-import gauss_points
-from gauss_quadrature_points2 import gauss_quadrature_points2
-import shape_functions
-from shape_functions import shape_functions
+from reference_tables import reference_tables
+from calculate_errors_vectorized import calculate_errors_vectorized
+from parallel_assembly import calculate_errors_parallel
+from quadrature_selection import quadrature_degrees
 
-def calculate_errors(vertices, elements, u_numeric, u_exact, order, element_type):
+def calculate_errors(vertices, elements, u_numeric, u_exact, order, element_type, engine='vectorized', num_workers=None,
+                     basis='lagrange', quadrature_degree=None):
     """
     Calcular erros L2 e de energia entre as soluções numéricas e exatas.
 
@@ -20,6 +21,19 @@ def calculate_errors(vertices, elements, u_numeric, u_exact, order, element_type
         Solução exata nos vértices.
         order : int
         Ordem dos polinômios de Lagrange usados ​​no cálculo.
+        element_type : str
+        Tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+        engine : str
+        'vectorized' processa todos os elementos de uma só vez (padrão); 'parallel' divide os
+        elementos em blocos processados em processos separados; 'loop' itera elemento a elemento.
+        num_workers : int
+        Número de processos do modo 'parallel'. Se None, usa o número de CPUs.
+        basis : str
+        'lagrange' (u_numeric são valores nodais) ou 'hierarchical' (coeficientes modais; modos
+        'vectorized' e 'parallel').
+        quadrature_degree : int ou dict
+        Grau da quadratura dos erros. Se None, 2p + 2 para a base de grau p (ver quadrature_selection);
+        um inteiro ou um dicionário {'error': ...} substitui a escolha.
 
     Retorna
     -------
@@ -40,15 +54,30 @@ def calculate_errors(vertices, elements, u_numeric, u_exact, order, element_type
     # if vertices.ndim != 2 or elements.ndim != 2 or u_numeric.ndim != 1 or u_exact.ndim != 1:
     #     raise ValueError("Input arrays must have 2 dimensions and 1 dimension respectively")
     
+    # Verificar o modo de cálculo
+    if engine not in ['vectorized', 'parallel', 'loop']:
+        raise ValueError("Modo de cálculo inválido. Deve ser 'vectorized', 'parallel' ou 'loop'")
+
+    # Calcular os erros de todos os elementos de uma só vez
+    if engine == 'vectorized':
+        return calculate_errors_vectorized(vertices, elements, u_numeric, order, element_type, basis=basis,
+                                           quadrature_degree=quadrature_degree)
+
+    # Calcular os erros de blocos de elementos em paralelo
+    if engine == 'parallel':
+        return calculate_errors_parallel(vertices, elements, u_numeric, order, element_type, num_workers, basis=basis,
+                                         quadrature_degree=quadrature_degree)
+
+    if basis != 'lagrange':
+        raise ValueError("O modo 'loop' usa apenas a base de Lagrange.")
+
     # Inicializar os erros
     l2_error = 0
     energy_error = 0
 
-    # Calcular os pontos de Gauss
-    gauss_points = gauss_quadrature_points2(element_type, order)
-
-    # Calcular as funções de forma
-    N, dN = shape_functions(order)
+    # Pontos de Gauss, pesos e tabela das funções de forma e gradientes no elemento de referência
+    degrees = quadrature_degrees(vertices, elements, element_type, ('error',), quadrature_degree=quadrature_degree)
+    _, weights, N, dN = reference_tables(element_type, degrees['error'], np.shape(elements)[1])
 
     try:
         # Calcular os erros para cada elemento
@@ -61,16 +90,16 @@ def calculate_errors(vertices, elements, u_numeric, u_exact, order, element_type
             u_numeric_vals = u_numeric[node_indices]
 
             # Calcular os erros
-            for (xi, yi, weight) in gauss_points:
-                x_gauss = sum(node_coords[i][0] * N[i](xi, yi) for i in range(len(node_indices)))
-                y_gauss = sum(node_coords[i][1] * N[i](xi, yi) for i in range(len(node_indices)))
+            for q, weight in enumerate(weights):
+                x_gauss = sum(node_coords[i][0] * N[q, i] for i in range(len(node_indices)))
+                y_gauss = sum(node_coords[i][1] * N[q, i] for i in range(len(node_indices)))
 
                 # Calcular o Jacobiano
                 J = np.array([
-                    [sum(node_coords[i][0] * dN[i](xi, yi)[0] for i in range(len(node_indices))),
-                     sum(node_coords[i][0] * dN[i](xi, yi)[1] for i in range(len(node_indices)))],
-                    [sum(node_coords[i][1] * dN[i](xi, yi)[0] for i in range(len(node_indices))),
-                     sum(node_coords[i][1] * dN[i](xi, yi)[1] for i in range(len(node_indices)))]                    ])
+                    [sum(node_coords[i][0] * dN[q, i, 0] for i in range(len(node_indices))),
+                     sum(node_coords[i][0] * dN[q, i, 1] for i in range(len(node_indices)))],
+                    [sum(node_coords[i][1] * dN[q, i, 0] for i in range(len(node_indices))),
+                     sum(node_coords[i][1] * dN[q, i, 1] for i in range(len(node_indices)))]                    ])
 
                 # Calcular o determinante e a inversa do Jacobiano
                 detJ = np.linalg.det(J)
@@ -78,17 +107,12 @@ def calculate_errors(vertices, elements, u_numeric, u_exact, order, element_type
                     raise ValueError("O determinante jacobiano é zero, verifique os vértices de entrada para colinearidade")
                 invJ = np.linalg.inv(J)
 
-                # Calcular a área
-                if type == "tri":
-                    area = 0.5 * abs(detJ)
-                elif type == "quad":
-                    area = abs(detJ)
-                else:
-                    raise ValueError("Tipo de elemento desconhecido")
+                # Calcular a área (os pesos do triângulo de referência somam 1/2)
+                area = abs(detJ)
 
                 # Soluções exata e numérica
                 u_exact_gauss = np.sin(np.pi * x_gauss) * np.sin(np.pi * y_gauss)
-                u_numeric_gauss = sum(u_numeric_vals[i] * N[i](xi, yi) for i in range(len(node_indices)))
+                u_numeric_gauss = sum(u_numeric_vals[i] * N[q, i] for i in range(len(node_indices)))
 
                 # Calcular os erros L2
                 l2_error += ((u_exact_gauss - u_numeric_gauss) ** 2) * area * weight
@@ -102,7 +126,7 @@ def calculate_errors(vertices, elements, u_numeric, u_exact, order, element_type
                 # Calcular o gradiente numérico
                 grad_u_numeric = np.zeros(2)
                 for i in range(len(node_indices)):
-                    grad_Ni = invJ.T @ dN[i](xi, yi)
+                    grad_Ni = invJ.T @ dN[q, i]
                     grad_u_numeric += u_numeric_vals[i] * grad_Ni
 
                 # Calcular o erro de energia
@@ -0,0 +1,127 @@
+import numpy as np
+from element_geometry import element_geometry
+from hierarchical_basis import check_basis, edge_orientation, modal_coefficients
+from memory_mode import as_index_array
+from numba_kernels import element_errors_numba, numba_enabled
+from quadrature_selection import quadrature_degrees
+from reference_tables import reference_tables
+from sum_factorization import check_sum_factorization, sum_factorized_element_errors
+
+# Solução exata padrão do problema de Poisson
+def default_exact_solution(x, y):
+    return np.sin(np.pi * x) * np.sin(np.pi * y)
+
+# Gradiente da solução exata padrão
+def default_exact_gradient(x, y):
+    return np.stack([np.pi * np.cos(np.pi * x) * np.sin(np.pi * y),
+                     np.pi * np.sin(np.pi * x) * np.cos(np.pi * y)], axis=-1)
+
+def calculate_errors_vectorized(vertices, elements, u_numeric, order, element_type, affine='auto', kernel='standard', basis='lagrange',
+                                quadrature_degree=None):
+    """
+    Calcula os erros L2 e de energia processando todos os elementos e pontos de Gauss
+    simultaneamente.
+
+    Args:
+    - vertices (ndarray): Coordenadas dos nós da malha, formato (n_nos, 2).
+    - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento).
+    - u_numeric (ndarray): Solução numérica nos nós.
+    - order (int): Ordem dos polinômios de Lagrange usados no cálculo.
+    - element_type (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - affine (bool ou str): Detecção de elementos afins ('auto'), malha toda afim (True) ou caminho geral (False).
+    - kernel (str): 'standard' (quadratura tabelada) ou 'sum_factorization' (quadriláteros Q_p, contrações 1D).
+    - basis (str): 'lagrange' (u_numeric são valores nodais) ou 'hierarchical' (u_numeric são coeficientes modais).
+    - quadrature_degree (int ou dict): Grau da quadratura dos erros. Se None, 2p + 2 (a solução exata não é
+      polinomial; ver quadrature_selection); um inteiro ou um dicionário {'error': ...} substitui a escolha.
+
+    Returns:
+    - l2_error (float): Erro L2 entre as soluções numérica e exata.
+    - energy_error (float): Erro de energia entre as soluções numérica e exata.
+    """
+    l2_sq, energy_sq = compute_element_errors(vertices, elements, u_numeric, order, element_type, affine, kernel, basis,
+                                              quadrature_degree)
+    return np.sqrt(np.sum(l2_sq)), np.sqrt(np.sum(energy_sq))
+
+def compute_element_errors(vertices, elements, u_numeric, order, element_type, affine='auto', kernel='standard', basis='lagrange',
+                           quadrature_degree=None):
+    """
+    Calcula as contribuições de cada elemento para os quadrados dos erros L2 e de energia.
+
+    Args:
+    - vertices (ndarray): Coordenadas dos nós da malha, formato (n_nos, 2).
+    - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento).
+    - u_numeric (ndarray): Solução numérica nos nós.
+    - order (int): Ordem dos polinômios de Lagrange usados no cálculo.
+    - element_type (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - affine (bool ou str): Detecção de elementos afins ('auto'), malha toda afim (True) ou caminho geral (False).
+    - kernel (str): 'standard' (quadratura tabelada) ou 'sum_factorization' (quadriláteros Q_p, contrações 1D).
+    - basis (str): 'lagrange' (u_numeric são valores nodais) ou 'hierarchical' (u_numeric são coeficientes modais).
+    - quadrature_degree (int ou dict): Grau da quadratura dos erros. Se None, 2p + 2 (a solução exata não é
+      polinomial; ver quadrature_selection); um inteiro ou um dicionário {'error': ...} substitui a escolha.
+
+    Returns:
+    - l2_sq (ndarray): Quadrado do erro L2 em cada elemento, tamanho n_elementos.
+    - energy_sq (ndarray): Quadrado do erro de energia em cada elemento, tamanho n_elementos.
+    """
+    if element_type not in ['tri', 'quad']:
+        raise ValueError("Tipo de elemento desconhecido")
+
+    vertices = np.asarray(vertices, dtype=float)[:, :2]
+    elements = as_index_array(elements)
+    num_element_nodes = elements.shape[1]
+
+    if kernel not in ['standard', 'sum_factorization']:
+        raise ValueError("Núcleo inválido. Deve ser 'standard' ou 'sum_factorization'")
+    check_basis(basis)
+
+    # Grau da quadratura dos erros
+    error_degree = quadrature_degrees(vertices, elements, element_type, ('error',), affine, quadrature_degree)['error']
+
+    # Quadriláteros Q_p: núcleo de fatoração de somas com a regra tensorial do mesmo grau
+    if kernel == 'sum_factorization':
+        if basis != 'lagrange':
+            raise ValueError("O núcleo 'sum_factorization' usa apenas a base de Lagrange.")
+        degree = check_sum_factorization(element_type, num_element_nodes)
+        return sum_factorized_element_errors(vertices[elements], np.asarray(u_numeric)[elements], degree, error_degree // 2 + 1,
+                                             default_exact_solution, default_exact_gradient)
+
+    # Pontos de Gauss, pesos e tabela das funções de forma no elemento de referência
+    points, weights, N, dN = reference_tables(element_type, error_degree, num_element_nodes)
+
+    # Backend Numba: solução exata avaliada com NumPy, integração em laço compilado
+    node_coords = vertices[elements]
+    if numba_enabled() and basis == 'lagrange':
+        x_gauss = np.einsum('eai,qa->eqi', node_coords, N)
+        return element_errors_numba(node_coords, np.asarray(u_numeric)[elements], dN, N, weights,
+                                    default_exact_solution(x_gauss[..., 0], x_gauss[..., 1]),
+                                    default_exact_gradient(x_gauss[..., 0], x_gauss[..., 1]))
+
+    # Funções da solução e coeficientes de cada elemento: valores nodais (Lagrange) ou coeficientes
+    # dos modos de referência, com a orientação das arestas (hierárquica)
+    if basis == 'lagrange':
+        N_basis, dN_basis = N, dN
+        u_vals = np.asarray(u_numeric)[elements]
+    else:
+        _, _, N_basis, dN_basis = reference_tables(element_type, error_degree, num_element_nodes, basis)
+        u_vals = modal_coefficients(u_numeric, elements, *edge_orientation(elements, element_type))
+
+    # Geometria de todos os elementos
+    _, detJ, grad_N, _ = element_geometry(node_coords, dN, affine, basis_gradients=dN_basis)
+    dx = np.abs(detJ) * weights
+
+    # Coordenadas físicas dos pontos de Gauss
+    x_gauss = np.einsum('eai,qa->eqi', node_coords, N)
+
+    # Soluções e gradientes numéricos nos pontos de Gauss
+    u_numeric_gauss = np.einsum('ea,qa->eq', u_vals, N_basis)
+    grad_u_numeric = np.einsum('ea,eqai->eqi', u_vals, grad_N)
+
+    # Soluções e gradientes exatos nos pontos de Gauss
+    u_exact_gauss = default_exact_solution(x_gauss[..., 0], x_gauss[..., 1])
+    grad_u_exact = default_exact_gradient(x_gauss[..., 0], x_gauss[..., 1])
+
+    # Erros por elemento
+    l2_sq = np.sum((u_exact_gauss - u_numeric_gauss) ** 2 * dx, axis=1)
+    energy_sq = np.sum(np.sum((grad_u_exact - grad_u_numeric) ** 2, axis=-1) * dx, axis=1)
+
+    return l2_sq, energy_sq
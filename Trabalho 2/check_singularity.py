@@ -1,52 +1,27 @@
-import numpy as np
+from matrix_diagnostics import matrix_diagnostics
 
-def check_singularity(matrix):    
-    """Verifica se a matriz de rigidez global é singular e aplica 'técnica de regularização' ou 'técnica de pre-condicionamento' para corrigir o problema.
+def check_singularity(matrix, constrained_nodes=None, estimate_spectrum=True):    
+    """Verifica se a matriz de rigidez global é singular usando apenas operações esparsas e informa os problemas encontrados.
+
+    A matriz não é modificada e o processo não é encerrado: os problemas são impressos e o relatório
+    completo de matrix_diagnostics fica disponível para quem chamou.
 
     Parameters:
     matrix (scipy.sparse matrix): Matriz de rigidez do sistema.
+    constrained_nodes (array): Índices dos nós com condição de Dirichlet (opcional).
+    estimate_spectrum (bool): Se True, estima os autovalores extremos e o número de condição.
 
     Returns:
-    matrix (scipy.sparse matrix): Matriz de rigidez do sistema, corrigida caso seja singular.
-
-    Raises:
-    ValueError: Se a matriz de rigidez global for singular e as técnicas de corrigir o problema falharem.
-    KeyError: Se a matriz de rigidez global for singular e as técnicas de corrigir o problema falharem.
+    matrix (scipy.sparse matrix): Matriz de rigidez do sistema, sem alterações.
+    report (dict): Relatório de diagnóstico retornado por matrix_diagnostics.
     """
-    # Obtem o tamanho da matriz
-    n = matrix.shape[0]
+    # Diagnóstico da matriz
+    report = matrix_diagnostics(matrix, constrained_nodes, estimate_spectrum)
 
-    # Verifica se a matriz de rigidez global é singular
-    try:
-        if(np.linalg.matrix_rank(matrix.toarray()) < n):
-            raise ValueError("Matriz de rigidez global é singular. Tentativa de 'regularização'.")
-        matrix += 1e-6 * np.eye(n)
-    except:
-        pass
-        
-    try:
-        if(np.linalg.matrix_rank(matrix.toarray()) < n):
-            raise ValueError("Matriz de rigidez global é singular. Tentativa de aplicação de 'técnica de pre-condicionamento'.")
-        matrix = preconditioner(matrix)
-    except:
-        pass    
-        
-    try:
-        if(np.linalg.matrix_rank(matrix.toarray()) < n):
-            raise ValueError("Matriz de rigidez global é singular. Provavelmente a matriz é singular por natureza.")
-    except:
-        return matrix
-    
-    return quit()
+    # Informa os problemas encontrados
+    if report['singular']:
+        print("Matriz de rigidez global é singular: " + "; ".join(report['messages']))
+    elif report['condition_number'] is not None:
+        print(f"Número de condição estimado: {report['condition_number']:.4e}")
 
-def preconditioner(K):
-    """
-    Preconditioner diagonal para o sistema linear.
-    
-    Parameters:
-    K (scipy.sparse matrix): Matriz de rigidez do sistema.
-    
-    Returns:
-    (numpy array): Inversa da diagonal da matriz de rigidez.
-    """
-    return np.linalg.inv(K.diagonal())
+    return matrix, report
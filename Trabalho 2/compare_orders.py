@@ -1,46 +1,70 @@
-def compare_orders(max_refinement_level):
+import numpy as np
+from plot_convergence_comparison import plot_convergence_comparison
+from plot_numerical_contour import plot_numerical_contour
+from mesh_refinement import nested_mesh_generator
+from poisson_problem import PoissonProblem
+
+def compare_orders(max_refinement_level, size=1.0, max_order=3, element_type='tri', nested=False):
+    """
+    Compara a convergência das ordens de Lagrange 1 até max_order.
+
+    Um único PoissonProblem é reaproveitado: a cada ordem e refinamento apenas a malha muda, e a
+    fonte, o coeficiente e os valores de contorno não provocam recálculos.
+
+    Args:
+    - max_refinement_level (int): Nível de refinamento máximo.
+    - size (float): Tamanho do lado do domínio quadrado.
+    - max_order (int): Maior ordem de Lagrange comparada.
+    - element_type (str): Tipo de elemento ('tri' ou 'quad').
+    - nested (bool): Se True, as malhas são obtidas por refinamento uniforme da malha anterior (nível L
+      com 2**(L - 1) células por lado; ver mesh_refinement.nested_mesh_generator).
+
+    Returns:
+    - h_values_dict, l2_errors_dict, energy_errors_dict (dict): Tamanhos de malha e erros por ordem.
+    """
     #Dicionários para armazenar dados de erros e tamanhos de malhas
     h_values_dict = {}
     l2_errors_dict = {}
     energy_errors_dict = {}
 
+    mesh_generator = nested_mesh_generator() if nested else None
+    problem = PoissonProblem(size, 1, element_type, 1, mesh_generator=mesh_generator)
+
     #Iterar sobre ordens
-    for order in [1, 2, 3]:
+    for order in range(1, max_order + 1):
         print(f"Executando para ordem {order}")
+        problem.set_order(order)
 
         l2_errors = []
         energy_errors =[]
         h_values = []
 
         #Executar simulação para níveis de refinamento
-        for refinement_level in range(1, max_refinement_level):
+        for refinement_level in range(1, max_refinement_level + 1):
             print(f"Refinamento nível {refinement_level}")
 
-            #Geração da malha
-            vertices, elements = generate_mesh(order, refinement_level)
-
-            #Montar o sistema
-            K, F = assemble_system(vertices, elements, order)
-            K, F = apply_dirichlet(K, F, vertices)
-            u_numeric = solve_system(K, F)
+            #Geração da malha, montagem e solução do sistema
+            problem.set_mesh(refinement_level=refinement_level)
+            u_numeric = problem.solve()
+            vertices, elements = problem.nodes, problem.elements
 
             #Solução exata
             u_exact = np.sin(np.pi * vertices[:,0]) * np.sin(np.pi * vertices[:,1])
             
 
             #calcula erros
-            l2_error, energy_error = calculate_errors(vertices, elements, u_numeric, u_exact, order)
+            l2_error, energy_error = problem.errors(u_numeric)
             l2_errors.append(l2_error)
             energy_errors.append(energy_error)
 
             #Calcular tamanho da malha
-            h = np.sqrt(2)/refinement_level
+            h = np.sqrt(2) * size / 2 ** (refinement_level - 1) if nested else np.sqrt(2)/refinement_level
             h_values.append(h)
 
             #Plotar solução na última iteração de refinamento
             if refinement_level == max_refinement_level:
                 print(f" Plotando solução para ordem P{order} no refinamento{refinement_level}")
-                plot_solution(vertices, elements, u_numeric, u_exact, order)
+                plot_numerical_contour(vertices, elements, u_numeric, u_exact, order)
 
         #Armazenar resultados para cada ordem
         h_values_dict[order] = h_values
@@ -48,5 +72,8 @@ def compare_orders(max_refinement_level):
         energy_errors_dict[order] = energy_errors
 
     #Plotar comparação de erros
+    import matplotlib.pyplot as plt
     plot_convergence_comparison(h_values_dict, l2_errors_dict, energy_errors_dict)
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+    return h_values_dict, l2_errors_dict, energy_errors_dict
@@ -31,10 +31,11 @@ def conect_vertices(type_element):
     
     return faces
 
-# Exemplo de uso
-type_element = 'quad'
-vertices = calculate_polygon_vertices(type_element)
-faces = conect_vertices(type_element)
+if __name__ == '__main__':
+    # Exemplo de uso
+    type_element = 'quad'
+    vertices = calculate_polygon_vertices(type_element)
+    faces = conect_vertices(type_element)
 
-#print("Vértices do polígono:", vertices)
-print("Faces do polígono:", faces)
\ No newline at end of file
+    #print("Vértices do polígono:", vertices)
+    print("Faces do polígono:", faces)
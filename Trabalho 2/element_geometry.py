@@ -0,0 +1,130 @@
+import numpy as np
+from memory_mode import storage_dtype
+
+def element_geometry(node_coords, dN, affine='auto', tol=1e-12, affine_gradients=True, basis_gradients=None):
+    """
+    Calcula o Jacobiano, seu determinante e os gradientes das funções de forma em coordenadas
+    físicas para todos os elementos e pontos de Gauss de uma só vez.
+
+    Elementos afins (triângulos de lados retos, paralelogramos) têm Jacobiano constante: para eles
+    o determinante e a inversa são calculados uma única vez por elemento e reaproveitados em todos
+    os pontos de Gauss. Os demais elementos (bilineares, curvos) seguem o caminho geral.
+
+    Args:
+    - node_coords (ndarray): Coordenadas dos nós de cada elemento, formato (n_elementos, n_nos, 2).
+    - dN (ndarray): Gradientes das funções de forma no elemento de referência, formato (n_pontos, n_nos, 2).
+    - affine (bool ou str): 'auto' detecta os elementos afins; True trata toda a malha como afim
+      (Jacobiano avaliado apenas no primeiro ponto); False usa sempre o caminho geral.
+    - tol (float): Tolerância relativa da detecção de elementos afins (acrescida do arredondamento
+      do tipo das coordenadas; ver detect_affine_elements).
+    - affine_gradients (bool): Se False, os gradientes dos elementos afins não são calculados (as
+      linhas correspondentes de grad_N ficam indefinidas), para quem monta esses elementos por
+      tensores de referência.
+    - basis_gradients (ndarray): Gradientes de referência das funções da solução, formato
+      (n_pontos, n_funcoes, 2), quando diferentes das funções da geometria dN (base hierárquica).
+      Se None, grad_N é calculado para dN.
+
+    Returns:
+    - J (ndarray): Jacobianos, formato (n_elementos, n_pontos, 2, 2).
+    - detJ (ndarray): Determinantes dos Jacobianos, formato (n_elementos, n_pontos).
+    - grad_N (ndarray): Gradientes físicos invJ.T @ dN, formato (n_elementos, n_pontos, n_nos, 2).
+    - is_affine (ndarray): Máscara booleana dos elementos tratados como afins, tamanho n_elementos.
+
+    Raises:
+    - ValueError: Se algum determinante do Jacobiano for zero (configuração singular).
+    """
+    if affine not in ('auto', True, False):
+        raise ValueError("O parâmetro affine deve ser 'auto', True ou False.")
+
+    num_elements, num_points = node_coords.shape[0], dN.shape[0]
+    dN_basis = dN if basis_gradients is None else basis_gradients
+
+    # Jacobianos: toda a malha afim usa apenas o primeiro ponto de Gauss
+    if affine is True:
+        J = np.einsum('eai,aj->eij', node_coords, dN[0])[:, None]
+        is_affine = np.ones(num_elements, dtype=bool)
+    else:
+        # J[i, j] = sum_a x_a[i] * dN_a/dxi_j
+        J = np.einsum('eai,qaj->eqij', node_coords, dN)
+        if affine == 'auto':
+            is_affine = detect_affine_elements(J, tol, node_coords, dN)
+        else:
+            is_affine = np.zeros(num_elements, dtype=bool)
+
+    detJ = np.empty((num_elements, num_points))
+    grad_N = np.empty((num_elements, num_points, dN_basis.shape[1], 2))
+
+    # Elementos afins: geometria calculada uma vez por elemento
+    if np.any(is_affine):
+        J_affine = J[is_affine, 0]
+        detJ_affine, invJ_affine = inverse_2x2(J_affine)
+        detJ[is_affine] = detJ_affine[:, None]
+        if affine_gradients:
+            grad_N[is_affine] = np.einsum('eji,qaj->eqai', invJ_affine, dN_basis)
+
+    # Demais elementos: geometria em cada ponto de Gauss
+    if not np.all(is_affine):
+        general = ~is_affine
+        detJ_general, invJ_general = inverse_2x2(J[general])
+        detJ[general] = detJ_general
+        grad_N[general] = np.einsum('eqji,qaj->eqai', invJ_general, dN_basis)
+
+    J = np.broadcast_to(J, (num_elements, num_points, 2, 2))
+
+    return J, detJ, grad_N, is_affine
+
+def detect_affine_elements(J, tol=1e-12, node_coords=None, dN=None):
+    """
+    Detecta os elementos cujo Jacobiano é constante em todos os pontos de Gauss.
+
+    Com node_coords e dN, a tolerância inclui o arredondamento das coordenadas: cada nó tem erro de
+    até eps * |x|, que chega ao Jacobiano multiplicado por sum_a |dN_a|. O eps é o do tipo mais
+    grosseiro entre o de node_coords e o de armazenamento (memory_mode.storage_dtype): no modo
+    'compact' as coordenadas foram arredondadas para float32 mesmo quando quem chama as converte
+    para float64, e não são, assim, classificadas como curvas por arredondamento.
+
+    Args:
+    - J (ndarray): Jacobianos, formato (n_elementos, n_pontos, 2, 2).
+    - tol (float): Tolerância relativa à maior entrada do Jacobiano de cada elemento.
+    - node_coords (ndarray): Coordenadas dos nós de cada elemento, formato (n_elementos, n_nos, 2).
+    - dN (ndarray): Gradientes de referência usados em J, formato (n_pontos, n_nos, 2).
+
+    Returns:
+    - is_affine (ndarray): Máscara booleana dos elementos afins, tamanho n_elementos.
+    """
+    scale = np.abs(J[:, 0]).max(axis=(1, 2))
+    deviation = np.abs(J - J[:, :1]).max(axis=(1, 2, 3))
+    allowed = tol * scale
+    if node_coords is not None:
+        eps = np.finfo(storage_dtype()).eps
+        if np.issubdtype(node_coords.dtype, np.floating):
+            eps = max(eps, np.finfo(node_coords.dtype).eps)
+        magnitude = np.abs(node_coords).max(axis=(1, 2))
+        allowed = allowed + 16 * eps * magnitude * np.abs(dN).sum(axis=1).max()
+    return deviation <= allowed
+
+def inverse_2x2(J):
+    """
+    Determinante e inversa de matrizes 2x2 pela fórmula fechada.
+
+    Args:
+    - J (ndarray): Matrizes de formato (..., 2, 2).
+
+    Returns:
+    - detJ (ndarray): Determinantes, formato (...).
+    - invJ (ndarray): Inversas, formato (..., 2, 2).
+
+    Raises:
+    - ValueError: Se algum determinante for zero (configuração singular).
+    """
+    detJ = J[..., 0, 0] * J[..., 1, 1] - J[..., 0, 1] * J[..., 1, 0]
+    if np.any(detJ == 0):
+        raise ValueError("Verificando se o determinante do Jacobiano é zero (configuração singular).")
+
+    invJ = np.empty_like(J)
+    invJ[..., 0, 0] = J[..., 1, 1] / detJ
+    invJ[..., 0, 1] = -J[..., 0, 1] / detJ
+    invJ[..., 1, 0] = -J[..., 1, 0] / detJ
+    invJ[..., 1, 1] = J[..., 0, 0] / detJ
+
+    return detJ, invJ
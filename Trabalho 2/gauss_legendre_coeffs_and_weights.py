@@ -52,14 +52,15 @@ def gauss_legendre_coeffs_and_weights(element_type, order):
 # print(coeffs)
 # print(weights)
 
-element_type = "tri"
-order = 3
-coeffs, weights = gauss_legendre_coeffs_and_weights(element_type, order)
+if __name__ == '__main__':
+    element_type = "tri"
+    order = 3
+    coeffs, weights = gauss_legendre_coeffs_and_weights(element_type, order)
 
-print("Coeficientes:")
-for i, coeff in enumerate(coeffs):
-    print(f"Coeficiente {i+1}: {coeff}")
+    print("Coeficientes:")
+    for i, coeff in enumerate(coeffs):
+        print(f"Coeficiente {i+1}: {coeff}")
 
-print("\nPesos:")
-for i, weight in enumerate(weights):
-    print(f"Peso {i+1}: {weight}")
\ No newline at end of file
+    print("\nPesos:")
+    for i, weight in enumerate(weights):
+        print(f"Peso {i+1}: {weight}")
@@ -50,27 +50,28 @@ def gauss_legendre_coeffs_and_weights1(element_type, order):
 # print(coeffs)
 # print(weights)
 
-element_type = "tri"
-order = 2
-coeffs, weights = gauss_legendre_coeffs_and_weights1(element_type, order)
+if __name__ == '__main__':
+    element_type = "tri"
+    order = 2
+    coeffs, weights = gauss_legendre_coeffs_and_weights1(element_type, order)
 
-print("Coeficientes:")
-for i, coeff in enumerate(coeffs):
-    print(f"Coeficiente {i+1}: {coeff}")
+    print("Coeficientes:")
+    for i, coeff in enumerate(coeffs):
+        print(f"Coeficiente {i+1}: {coeff}")
 
-print("\nPesos:")
-for i, weight in enumerate(weights):
-    print(f"Peso {i+1}: {weight}")
+    print("\nPesos:")
+    for i, weight in enumerate(weights):
+        print(f"Peso {i+1}: {weight}")
 
-# import pandas as pd
+    # import pandas as pd
 
-# element_type = "quad"
-# order = 3
-# coeffs, weights = gauss_legendre_coeffs_and_weights1(element_type, order)
+    # element_type = "quad"
+    # order = 3
+    # coeffs, weights = gauss_legendre_coeffs_and_weights1(element_type, order)
 
-# df = pd.DataFrame({
-#     "Coeficiente": coeffs,
-#     "Peso": weights
-# })
+    # df = pd.DataFrame({
+    #     "Coeficiente": coeffs,
+    #     "Peso": weights
+    # })
 
-# print(df)
\ No newline at end of file
+    # print(df)
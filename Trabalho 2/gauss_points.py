@@ -44,30 +44,31 @@ def gauss_points(num_nodes_element, num_sides):
 # for point in gauss_points_list:
 #     print(point)
 
-import matplotlib.pyplot as plt
+if __name__ == '__main__':
+    import matplotlib.pyplot as plt
 
-num_nodes_element = 4
-num_sides = 4
-gauss_points_list = gauss_points(num_nodes_element, num_sides)
+    num_nodes_element = 4
+    num_sides = 4
+    gauss_points_list = gauss_points(num_nodes_element, num_sides)
 
-# Separa os pontos de Gauss em x, y e pesos
-x = [point[0] for point in gauss_points_list]
-y = [point[1] for point in gauss_points_list]
-pesos = [point[2] for point in gauss_points_list]
+    # Separa os pontos de Gauss em x, y e pesos
+    x = [point[0] for point in gauss_points_list]
+    y = [point[1] for point in gauss_points_list]
+    pesos = [point[2] for point in gauss_points_list]
 
-# print('Valores de x:')
-# for elemento in x:
-#     print(elemento)
-# print('Valores de y:')
-# for elemento in y:
-#     print(elemento)
-# print('Valores de pesos:')
-# for elemento in pesos:
-#     print(elemento)    
+    # print('Valores de x:')
+    # for elemento in x:
+    #     print(elemento)
+    # print('Valores de y:')
+    # for elemento in y:
+    #     print(elemento)
+    # print('Valores de pesos:')
+    # for elemento in pesos:
+    #     print(elemento)
 
-print('Valores de x, y e pesos:')
-for i in range(len(x)): 
-    xi = x[i]   
-    yi = y[i]
-    pesosi = pesos[i]
-    print(xi, yi, pesosi) 
\ No newline at end of file
+    print('Valores de x, y e pesos:')
+    for i in range(len(x)):
+        xi = x[i]
+        yi = y[i]
+        pesosi = pesos[i]
+        print(xi, yi, pesosi)
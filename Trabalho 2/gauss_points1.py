@@ -45,19 +45,20 @@ def gauss_points1(num_nodes_element, num_sides):
 # for point in gauss_points_list:
 #     print(point)
 
-import matplotlib.pyplot as plt
-
-num_nodes_element = 5
-num_sides = 6
-gauss_points_list = gauss_points1(num_nodes_element, num_sides)
-
-# Separa os pontos de Gauss em x e y
-x = [point[0] for point in gauss_points_list]
-y = [point[1] for point in gauss_points_list]
-
-# Plota os pontos de Gauss
-plt.scatter(x, y)
-plt.title("Pontos de Gauss")
-plt.xlabel("x")
-plt.ylabel("y")
-plt.show()
\ No newline at end of file
+if __name__ == '__main__':
+    import matplotlib.pyplot as plt
+
+    num_nodes_element = 5
+    num_sides = 6
+    gauss_points_list = gauss_points1(num_nodes_element, num_sides)
+
+    # Separa os pontos de Gauss em x e y
+    x = [point[0] for point in gauss_points_list]
+    y = [point[1] for point in gauss_points_list]
+
+    # Plota os pontos de Gauss
+    plt.scatter(x, y)
+    plt.title("Pontos de Gauss")
+    plt.xlabel("x")
+    plt.ylabel("y")
+    plt.show()
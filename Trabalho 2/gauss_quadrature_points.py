@@ -1,6 +1,7 @@
-import quadpy
-
 def gauss_quadrature_points(n):
+    # O quadpy é opcional e lento para importar: só é carregado quando a função é chamada
+    import quadpy
+
     # Criar um esquema de quadratura para um triângulo com n pontos
     scheme = quadpy.triangle.strang(n)
     
@@ -10,11 +11,12 @@ def gauss_quadrature_points(n):
     
     return points, weights
 
-# Exemplo de uso
-n = 3  # Você pode alterar o valor de n para testar diferentes números de pontos
-points, weights = gauss_quadrature_points(n)
+if __name__ == '__main__':
+    # Exemplo de uso
+    n = 3  # Você pode alterar o valor de n para testar diferentes números de pontos
+    points, weights = gauss_quadrature_points(n)
 
-print("Pontos:")
-print(points)
-print("Pesos:")
-print(weights)
\ No newline at end of file
+    print("Pontos:")
+    print(points)
+    print("Pesos:")
+    print(weights)
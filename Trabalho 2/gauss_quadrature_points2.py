@@ -1,6 +1,4 @@
-import numpy as np
-from numpy.polynomial.legendre import leggauss
-import matplotlib.pyplot as plt
+from quadrature import rule_by_points
 
 def gauss_quadrature_points2(type_element, order):
     """
@@ -12,6 +10,7 @@ def gauss_quadrature_points2(type_element, order):
 
     Returns:
     - points (list of tuples): Lista de tuplas contendo os pontos de Gauss e o pesos correspondentes (xi, yi, weigthi) no polígono.
+      Para os kernels vetorizados, use diretamente os arrays de quadrature (rule_by_points, quadrature_rule).
 
     Raises:
     - ValueError: Se o número de lados for inválido.
@@ -30,8 +29,11 @@ def gauss_quadrature_points_triangle(n):
     """
     Retorna os pontos de Gauss e os pesos para um triângulo de acordo com a ordem especificada.
 
+    As regras vêm de quadrature.rule_by_points: simétricas com 1, 3, 4, 6 e 7 pontos (graus 1, 2,
+    3, 4 e 5), com pesos somando 1/2 (a de 4 pontos tem peso negativo no centróide).
+
     Args:
-    - n (int): A ordem da quadratura de Gauss.
+    - n (int): O número de pontos da quadratura de Gauss.
 
     Returns:
     - points (list of tuples): Lista de tuplas contendo os pontos de Gauss e os pesos correspondentes (xi, yi, weigthi) no triângulo.
@@ -42,46 +44,9 @@ def gauss_quadrature_points_triangle(n):
     # Verifica se o número de pontos em cada lado do triângulo é um inteiro positivo
     if not isinstance(n, int) or n < 1:
         raise ValueError('O número de pontos em cada lado do triângulo deve ser um inteiro positivo.')
-    
-    # Define os pontos de Gauss e seus pesos para o triângulo
-    if n == 1:
-        gauss_points = [(1/3, 1/3, 1/2)]
-    elif n == 3:
-        gauss_points = [(1/2, 0, 1/6), (0, 1/2, 1/6), (1/2, 1/2, 1/6)]
-    elif n == 4:
-        gauss_points = [(1/3, 1/3, -27/96), (0.6, 0.2, 25/96), (0.2, 0.6, 25/96), (0.2, 0.2, 25/96)]
-    elif n == 6:
-        a = 0.816847572980459
-        b = 0.091576213509771
-        w1 = 0.109951743655322
-        w2 = 0.223381589678011
-        gauss_points = [(a, b, w1), (b, a, w1), (b, b, w1), (1/2, 1/2, w2), (1/2, 0, w2), (0, 1/2, w2)]
-    elif n==10:
-        a = 333333/1000000
-        b = 489682/1000000
-        c = 21636/1000000
-        d = 437089/1000000
-        e = 125822/1000000
-        f = 188203/1000000
-        g = 623594/1000000
-        w1 = 9/80
-        w2 = 66197/1000000
-        w3 = 62969/1000000
-        w4 = 34229/1000000
-        gauss_points = [(a, a, w1), (b, b, w2), (b, c, w2), (c, b, w3), (d, d, w3), (d, e, w3), (e,d, w3), (f, f, w4), (f, g, w4), (g, f, w4)]
-    else:
-        raise ValueError("Número de pontos não suportado para triângulo")
-    
-    # Verifica se a lista de pontos de Gauss foi criada corretamente
-    if not isinstance(gauss_points, list):
-        raise ValueError("A lista de pontos de Gauss não é uma lista")
-    if len(gauss_points) != n:
-        raise ValueError("A lista de pontos de Gauss tem tamanho diferente do especificado")
-    for point in gauss_points:
-        if not isinstance(point, tuple) or len(point) != 3:
-            raise ValueError("Um dos pontos de Gauss não é uma tupla com 3 elementos")
-        if not (isinstance(point[0], (int, float)) and isinstance(point[1], (int, float)) and isinstance(point[2], (int, float))):
-            raise ValueError("Um dos pontos de Gauss tem elemento que não é um número")
+
+    points, weights = rule_by_points('tri', n)
+    return [(xi, eta, weight) for (xi, eta), weight in zip(points.tolist(), weights.tolist())]
 
 def gauss_quadrature_points_square(n):
     """
@@ -96,38 +61,14 @@ def gauss_quadrature_points_square(n):
     
     Raises:
     - ValueError: Se n for menor que 1.
-    - RuntimeError: Se houver um erro ao calcular os pontos e pesos de Gauss-Legendre.
     """
     # Verifica se o número de pontos em cada lado do quadrado é um inteiro positivo
     if not isinstance(n, int) or n < 1:
         raise ValueError('O número de pontos em cada lado do quadrado deve ser um inteiro positivo.')
-    
-    # Define os pontos de Gauss e seus pesos para o quadrado
-    try:
-        points, weights = leggauss(n)
-        if points is None or weights is None:
-            raise RuntimeError("Erro ao calcular pontos e pesos de Gauss-Legendre: retornou None")
-        if not isinstance(points, list) or not isinstance(weights, list):
-            raise RuntimeError("Erro ao calcular pontos e pesos de Gauss-Legendre: retornou tipo inválido")
-        if len(points) != n or len(weights) != n:
-            raise RuntimeError("Erro ao calcular pontos e pesos de Gauss-Legendre: tamanho diferente do especificado")
-        if any(p is None or w is None for p, w in zip(points, weights)):
-            raise RuntimeError("Erro ao calcular pontos e pesos de Gauss-Legendre: vazio")
-    except Exception as e:
-        raise RuntimeError(f"Erro ao calcular pontos e pesos de Gauss-Legendre: {e}")
-
-    # Inicializa a lista de pontos de Gauss
-    gauss_points = [] 
-
-    # Calcula os pontos de Gauss
-    for i in range(n):
-        for j in range(n):
-            xi = points[i]
-            eta = points[j]
-            weight = weights[i] * weights[j]
-            gauss_points.append((xi, eta, weight))
-    
-    return gauss_points
+
+    # Produto tensorial de Gauss-Legendre (xi varia mais devagar)
+    points, weights = rule_by_points('quad', n)
+    return [(xi, eta, weight) for (xi, eta), weight in zip(points.tolist(), weights.tolist())]
 
 def plot_gauss_points(gauss_points, element_type):
     """
@@ -155,6 +96,7 @@ def plot_gauss_points(gauss_points, element_type):
         raise ValueError("Os pesos devem ser números inteiros ou decimais positivos")
     
     # Plota os pontos de Gauss e seus pesos
+    import matplotlib.pyplot as plt
     try:
         plt.scatter(x, y, c=weights, cmap='viridis', marker='o')
         plt.colorbar(label='Pesos')
@@ -1,8 +1,6 @@
-import gmsh
 # from gmsh import model as m
 # from gmsh import geometry as g
-import numpy as np
-import matplotlib.pyplot as plt
+from gmsh_import import import_gmsh_mesh
 
 def generate_mesh(size, refinement_level, element_type, order):
     """
@@ -18,6 +16,9 @@ def generate_mesh(size, refinement_level, element_type, order):
     - nodes (ndarray): Array de vértices da malha.
     - elements (ndarray): Array de elementos da malha.
     """
+    # O gmsh é importado apenas quando uma malha é gerada, pois sua carga é lenta
+    import gmsh
+
     try:
         # Verificar se o tamanho do lado do quadrado é maior que zero
         if size <= 0:
@@ -95,26 +96,9 @@ def generate_mesh(size, refinement_level, element_type, order):
         except Exception as e:
             raise ValueError(f"Erro ao obter os nós e elementos da malha: {e}") from e
 
-        nodes = np.array(node_coords).reshape((-1, 3))[:, :2]
-
-        # Verificar o tipo de elementos e ajustá-los corretamente
-        if element_type == "tri":
-            for i, elem_type in enumerate(element_types):
-                if elem_type == 2:  # 2 é o código para elementos triangulares
-                    try:
-                        elements = np.array(element_node_tags[i]).reshape((-1, 3))
-                    except Exception as e:
-                        raise ValueError(f"Erro ao obter os elementos triangulares: {e}") from e
-                    break
-        elif element_type == "quad":
-            for i, elem_type in enumerate(element_types):
-                if elem_type == 3:  # 3 é o código para elementos quadrangulares
-                    try:
-                        elements = np.array(element_node_tags[i]).reshape((-1, 4))
-                    except Exception as e:
-                        raise ValueError(f"Erro ao obter os elementos quadrangulares: {e}") from e
-                    break
-    
+        # Índices a partir de zero e nós de cada elemento na numeração local da base (qualquer ordem)
+        nodes, elements = import_gmsh_mesh(node_tags, node_coords, element_types, element_node_tags, element_type)
+
     except Exception as e:
         raise ValueError(f"Erro ao gerar a malha: {e}") from e
 
@@ -124,25 +108,26 @@ def generate_mesh(size, refinement_level, element_type, order):
     return nodes, elements
 
 # Exemplo 1: Geração de uma malha com os parâmetros a seguir
-size = 1.0  # tamanho do quadrado
-refinement_level = 1  # nível de refinamento
-element_type = "tri"  # tipo de elemento (tri ou quad)
-order = 1  # ordem do polinômio de Lagrange
-
-# Gerar a malha
-nodes, elements = generate_mesh(size, refinement_level, element_type, order)
-
-# Imprimir os nós e elementos da malha
-print("Nós da malha:")
-print(nodes)
-print("\nElementos da malha:")
-print(elements)
-
-# Plotar a malha (opcional)
-import matplotlib.pyplot as plt
-plt.figure(figsize=(8, 8))
-plt.scatter(nodes[:, 0], nodes[:, 1], s=10)
-for element in elements:
-    plt.plot(nodes[element, 0], nodes[element, 1], 'b-')
-plt.axis('equal')
-plt.show()
\ No newline at end of file
+if __name__ == '__main__':
+    size = 1.0  # tamanho do quadrado
+    refinement_level = 1  # nível de refinamento
+    element_type = "tri"  # tipo de elemento (tri ou quad)
+    order = 1  # ordem do polinômio de Lagrange
+
+    # Gerar a malha
+    nodes, elements = generate_mesh(size, refinement_level, element_type, order)
+
+    # Imprimir os nós e elementos da malha
+    print("Nós da malha:")
+    print(nodes)
+    print("\nElementos da malha:")
+    print(elements)
+
+    # Plotar a malha (opcional)
+    import matplotlib.pyplot as plt
+    plt.figure(figsize=(8, 8))
+    plt.scatter(nodes[:, 0], nodes[:, 1], s=10)
+    for element in elements:
+        plt.plot(nodes[element, 0], nodes[element, 1], 'b-')
+    plt.axis('equal')
+    plt.show()
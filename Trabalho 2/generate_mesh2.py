@@ -1,8 +1,8 @@
-import gmsh
 import numpy as np
-import matplotlib.pyplot as plt
 
 def generate_mesh2(size, refinement_level, element_type, order):
+    import gmsh
+
     gmsh.initialize()
     model = gmsh.model
     mesh = model.mesh
@@ -41,28 +41,32 @@ def generate_mesh2(size, refinement_level, element_type, order):
     # Retornar os nós e elementos da malha
     return node_coords, elements
 
-# Exemplo de uso
-size = 1.0
-refinement_level = 1
-element_type = "quad"
-order = 2
-
-node_coords, elements = generate_mesh2(size, refinement_level, element_type, order)
-
-# Imprimir os nós e elementos da malha
-print("Nós da malha:")
-print(node_coords)
-print("\nElementos da malha:")
-print(elements)
-
-# Plotar a malha (opcional)
-plt.figure(figsize=(8, 8))
-plt.scatter(node_coords[::3], node_coords[1::3], s=10)
-for element in elements:
-    x = [node_coords[element[i]-1] for i in range(4)]
-    y = [node_coords[element[i]-1+1] for i in range(4)]
-    plt.plot(x, y, 'b-')
-plt.axis('equal')
-plt.show()
-
-gmsh.finalize()
\ No newline at end of file
+if __name__ == '__main__':
+    import gmsh
+    import matplotlib.pyplot as plt
+
+    # Exemplo de uso
+    size = 1.0
+    refinement_level = 1
+    element_type = "quad"
+    order = 2
+
+    node_coords, elements = generate_mesh2(size, refinement_level, element_type, order)
+
+    # Imprimir os nós e elementos da malha
+    print("Nós da malha:")
+    print(node_coords)
+    print("\nElementos da malha:")
+    print(elements)
+
+    # Plotar a malha (opcional)
+    plt.figure(figsize=(8, 8))
+    plt.scatter(node_coords[::3], node_coords[1::3], s=10)
+    for element in elements:
+        x = [node_coords[element[i]-1] for i in range(4)]
+        y = [node_coords[element[i]-1+1] for i in range(4)]
+        plt.plot(x, y, 'b-')
+    plt.axis('equal')
+    plt.show()
+
+    gmsh.finalize()
@@ -0,0 +1,160 @@
+from functools import lru_cache
+import numpy as np
+from lagrange_basis import reference_nodes
+
+# Tipos de elementos de Lagrange completos do gmsh: código -> (tipo de elemento, ordem)
+GMSH_LAGRANGE_TYPES = {
+    2: ('tri', 1), 9: ('tri', 2), 21: ('tri', 3), 23: ('tri', 4), 25: ('tri', 5),
+    42: ('tri', 6), 43: ('tri', 7), 44: ('tri', 8), 45: ('tri', 9), 46: ('tri', 10),
+    3: ('quad', 1), 10: ('quad', 2), 36: ('quad', 3), 37: ('quad', 4), 38: ('quad', 5),
+    47: ('quad', 6), 48: ('quad', 7), 49: ('quad', 8), 50: ('quad', 9), 51: ('quad', 10),
+}
+
+def _gmsh_lattice(type_element, degree):
+    """
+    Posições inteiras (i, j) dos nós na numeração do gmsh: vértices, nós internos de cada aresta
+    no sentido da aresta e, recursivamente, os nós interiores como um elemento de ordem menor
+    (k - 3 no triângulo, k - 2 no quadrilátero) deslocado de (1, 1).
+    """
+    k = degree
+    if k == 0:
+        return [(0, 0)]
+    if type_element == 'tri':
+        positions = [(0, 0), (k, 0), (0, k)]
+        positions += [(m, 0) for m in range(1, k)]
+        positions += [(k - m, m) for m in range(1, k)]
+        positions += [(0, k - m) for m in range(1, k)]
+        inner = k - 3
+    else:
+        positions = [(0, 0), (k, 0), (k, k), (0, k)]
+        positions += [(m, 0) for m in range(1, k)]
+        positions += [(k, m) for m in range(1, k)]
+        positions += [(k - m, k) for m in range(1, k)]
+        positions += [(0, k - m) for m in range(1, k)]
+        inner = k - 2
+    if inner >= 0:
+        positions += [(i + 1, j + 1) for i, j in _gmsh_lattice(type_element, inner)]
+    return positions
+
+@lru_cache(maxsize=None)
+def gmsh_node_permutation(type_element, degree):
+    """
+    Permutação da numeração local do gmsh para a de lagrange_basis.reference_nodes.
+
+    As duas numerações coincidem nos vértices e nas arestas; os nós interiores do gmsh seguem a
+    ordem recursiva (vértices, arestas e interior do elemento interno), e os de reference_nodes a
+    ordem lexicográfica.
+
+    Returns:
+    - permutation (ndarray): elements = gmsh_elements[:, permutation].
+    """
+    if type_element == 'tri':
+        lattice = np.rint(reference_nodes('tri', degree) * degree).astype(int)
+    else:
+        lattice = np.rint((reference_nodes('quad', degree) + 1.0) * degree / 2).astype(int)
+    gmsh_index = {position: a for a, position in enumerate(_gmsh_lattice(type_element, degree))}
+    permutation = np.array([gmsh_index[tuple(position)] for position in lattice])
+    permutation.setflags(write=False)
+    return permutation
+
+def import_gmsh_mesh(node_tags, node_coords, element_types, element_node_tags, element_type=None, boundary_groups=None):
+    """
+    Converte a malha lida da API do gmsh (getNodes e getElements(2)) em arrays do código.
+
+    As tags dos nós são mapeadas para índices a partir de zero com np.searchsorted nas tags
+    ordenadas dos nós usados pelos elementos (numeração compacta, sem nós soltos), e os nós de
+    cada elemento são reordenados para a numeração local de lagrange_basis.reference_nodes.
+
+    Args:
+    - node_tags (ndarray): Tags dos nós (gmsh.model.mesh.getNodes).
+    - node_coords (ndarray): Coordenadas dos nós, 3 por nó.
+    - element_types (list): Códigos dos tipos de elementos (gmsh.model.mesh.getElements).
+    - element_node_tags (list): Tags dos nós dos elementos de cada tipo.
+    - element_type (str): 'tri' ou 'quad'; None aceita o único tipo presente na malha.
+    - boundary_groups (dict): Tag do grupo físico -> tags dos nós das linhas do grupo (k + 1 nós por
+      linha: extremidades e depois os nós internos). Se fornecido, as arestas marcadas também são retornadas.
+
+    Returns:
+    - nodes (ndarray): Coordenadas dos nós, formato (n_nos, 2), float64 C-contíguo.
+    - elements (ndarray): Conectividade com índices a partir de zero, int32 (int64 se o número de
+      nós não couber em 32 bits), C-contígua.
+    - boundary_facets (ndarray): Apenas com boundary_groups: nós de cada linha marcada, formato (n_linhas, k + 1).
+    - boundary_tags (ndarray): Apenas com boundary_groups: grupo físico de cada linha, int32.
+    """
+    if element_type is not None and element_type not in ['tri', 'quad']:
+        raise ValueError("Erro: O tipo de elemento deve ser 'tri' ou 'quad'")
+
+    blocks = []
+    for code, tags in zip(element_types, element_node_tags):
+        if int(code) not in GMSH_LAGRANGE_TYPES:
+            raise ValueError(f"Tipo de elemento do gmsh não suportado: {code} (apenas Lagrange completo).")
+        blocks.append((GMSH_LAGRANGE_TYPES[int(code)], np.asarray(tags)))
+    if not blocks:
+        raise ValueError("A malha do gmsh não contém elementos 2D.")
+
+    kinds = {kind for kind, _ in blocks}
+    if len(kinds) > 1:
+        raise ValueError(f"A malha do gmsh mistura tipos ou ordens de elementos: {sorted(kinds)}.")
+    (type_found, degree), tags = blocks[0]
+    if element_type is not None and type_found != element_type:
+        raise ValueError(f"A malha do gmsh contém elementos '{type_found}', e não '{element_type}'.")
+
+    permutation = gmsh_node_permutation(type_found, degree)
+    element_tags = tags.astype(np.int64).reshape(-1, len(permutation))[:, permutation]
+
+    # Tags usadas, ordenadas: a posição de cada tag é o seu índice compacto
+    used_tags = np.unique(element_tags)
+    dtype = np.int32 if len(used_tags) - 1 <= np.iinfo(np.int32).max else np.int64
+    elements = np.ascontiguousarray(np.searchsorted(used_tags, element_tags), dtype=dtype)
+
+    node_tags = np.asarray(node_tags, dtype=np.int64)
+    if len(node_tags) == 0:
+        raise ValueError("Os elementos do gmsh usam nós que não foram lidos.")
+    order = np.argsort(node_tags, kind='stable')
+    position = np.minimum(np.searchsorted(node_tags, used_tags, sorter=order), len(node_tags) - 1)
+    if np.any(node_tags[order[position]] != used_tags):
+        raise ValueError("Os elementos do gmsh usam nós que não foram lidos.")
+    coords = np.asarray(node_coords, dtype=float).reshape(-1, 3)
+    nodes = np.ascontiguousarray(coords[order[position], :2])
+    if boundary_groups is None:
+        return nodes, elements
+
+    # Linhas dos grupos físicos, com os mesmos índices compactos
+    facets, facet_tags = [], []
+    for group, tags in boundary_groups.items():
+        tags = np.asarray(tags, dtype=np.int64).reshape(-1, degree + 1)
+        facets.append(tags)
+        facet_tags.append(np.full(len(tags), group, dtype=np.int32))
+    facets = np.concatenate(facets) if facets else np.empty((0, degree + 1), dtype=np.int64)
+    facet_tags = np.concatenate(facet_tags) if facet_tags else np.empty(0, dtype=np.int32)
+    position = np.minimum(np.searchsorted(used_tags, facets), len(used_tags) - 1)
+    if np.any(used_tags[position] != facets):
+        raise ValueError("As linhas dos grupos físicos usam nós que não pertencem aos elementos.")
+    return nodes, elements, np.ascontiguousarray(position, dtype=dtype), facet_tags
+
+def read_gmsh_mesh(gmsh, element_type=None, physical_groups=False):
+    """
+    Lê a malha 2D do modelo atual do gmsh (ver import_gmsh_mesh).
+
+    Args:
+    - gmsh (module): Módulo gmsh já inicializado, com a malha gerada.
+    - element_type (str): 'tri' ou 'quad'; None aceita o único tipo presente na malha.
+    - physical_groups (bool): Se True, lê também as linhas dos grupos físicos de dimensão 1.
+
+    Returns:
+    - nodes (ndarray), elements (ndarray)[, boundary_facets (ndarray), boundary_tags (ndarray)]:
+      Ver import_gmsh_mesh.
+    """
+    node_tags, node_coords, _ = gmsh.model.mesh.getNodes()
+    element_types, _, element_node_tags = gmsh.model.mesh.getElements(2)
+    if not physical_groups:
+        return import_gmsh_mesh(node_tags, node_coords, element_types, element_node_tags, element_type)
+
+    boundary_groups = {}
+    for dim, group in gmsh.model.getPhysicalGroups(1):
+        tags = []
+        for curve in gmsh.model.getEntitiesForPhysicalGroup(dim, group):
+            _, _, line_node_tags = gmsh.model.mesh.getElements(dim, curve)
+            tags.extend(np.asarray(block, dtype=np.int64) for block in line_node_tags)
+        boundary_groups[int(group)] = np.concatenate(tags) if tags else np.empty(0, dtype=np.int64)
+    return import_gmsh_mesh(node_tags, node_coords, element_types, element_node_tags, element_type, boundary_groups)
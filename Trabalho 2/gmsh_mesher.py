@@ -0,0 +1,175 @@
+import atexit
+import os
+from gmsh_import import read_gmsh_mesh
+from structured_mesh import BOUNDARY_TAGS
+
+# Algoritmos 2D do gmsh (opção Mesh.Algorithm). 'delaunay' é o mais rápido em malhas grandes;
+# 'frontal-quads' gera triângulos quase retângulos, que se recombinam em quadriláteros de boa qualidade
+MESH_ALGORITHMS = {'meshadapt': 1, 'automatic': 2, 'delaunay': 5, 'frontal-delaunay': 6, 'frontal-quads': 8}
+DEFAULT_ALGORITHMS = {'tri': 'delaunay', 'quad': 'frontal-quads'}
+
+# Sessão única do gmsh, compartilhada por todos os geradores do processo
+_session = {'started': False, 'owner': False}
+_shared_meshers = {}
+
+def _start_session():
+    """
+    Inicializa o gmsh uma única vez (importado apenas aqui, pois sua carga é lenta).
+    """
+    import gmsh
+    if not _session['started']:
+        if not gmsh.isInitialized():
+            gmsh.initialize()
+            _session['owner'] = True
+            atexit.register(_finalize_session)
+        gmsh.option.setNumber("General.Terminal", 0)
+        _session['started'] = True
+    return gmsh
+
+def _finalize_session():
+    import gmsh
+    _shared_meshers.clear()
+    if _session['owner'] and gmsh.isInitialized():
+        gmsh.finalize()
+    _session['started'] = _session['owner'] = False
+
+class GmshMesher:
+    """
+    Gerador de malhas do gmsh para o domínio quadrado [0, size]^2 que mantém a sessão aberta.
+
+    A geometria (pontos, linhas e superfície) é criada e sincronizada uma única vez; cada chamada de
+    generate apenas limpa e gera de novo a malha linear quando o nível de refinamento ou o tipo de
+    elemento mudam, e eleva a ordem com gmsh.model.mesh.setOrder quando só a ordem muda. Assim, uma
+    sequência de refinamentos não paga a inicialização do gmsh nem a reconstrução da geometria.
+
+    Args:
+    - size (float): Tamanho do lado do domínio quadrado.
+    - num_threads (int): Threads do gmsh (General.NumThreads e Mesh.MaxNumThreads2D); None usa
+      todos os núcleos. O gmsh paraleliza a malha 2D por superfície, então no quadrado as threads
+      aceleram principalmente a elevação de ordem e a recombinação.
+    - algorithm (str): Algoritmo 2D (ver MESH_ALGORITHMS); None usa DEFAULT_ALGORITHMS do tipo de elemento.
+    """
+
+    def __init__(self, size=1.0, num_threads=None, algorithm=None):
+        if size <= 0:
+            raise ValueError("Erro: O tamanho do lado do quadrado deve ser maior que zero")
+        if algorithm is not None and algorithm not in MESH_ALGORITHMS:
+            raise ValueError(f"Algoritmo de malha inválido. Deve ser um de {tuple(MESH_ALGORITHMS)}")
+        if num_threads is not None and num_threads < 1:
+            raise ValueError("O número de threads deve ser positivo.")
+
+        self.size = float(size)
+        self.num_threads = (os.cpu_count() or 1) if num_threads is None else int(num_threads)
+        self.algorithm = algorithm
+        self._model = None
+        self._points = None
+        self._surface = None
+        self._mesh_key = None
+        self._order = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _build_geometry(self, gmsh):
+        """
+        Cria o modelo com o quadrado e sincroniza a geometria (apenas na primeira geração).
+        """
+        self._model = f"square-{id(self)}"
+        gmsh.model.add(self._model)
+        size = self.size
+        points = [gmsh.model.geo.addPoint(x, y, 0, size) for x, y in [(0, 0), (size, 0), (size, size), (0, size)]]
+        lines = [gmsh.model.geo.addLine(points[i], points[(i + 1) % 4]) for i in range(4)]
+        loop = gmsh.model.geo.addCurveLoop(lines)
+        self._surface = gmsh.model.geo.addPlaneSurface([loop])
+        gmsh.model.geo.synchronize()
+
+        # Um grupo físico por lado, com as tags da malha estruturada (inferior, direito, superior, esquerdo)
+        for line, (name, tag) in zip(lines, BOUNDARY_TAGS.items()):
+            gmsh.model.addPhysicalGroup(1, [line], tag)
+            gmsh.model.setPhysicalName(1, tag, name)
+        self._points = [(0, p) for p in points]
+
+    def generate(self, refinement_level, element_type, order, boundary=False):
+        """
+        Gera a malha com tamanho de elemento lc = size / refinement_level**2.
+
+        Args:
+        - refinement_level (int): Nível de refinamento da malha.
+        - element_type (str): Tipo de elemento ('tri' ou 'quad').
+        - order (int): Ordem do polinômio de Lagrange.
+        - boundary (bool): Se True, retorna também as arestas de cada lado (grupos físicos).
+
+        Returns:
+        - nodes (ndarray): Coordenadas dos nós, formato (n_nos, 2).
+        - elements (ndarray): Conectividade int32 com índices a partir de zero (ver gmsh_import).
+        - boundary_facets (ndarray), boundary_tags (ndarray): Apenas com boundary=True; ver
+          gmsh_import.import_gmsh_mesh (tags de structured_mesh.BOUNDARY_TAGS).
+        """
+        if refinement_level <= 0:
+            raise ValueError("Erro: O nível de refinamento deve ser maior que zero")
+        if element_type not in ["tri", "quad"]:
+            raise ValueError("Erro: O tipo de elemento deve ser 'tri' ou 'quad'")
+        if order <= 0:
+            raise ValueError("Erro: A ordem do polinômio de Lagrange deve ser maior que zero")
+
+        gmsh = _start_session()
+        try:
+            if self._model is None:
+                self._build_geometry(gmsh)
+            gmsh.model.setCurrent(self._model)
+
+            gmsh.option.setNumber("General.NumThreads", self.num_threads)
+            gmsh.option.setNumber("Mesh.MaxNumThreads2D", self.num_threads)
+
+            # Malha linear: refeita apenas se o refinamento ou o tipo de elemento mudarem
+            lc = self.size / (refinement_level ** 2)
+            key = (lc, element_type)
+            if key != self._mesh_key:
+                gmsh.model.mesh.clear()
+                gmsh.model.mesh.setSize(self._points, lc)
+                algorithm = self.algorithm or DEFAULT_ALGORITHMS[element_type]
+                gmsh.option.setNumber("Mesh.Algorithm", MESH_ALGORITHMS[algorithm])
+                gmsh.option.setNumber("Mesh.RecombineAll", 1 if element_type == "quad" else 0)
+                gmsh.option.setNumber("Mesh.ElementOrder", 1)
+                gmsh.model.mesh.generate(2)
+                self._mesh_key, self._order = key, 1
+
+            # Elementos de Lagrange completos da ordem pedida, sobre a mesma malha linear
+            if order != self._order:
+                gmsh.option.setNumber("Mesh.SecondOrderIncomplete", 0)
+                gmsh.model.mesh.setOrder(order)
+                self._order = order
+
+            # Nós com índices compactos a partir de zero, na numeração local de reference_nodes
+            return read_gmsh_mesh(gmsh, element_type, physical_groups=boundary)
+        except Exception as e:
+            # Estado da malha desconhecido: a próxima chamada gera tudo de novo
+            self._mesh_key = self._order = None
+            raise ValueError(f"Erro ao gerar a malha: {e}") from e
+
+    def close(self):
+        """
+        Remove o modelo do gerador (a sessão do gmsh é finalizada ao fim do processo).
+        """
+        if self._model is None or not _session['started']:
+            self._model = None
+            return
+        import gmsh
+        gmsh.model.setCurrent(self._model)
+        gmsh.model.remove()
+        self._model = self._mesh_key = self._order = None
+
+def shared_gmsh_mesher(size, num_threads=None, algorithm=None):
+    """
+    Gerador persistente compartilhado para o quadrado de lado size (usado por mesh.generate_mesh).
+
+    Returns:
+    - mesher (GmshMesher): O mesmo objeto em todas as chamadas com os mesmos parâmetros.
+    """
+    key = (float(size), num_threads, algorithm)
+    if key not in _shared_meshers:
+        _shared_meshers[key] = GmshMesher(size, num_threads, algorithm)
+    return _shared_meshers[key]
@@ -0,0 +1,326 @@
+from functools import lru_cache
+import numpy as np
+from lagrange_basis import _legendre_table, basis_degree, reference_nodes, tabulate_basis
+
+# Arestas locais de cada tipo de elemento (mesma numeração de lagrange_basis)
+EDGES = {'tri': ((0, 1), (1, 2), (2, 0)), 'quad': ((0, 1), (1, 2), (2, 3), (3, 0))}
+
+def _integrated_legendre(t, degree):
+    """
+    Funções 1D hierárquicas: phi_0 = (1 - t)/2, phi_1 = (1 + t)/2 e, para n >= 2, os polinômios de
+    Legendre integrados phi_n = (P_n - P_{n-2}) / sqrt(2 (2n - 1)), nulos em t = -1 e t = 1.
+
+    Returns:
+    - phi (ndarray): Valores, formato (n_pontos, k + 1).
+    - dphi (ndarray): Derivadas, formato (n_pontos, k + 1).
+    """
+    P, _ = _legendre_table(t, max(degree, 1))
+    phi = np.empty((len(t), degree + 1))
+    dphi = np.empty((len(t), degree + 1))
+    phi[:, 0], dphi[:, 0] = (1 - t) / 2, -0.5
+    phi[:, 1], dphi[:, 1] = (1 + t) / 2, 0.5
+    for n in range(2, degree + 1):
+        phi[:, n] = (P[:, n] - P[:, n - 2]) / np.sqrt(2 * (2 * n - 1))
+        dphi[:, n] = np.sqrt((2 * n - 1) / 2) * P[:, n - 1]
+    return phi, dphi
+
+def _scaled_integrated_legendre(x, t, degree):
+    """
+    Polinômios de Legendre integrados escalados L_n(x, t) = t^n phi_n(x / t), n = 2..k, e suas
+    derivadas em x e t, pela recorrência de três termos dos polinômios de Legendre escalados.
+    Com x = lambda_b - lambda_a e t = lambda_a + lambda_b, o traço na aresta (t = 1) é phi_n.
+
+    Returns:
+    - L, L_x, L_t (ndarray): Formato (n_pontos, k + 1) (colunas 0 e 1 não usadas).
+    """
+    num_points = len(x)
+    P = np.zeros((num_points, degree + 1))
+    P_x = np.zeros_like(P)
+    P_t = np.zeros_like(P)
+    P[:, 0] = 1.0
+    if degree > 0:
+        P[:, 1], P_x[:, 1] = x, 1.0
+    for n in range(1, degree):
+        P[:, n + 1] = ((2 * n + 1) * x * P[:, n] - n * t**2 * P[:, n - 1]) / (n + 1)
+        P_x[:, n + 1] = ((2 * n + 1) * (P[:, n] + x * P_x[:, n]) - n * t**2 * P_x[:, n - 1]) / (n + 1)
+        P_t[:, n + 1] = ((2 * n + 1) * x * P_t[:, n] - n * (2 * t * P[:, n - 1] + t**2 * P_t[:, n - 1])) / (n + 1)
+
+    L = np.zeros_like(P)
+    L_x = np.zeros_like(P)
+    L_t = np.zeros_like(P)
+    for n in range(2, degree + 1):
+        scale = 1 / np.sqrt(2 * (2 * n - 1))
+        L[:, n] = (P[:, n] - t**2 * P[:, n - 2]) * scale
+        L_x[:, n] = (P_x[:, n] - t**2 * P_x[:, n - 2]) * scale
+        L_t[:, n] = (P_t[:, n] - 2 * t * P[:, n - 2] - t**2 * P_t[:, n - 2]) * scale
+    return L, L_x, L_t
+
+def _jacobi(x, alpha, degree):
+    """
+    Polinômios de Jacobi P_0..P_k^(alpha, 0) e suas derivadas em x.
+
+    Returns:
+    - P, dP (ndarray): Formato (n_pontos, k + 1).
+    """
+    P = np.zeros((len(x), degree + 1))
+    dP = np.zeros_like(P)
+    P[:, 0] = 1.0
+    if degree > 0:
+        P[:, 1], dP[:, 1] = ((alpha + 2) * x + alpha) / 2, (alpha + 2) / 2
+    for n in range(2, degree + 1):
+        a = 2 * n + alpha
+        c1 = 2 * n * (n + alpha) * (a - 2)
+        c2 = (a - 1) * a * (a - 2)
+        c3 = (a - 1) * alpha**2
+        c4 = 2 * (n + alpha - 1) * (n - 1) * a
+        P[:, n] = ((c2 * x + c3) * P[:, n - 1] - c4 * P[:, n - 2]) / c1
+        dP[:, n] = (c2 * P[:, n - 1] + (c2 * x + c3) * dP[:, n - 1] - c4 * dP[:, n - 2]) / c1
+    return P, dP
+
+def _triangle_modes(degree, points):
+    """
+    Base hierárquica do triângulo em coordenadas baricêntricas l0 = 1 - xi - eta, l1 = xi, l2 = eta.
+    """
+    xi, eta = points[:, 0], points[:, 1]
+    lam = np.stack([1 - xi - eta, xi, eta])
+    grad_lam = np.array([[-1.0, -1.0], [1.0, 0.0], [0.0, 1.0]])
+    num_points = len(points)
+
+    values, gradients = [], []
+
+    # Modos de vértice: as próprias coordenadas baricêntricas
+    for a in range(3):
+        values.append(lam[a])
+        gradients.append(np.broadcast_to(grad_lam[a], (num_points, 2)))
+
+    # Modos de aresta L_n(l_b - l_a, l_a + l_b), n = 2..k, no sentido da aresta local
+    for a, b in EDGES['tri']:
+        L, L_x, L_t = _scaled_integrated_legendre(lam[b] - lam[a], lam[a] + lam[b], degree)
+        for n in range(2, degree + 1):
+            values.append(L[:, n])
+            gradients.append(L_x[:, n, None] * (grad_lam[b] - grad_lam[a]) + L_t[:, n, None] * (grad_lam[a] + grad_lam[b]))
+
+    # Modos bolha L_i(l1 - l0, l0 + l1) l2 P_j^(2i-1, 0)(2 l2 - 1), i >= 2, i + j <= k - 1 (Karniadakis-Sherwin)
+    if degree >= 3:
+        L, L_x, L_t = _scaled_integrated_legendre(lam[1] - lam[0], lam[0] + lam[1], degree - 1)
+        grad_x, grad_t = grad_lam[1] - grad_lam[0], grad_lam[0] + grad_lam[1]
+        for j in range(degree - 2):
+            for i in range(2, degree - j):
+                P, dP = _jacobi(2 * lam[2] - 1, 2 * i - 1, j)
+                u = L[:, i]
+                grad_u = L_x[:, i, None] * grad_x + L_t[:, i, None] * grad_t
+                v = lam[2] * P[:, j]
+                grad_v = (P[:, j] + 2 * lam[2] * dP[:, j])[:, None] * grad_lam[2]
+                values.append(u * v)
+                gradients.append(grad_u * v[:, None] + u[:, None] * grad_v)
+
+    return np.stack(values, axis=1), np.stack(gradients, axis=1)
+
+def _quad_modes(degree, points):
+    """
+    Base hierárquica do quadrilátero [-1, 1]^2: produtos tensoriais das funções 1D hierárquicas.
+    """
+    phi_x, dphi_x = _integrated_legendre(points[:, 0], degree)
+    phi_y, dphi_y = _integrated_legendre(points[:, 1], degree)
+    n = np.arange(degree + 1)
+
+    # Modos de aresta parametrizados no sentido oposto (t -> -t): phi_n(-t) = (-1)^n phi_n(t)
+    parity = np.where(n % 2 == 0, 1.0, -1.0)
+
+    def product(ix, iy, sx=1.0, sy=1.0):
+        value = sx * sy * phi_x[:, ix] * phi_y[:, iy]
+        gradient = np.stack([sx * sy * dphi_x[:, ix] * phi_y[:, iy], sx * sy * phi_x[:, ix] * dphi_y[:, iy]], axis=-1)
+        return value, gradient
+
+    # Vértices (-1, -1), (1, -1), (1, 1), (-1, 1)
+    modes = [product(0, 0), product(1, 0), product(1, 1), product(0, 1)]
+
+    # Arestas 0-1 (eta = -1, xi crescente), 1-2 (xi = 1, eta crescente), 2-3 (eta = 1, xi
+    # decrescente) e 3-0 (xi = -1, eta decrescente)
+    modes += [product(m, 0) for m in range(2, degree + 1)]
+    modes += [product(1, m) for m in range(2, degree + 1)]
+    modes += [product(m, 1, sx=parity[m]) for m in range(2, degree + 1)]
+    modes += [product(0, m, sy=parity[m]) for m in range(2, degree + 1)]
+
+    # Bolhas phi_i(xi) phi_j(eta), xi varia mais rápido
+    modes += [product(i, j) for j in range(2, degree + 1) for i in range(2, degree + 1)]
+
+    values, gradients = zip(*modes)
+    return np.stack(values, axis=1), np.stack(gradients, axis=1)
+
+def tabulate_hierarchical(type_element, degree, points):
+    """
+    Avalia a base hierárquica de ordem k (Legendre integrados no quadrilátero, Legendre integrados
+    escalados e Jacobi no triângulo) e seus gradientes nos pontos.
+
+    As funções ocupam as mesmas posições locais dos nós de Lagrange: modos de vértice, modos de
+    aresta de grau 2..k (na ordem dos nós da aresta, parametrizados no sentido da aresta local) e
+    modos bolha (nulos no contorno do elemento). Os modos de aresta e de bolha se anulam nos
+    vértices e os modos bolha no contorno; o condicionamento das matrizes cresce mais devagar com k
+    que o da base nodal de nós equiespaçados.
+
+    Args:
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - degree (int): Ordem k da base.
+    - points (ndarray): Pontos de avaliação no elemento de referência, formato (n_pontos, 2).
+
+    Returns:
+    - N (ndarray): Valores das funções da base, formato (n_pontos, n_funcoes).
+    - dN (ndarray): Gradientes das funções da base, formato (n_pontos, n_funcoes, 2).
+    """
+    points = np.asarray(points, dtype=float)
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError("Os pontos devem ter formato (n_pontos, 2).")
+    if not isinstance(degree, (int, np.integer)) or degree < 1:
+        raise ValueError("A ordem deve ser um inteiro positivo.")
+
+    if type_element == 'tri':
+        return _triangle_modes(int(degree), points)
+    elif type_element == 'quad':
+        return _quad_modes(int(degree), points)
+    else:
+        raise ValueError("O elemento deve ser triângulo ('tri') ou quadrilátero ('quad').")
+
+def edge_orientation(elements, type_element):
+    """
+    Orientação dos modos de aresta compartilhados entre elementos.
+
+    Cada aresta global é orientada do vértice de menor índice global para o de maior, e o modo de
+    grau n de uma aresta fica no nó da malha que ocupa a posição n - 1 a partir do vértice inicial.
+    Nos elementos em que a aresta local tem sentido oposto, os modos aparecem em ordem inversa e os
+    de grau ímpar trocam de sinal (phi_n(-t) = (-1)^n phi_n(t)), de modo que os dois elementos
+    vizinhos usem a mesma função global.
+
+    Args:
+    - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento).
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+
+    Returns:
+    - local_index (ndarray): Modo de referência associado a cada posição local, formato (n_elementos, n_nos_elemento).
+    - signs (ndarray): Sinal do modo em cada posição local, formato (n_elementos, n_nos_elemento).
+    """
+    elements = np.asarray(elements)
+    num_elements, num_element_nodes = elements.shape
+    degree = basis_degree(type_element, num_element_nodes)
+    edges = EDGES[type_element]
+
+    local_index = np.broadcast_to(np.arange(num_element_nodes), elements.shape).copy()
+    signs = np.ones(elements.shape)
+
+    # Posições dos modos de grau 2..k de cada aresta e paridade do grau
+    offsets = len(edges) + (degree - 1) * np.arange(len(edges))
+    degrees = np.arange(2, degree + 1)
+    odd = degrees % 2 == 1
+
+    for edge, (a, b) in enumerate(edges):
+        reversed_edge = elements[:, a] > elements[:, b]
+        if not np.any(reversed_edge) or degree < 2:
+            continue
+        slots = offsets[edge] + np.arange(degree - 1)
+        local_index[np.ix_(reversed_edge, slots)] = slots[::-1]
+        flip = reversed_edge[:, None] & odd[::-1][None, :]
+        signs[:, slots] = np.where(flip, -1.0, 1.0)
+
+    return local_index, signs
+
+def orient_local_systems(K_local, F_local, local_index, signs):
+    """
+    Passa matrizes e vetores locais calculados com os modos de referência para as posições locais
+    da malha (ver edge_orientation).
+
+    Args:
+    - K_local (ndarray): Matrizes locais nos modos de referência, formato (n_elementos, n, n).
+    - F_local (ndarray): Vetores locais nos modos de referência, formato (n_elementos, n).
+    - local_index, signs (ndarray): Retornados por edge_orientation.
+
+    Returns:
+    - K_local (ndarray), F_local (ndarray): Matrizes e vetores nas posições locais da malha.
+    """
+    rows = np.arange(len(K_local))[:, None, None]
+    K_local = K_local[rows, local_index[:, :, None], local_index[:, None, :]] * signs[:, :, None] * signs[:, None, :]
+    F_local = np.take_along_axis(F_local, local_index, axis=1) * signs
+    return K_local, F_local
+
+def modal_coefficients(u, elements, local_index, signs):
+    """
+    Coeficientes dos modos de referência de cada elemento a partir do vetor global de graus de liberdade.
+
+    Returns:
+    - u_modes (ndarray): Formato (n_elementos, n_nos_elemento).
+    """
+    u_modes = np.empty(elements.shape)
+    np.put_along_axis(u_modes, local_index, np.asarray(u, dtype=float)[elements] * signs, axis=1)
+    return u_modes
+
+@lru_cache(maxsize=None)
+def _nodal_transform(type_element, degree):
+    """
+    Valores dos modos de referência nos nós de Lagrange (T[i, m] = phi_m(no_i)) e sua inversa.
+    """
+    T, _ = tabulate_hierarchical(type_element, degree, reference_nodes(type_element, degree))
+    T_inv = np.linalg.inv(T)
+    T.setflags(write=False)
+    T_inv.setflags(write=False)
+    return T, T_inv
+
+def hierarchical_to_nodal(u, elements, type_element):
+    """
+    Valores nos nós da malha da função representada pelos coeficientes hierárquicos u (por
+    exemplo, para plotar a solução).
+
+    Args:
+    - u (ndarray): Coeficientes hierárquicos globais, tamanho n_nos.
+    - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento).
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+
+    Returns:
+    - values (ndarray): Valores nodais, tamanho n_nos.
+    """
+    elements = np.asarray(elements)
+    degree = basis_degree(type_element, elements.shape[1])
+    local_index, signs = edge_orientation(elements, type_element)
+    T, _ = _nodal_transform(type_element, degree)
+
+    values = np.empty(len(u))
+    values[elements] = modal_coefficients(u, elements, local_index, signs) @ T.T
+    return values
+
+def nodal_to_hierarchical(values, elements, type_element):
+    """
+    Coeficientes hierárquicos do interpolante de Lagrange dos valores nodais (por exemplo, dos
+    valores de Dirichlet). Os coeficientes de vértice e de aresta dependem apenas dos valores na
+    aresta, portanto elementos vizinhos produzem os mesmos coeficientes compartilhados.
+
+    Args:
+    - values (ndarray): Valores nos nós da malha, tamanho n_nos.
+    - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento).
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+
+    Returns:
+    - u (ndarray): Coeficientes hierárquicos globais, tamanho n_nos.
+    """
+    elements = np.asarray(elements)
+    degree = basis_degree(type_element, elements.shape[1])
+    local_index, signs = edge_orientation(elements, type_element)
+    _, T_inv = _nodal_transform(type_element, degree)
+
+    u_modes = np.asarray(values, dtype=float)[elements] @ T_inv.T
+    u = np.empty(len(values))
+    u[elements] = np.take_along_axis(u_modes, local_index, axis=1) * signs
+    return u
+
+def check_basis(basis):
+    """
+    Verifica o nome da família de funções de base.
+    """
+    if basis not in ['lagrange', 'hierarchical']:
+        raise ValueError("Base inválida. Deve ser 'lagrange' ou 'hierarchical'")
+
+def tabulate(type_element, degree, points, basis='lagrange'):
+    """
+    Avalia a base escolhida ('lagrange' nodal ou 'hierarchical') e seus gradientes nos pontos.
+    """
+    check_basis(basis)
+    if basis == 'hierarchical':
+        return tabulate_hierarchical(type_element, degree, points)
+    return tabulate_basis(type_element, degree, points)
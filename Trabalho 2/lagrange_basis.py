@@ -0,0 +1,154 @@
+from functools import lru_cache
+import numpy as np
+
+def basis_degree(type_element, num_element_nodes):
+    """
+    Obtém a ordem k da base de Lagrange a partir do número de nós por elemento.
+
+    Args:
+    - type_element (str): O tipo de elemento: 'tri' (P_k, (k + 1)(k + 2)/2 nós) ou 'quad' (Q_k, (k + 1)**2 nós).
+    - num_element_nodes (int): Número de nós por elemento.
+
+    Returns:
+    - degree (int): Ordem k do polinômio de Lagrange.
+
+    Raises:
+    - ValueError: Se o número de nós não corresponder a nenhuma ordem.
+    """
+    if type_element not in ['tri', 'quad']:
+        raise ValueError("O elemento deve ser triângulo ('tri') ou quadrilátero ('quad').")
+
+    for degree in range(1, num_element_nodes + 1):
+        count = (degree + 1) * (degree + 2) // 2 if type_element == 'tri' else (degree + 1) ** 2
+        if count == num_element_nodes:
+            return degree
+        if count > num_element_nodes:
+            break
+
+    raise ValueError(f"Número de nós por elemento inválido para '{type_element}': {num_element_nodes}.")
+
+def reference_nodes(type_element, degree):
+    """
+    Nós de interpolação do elemento de referência na numeração local.
+
+    O triângulo de referência tem vértices (0, 0), (1, 0), (0, 1) e o quadrilátero de referência é
+    [-1, 1]^2 com vértices (-1, -1), (1, -1), (1, 1), (-1, 1). A numeração local é: vértices; nós
+    internos de cada aresta (0-1, 1-2, 2-0 ou 2-3, 3-0) no sentido da aresta; nós interiores em
+    ordem lexicográfica (xi varia mais rápido). É a mesma numeração de sum_factorization.
+
+    Args:
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - degree (int): Ordem k do polinômio de Lagrange.
+
+    Returns:
+    - nodes (ndarray): Coordenadas dos nós, formato (n_funcoes, 2).
+    """
+    if not isinstance(degree, (int, np.integer)) or degree < 1:
+        raise ValueError("A ordem deve ser um inteiro positivo.")
+
+    k = int(degree)
+    if type_element == 'tri':
+        # Índices inteiros (i, j) com xi = i/k, eta = j/k
+        positions = [(0, 0), (k, 0), (0, k)]
+        positions += [(m, 0) for m in range(1, k)]
+        positions += [(k - m, m) for m in range(1, k)]
+        positions += [(0, k - m) for m in range(1, k)]
+        positions += [(i, j) for j in range(1, k) for i in range(1, k - j)]
+        return np.array(positions, dtype=float) / k
+    elif type_element == 'quad':
+        positions = [(0, 0), (k, 0), (k, k), (0, k)]
+        positions += [(m, 0) for m in range(1, k)]
+        positions += [(k, m) for m in range(1, k)]
+        positions += [(k - m, k) for m in range(1, k)]
+        positions += [(0, k - m) for m in range(1, k)]
+        positions += [(i, j) for j in range(1, k) for i in range(1, k)]
+        return 2.0 * np.array(positions, dtype=float) / k - 1.0
+    else:
+        raise ValueError("O elemento deve ser triângulo ('tri') ou quadrilátero ('quad').")
+
+def _legendre_table(t, degree):
+    """
+    Polinômios de Legendre P_0..P_k e suas derivadas em t, pela recorrência de três termos.
+
+    Returns:
+    - P (ndarray): Valores, formato (n_pontos, k + 1).
+    - dP (ndarray): Derivadas, formato (n_pontos, k + 1).
+    """
+    P = np.zeros((len(t), degree + 1))
+    dP = np.zeros((len(t), degree + 1))
+    P[:, 0] = 1.0
+    if degree > 0:
+        P[:, 1] = t
+        dP[:, 1] = 1.0
+    for n in range(1, degree):
+        P[:, n + 1] = ((2 * n + 1) * t * P[:, n] - n * P[:, n - 1]) / (n + 1)
+        dP[:, n + 1] = dP[:, n - 1] + (2 * n + 1) * P[:, n]
+    return P, dP
+
+def _modal_basis(type_element, degree, points):
+    """
+    Avalia a base polinomial auxiliar (produtos de polinômios de Legendre, mais bem condicionada
+    que os monômios) e seu gradiente nos pontos.
+
+    Para o triângulo, usa P_a(2 xi - 1) * P_b(2 eta - 1) com a + b <= k (base de P_k); para o
+    quadrilátero, P_a(xi) * P_b(eta) com a, b <= k (base de Q_k).
+
+    Returns:
+    - M (ndarray): Valores, formato (n_pontos, n_funcoes).
+    - dM (ndarray): Gradientes, formato (n_pontos, n_funcoes, 2).
+    """
+    points = np.asarray(points, dtype=float)
+    if type_element == 'tri':
+        s, t, scale = 2 * points[:, 0] - 1, 2 * points[:, 1] - 1, 2.0
+        exponents = [(a, b) for b in range(degree + 1) for a in range(degree + 1 - b)]
+    else:
+        s, t, scale = points[:, 0], points[:, 1], 1.0
+        exponents = [(a, b) for b in range(degree + 1) for a in range(degree + 1)]
+
+    Ps, dPs = _legendre_table(s, degree)
+    Pt, dPt = _legendre_table(t, degree)
+    a, b = np.array(exponents).T
+
+    M = Ps[:, a] * Pt[:, b]
+    dM = np.stack([scale * dPs[:, a] * Pt[:, b], scale * Ps[:, a] * dPt[:, b]], axis=-1)
+    return M, dM
+
+@lru_cache(maxsize=None)
+def lagrange_coefficients(type_element, degree):
+    """
+    Coeficientes da base nodal de Lagrange na base auxiliar: inversa da matriz de Vandermonde
+    V[i, j] = M_j(no_i). Calculada uma única vez por (tipo de elemento, ordem).
+
+    Returns:
+    - C (ndarray): Coeficientes, formato (n_funcoes, n_funcoes), de modo que N = M @ C.
+    """
+    nodes = reference_nodes(type_element, degree)
+    V, _ = _modal_basis(type_element, degree, nodes)
+    C = np.linalg.inv(V)
+    C.setflags(write=False)
+    return C
+
+def tabulate_basis(type_element, degree, points):
+    """
+    Avalia as funções de forma nodais de Lagrange (P_k em triângulos, Q_k em quadriláteros) e seus
+    gradientes em todos os pontos de uma só vez.
+
+    Args:
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - degree (int): Ordem k do polinômio de Lagrange.
+    - points (ndarray): Pontos de avaliação no elemento de referência, formato (n_pontos, 2).
+
+    Returns:
+    - N (ndarray): Valores das funções de forma, formato (n_pontos, n_funcoes).
+    - dN (ndarray): Gradientes das funções de forma, formato (n_pontos, n_funcoes, 2).
+    """
+    points = np.asarray(points, dtype=float)
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError("Os pontos devem ter formato (n_pontos, 2).")
+
+    C = lagrange_coefficients(type_element, degree)
+    M, dM = _modal_basis(type_element, degree, points)
+
+    N = M @ C
+    dN = np.einsum('qmi,ma->qai', dM, C)
+    return N, dN
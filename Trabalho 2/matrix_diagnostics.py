@@ -0,0 +1,150 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import ArpackError, ArpackNoConvergence, eigsh
+
+def matrix_diagnostics(K, constrained_nodes=None, estimate_spectrum=True, tol=1e-12):
+    """
+    Diagnostica problemas de singularidade da matriz de rigidez global usando apenas operações
+    esparsas. Deve ser chamada uma vez, após a montagem (ou após aplicar as condições de contorno).
+
+    Args:
+    - K (scipy.sparse matrix): Matriz de rigidez do sistema.
+    - constrained_nodes (array): Índices dos nós com condição de Dirichlet. Componentes conexas que
+      contêm algum desses nós não são reportadas como flutuantes.
+    - estimate_spectrum (bool): Se True, estima o menor e o maior autovalor e o número de condição (ARPACK).
+    - tol (float): Tolerância relativa para considerar entradas e assimetrias nulas.
+
+    Returns:
+    - report (dict): Relatório com as chaves:
+        - 'shape' (tuple): Dimensões da matriz.
+        - 'nnz' (int): Número de entradas armazenadas.
+        - 'zero_rows' (ndarray): Índices das linhas nulas.
+        - 'zero_cols' (ndarray): Índices das colunas nulas.
+        - 'zero_diagonal' (ndarray): Índices com diagonal nula.
+        - 'symmetric' (bool): Se a matriz é simétrica dentro da tolerância.
+        - 'asymmetry' (float): Maior |K - K.T| relativo ao maior |K|.
+        - 'num_components' (int): Número de componentes conexas do grafo da matriz.
+        - 'floating_nodes' (ndarray): Nós de componentes cujo bloco anula o vetor constante e que
+          não contêm nenhum nó restrito.
+        - 'min_eigenvalue' (float ou None): Estimativa do menor autovalor.
+        - 'max_eigenvalue' (float ou None): Estimativa do maior autovalor.
+        - 'condition_number' (float ou None): Estimativa do número de condição.
+        - 'singular' (bool): Se algum dos testes indica que a matriz é singular.
+        - 'messages' (list of str): Descrição dos problemas encontrados.
+
+    Raises:
+    - ValueError: Se a matriz não for quadrada.
+    """
+    if K is None:
+        raise ValueError("A matriz de rigidez não pode ser vazia")
+
+    K = sp.csr_matrix(K)
+    n = K.shape[0]
+    if K.shape[0] != K.shape[1]:
+        raise ValueError("A matriz de rigidez deve ser quadrada")
+
+    messages = []
+    abs_K = abs(K)
+    scale = abs_K.max() if K.nnz > 0 else 0.0
+    threshold = tol * scale
+
+    # Linhas e colunas nulas
+    zero_rows = np.flatnonzero(np.asarray(abs_K.max(axis=1).todense()).ravel() <= threshold)
+    zero_cols = np.flatnonzero(np.asarray(abs_K.max(axis=0).todense()).ravel() <= threshold)
+    if zero_rows.size:
+        messages.append(f"{zero_rows.size} linha(s) nula(s)")
+    if zero_cols.size:
+        messages.append(f"{zero_cols.size} coluna(s) nula(s)")
+
+    # Diagonal nula
+    zero_diagonal = np.flatnonzero(np.abs(K.diagonal()) <= threshold)
+    if zero_diagonal.size:
+        messages.append(f"{zero_diagonal.size} entrada(s) nula(s) na diagonal")
+
+    # Simetria
+    difference = K - K.T
+    asymmetry = (abs(difference).max() / scale) if difference.nnz > 0 and scale > 0 else 0.0
+    symmetric = asymmetry <= tol
+    if not symmetric:
+        messages.append(f"Matriz não simétrica (assimetria relativa {asymmetry:.2e})")
+
+    # Componentes conexas do grafo da matriz
+    graph = abs_K > threshold
+    num_components, labels = connected_components(graph, directed=False)
+
+    # Componentes flutuantes: o vetor constante está no núcleo do bloco (soma das linhas nula),
+    # como ocorre na rigidez de Poisson sem nenhum nó com condição de Dirichlet
+    row_sums = np.asarray(K.sum(axis=1)).ravel()
+    abs_row_sums = np.asarray(abs_K.sum(axis=1)).ravel()
+    component_sums = np.bincount(labels, weights=row_sums, minlength=num_components)
+    component_scale = np.bincount(labels, weights=abs_row_sums, minlength=num_components)
+    floating = np.abs(component_sums) <= 1e-10 * component_scale
+
+    # Componentes que contêm algum nó restrito não são flutuantes
+    if constrained_nodes is not None:
+        constrained_nodes = np.asarray(constrained_nodes, dtype=np.int64)
+        floating[labels[constrained_nodes]] = False
+    floating_nodes = np.flatnonzero(floating[labels])
+    if floating_nodes.size:
+        messages.append(f"{floating_nodes.size} nó(s) flutuante(s) em {num_components} componente(s) conexa(s)")
+
+    # Estimativa do espectro (Lanczos/ARPACK)
+    min_eigenvalue = max_eigenvalue = condition_number = None
+    if estimate_spectrum and symmetric and n > 2:
+        min_eigenvalue, max_eigenvalue = estimate_extreme_eigenvalues(K)
+        if min_eigenvalue is not None and max_eigenvalue is not None:
+            if abs(min_eigenvalue) <= tol * abs(max_eigenvalue):
+                condition_number = np.inf
+                messages.append("Menor autovalor nulo: matriz singular")
+            else:
+                condition_number = abs(max_eigenvalue / min_eigenvalue)
+
+    singular = bool(zero_rows.size or zero_cols.size or floating_nodes.size or condition_number == np.inf)
+
+    return {
+        'shape': K.shape,
+        'nnz': K.nnz,
+        'zero_rows': zero_rows,
+        'zero_cols': zero_cols,
+        'zero_diagonal': zero_diagonal,
+        'symmetric': bool(symmetric),
+        'asymmetry': float(asymmetry),
+        'num_components': int(num_components),
+        'floating_nodes': floating_nodes,
+        'min_eigenvalue': min_eigenvalue,
+        'max_eigenvalue': max_eigenvalue,
+        'condition_number': condition_number,
+        'singular': singular,
+        'messages': messages,
+    }
+
+def estimate_extreme_eigenvalues(K):
+    """
+    Estima o menor e o maior autovalor de uma matriz esparsa simétrica com ARPACK. O menor
+    autovalor é obtido por shift-invert em torno de zero; se a fatoração falhar a matriz é
+    singular e o menor autovalor é reportado como 0.
+
+    Args:
+    - K (scipy.sparse matrix): Matriz simétrica.
+
+    Returns:
+    - min_eigenvalue (float ou None): Menor autovalor (None se ARPACK não convergir).
+    - max_eigenvalue (float ou None): Maior autovalor (None se ARPACK não convergir).
+    """
+    K = sp.csc_matrix(K)
+
+    try:
+        max_eigenvalue = float(eigsh(K, k=1, which='LM', return_eigenvectors=False)[0])
+    except (ArpackError, ArpackNoConvergence):
+        max_eigenvalue = None
+
+    try:
+        min_eigenvalue = float(eigsh(K, k=1, sigma=0, which='LM', return_eigenvectors=False)[0])
+    except (ArpackError, ArpackNoConvergence):
+        min_eigenvalue = None
+    except RuntimeError:
+        # Fatoração de K exatamente singular
+        min_eigenvalue = 0.0
+
+    return min_eigenvalue, max_eigenvalue
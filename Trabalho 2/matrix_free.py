@@ -0,0 +1,201 @@
+import numpy as np
+from scipy.sparse.linalg import LinearOperator
+from element_geometry import detect_affine_elements, inverse_2x2
+from memory_mode import index_dtype, memory_report, storage_dtype
+from quadrature_selection import quadrature_degrees
+from reference_tables import reference_tables
+from sum_factorization import (check_sum_factorization, from_tensor, sum_factorized_apply, sum_factorized_diagonal,
+                               sum_factorized_geometry, tensor_tables, to_tensor)
+
+class MatrixFreeStiffness(LinearOperator):
+    """
+    Operador de rigidez de Poisson sem montagem da matriz global.
+
+    A geometria de cada elemento (D = k * w * |detJ| * invJ @ invJ.T nos pontos de Gauss) e a
+    tabela dos gradientes de referência são calculadas uma única vez. Cada aplicação do operador
+    calcula as contribuições dos elementos a partir dessas tabelas e as soma no vetor global, de
+    modo que a memória cresce com o número de elementos e pontos de Gauss, e não com o número de
+    entradas não nulas de K (dominante para ordem >= 3).
+
+    Com kernel='sum_factorization' (quadriláteros Q_p), o operador guarda apenas o fator geométrico
+    nos pontos de Gauss e aplica os gradientes por contrações 1D (custo O(p³) por elemento).
+
+    No modo de memória 'compact', a conectividade e as tabelas geométricas são armazenadas como
+    int32 e float32; os produtos e as somas são feitos em float64.
+
+    Se constrained_nodes for fornecido, o operador reproduz apply_dirichlet: as linhas e colunas
+    dos nós restritos são anuladas e a diagonal correspondente vale 1.
+    """
+
+    def __init__(self, vertices, elements, order, type_element, coefficient=1.0, affine='auto', constrained_nodes=None, kernel='standard',
+                 quadrature_degree=None):
+        """
+        Args:
+        - vertices (ndarray): Coordenadas dos nós da malha, formato (n_nos, 2).
+        - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento).
+        - order (int): A ordem polinomial para as funções de forma.
+        - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+        - coefficient (float ou callable): Coeficiente de difusão k ou função k(x, y).
+        - affine (bool ou str): Detecção de elementos afins ('auto'), malha toda afim (True) ou caminho geral (False).
+        - constrained_nodes (array): Índices dos nós com condição de Dirichlet homogênea (opcional).
+        - kernel (str): 'standard' (quadratura tabelada) ou 'sum_factorization' (quadriláteros Q_p, contrações 1D).
+        - quadrature_degree (int ou dict): Grau da quadratura da rigidez (None: escolha pelo grau da base; ver
+          quadrature_selection).
+        """
+        if vertices is None or elements is None:
+            raise ValueError("Matriz K, vetor F, ou vértices não podem ser vazios")
+        if type_element not in ['tri', 'quad']:
+            raise ValueError("Tipo de elemento inválido. Deve ser 'tri' ou 'quad'")
+        if kernel not in ['standard', 'sum_factorization']:
+            raise ValueError("Núcleo inválido. Deve ser 'standard' ou 'sum_factorization'")
+
+        vertices = np.asarray(vertices, dtype=float)[:, :2]
+        self.elements = np.ascontiguousarray(elements, dtype=index_dtype(len(vertices)))
+        self.num_nodes = len(vertices)
+        num_element_nodes = self.elements.shape[1]
+        self.constrained_nodes = None if constrained_nodes is None else np.asarray(constrained_nodes, dtype=np.int64)
+
+        # Grau da quadratura da rigidez
+        stiffness_degree = quadrature_degrees(vertices, self.elements, type_element, ('stiffness',), affine,
+                                              quadrature_degree)['stiffness']
+
+        # Quadriláteros Q_p: fator geométrico nos pontos de Gauss da regra tensorial do mesmo grau
+        self.order = order
+        self.sum_factorization = kernel == 'sum_factorization'
+        if self.sum_factorization:
+            self.degree = check_sum_factorization(type_element, num_element_nodes)
+            self.num_points_1d = stiffness_degree // 2 + 1
+            _, _, factors = sum_factorized_geometry(vertices[self.elements], self.degree, self.num_points_1d, coefficient)
+            self.factors = factors.astype(storage_dtype())
+            super().__init__(dtype=np.float64, shape=(self.num_nodes, self.num_nodes))
+            return
+
+        # Tabelas do elemento de referência
+        _, weights, N, dN = reference_tables(type_element, stiffness_degree, num_element_nodes)
+        self.dN = dN
+
+        # Geometria de todos os elementos
+        node_coords = vertices[self.elements]
+        J = np.einsum('eai,qaj->eqij', node_coords, dN)
+        if affine is True:
+            mesh_affine = True
+        elif affine == 'auto':
+            mesh_affine = bool(np.all(detect_affine_elements(J, node_coords=node_coords, dN=dN)))
+        else:
+            mesh_affine = False
+
+        # Malha afim: uma geometria por elemento, reaproveitada em todos os pontos de Gauss
+        collapsed = mesh_affine and not callable(coefficient)
+        if collapsed:
+            J = J[:, :1]
+        detJ, invJ = inverse_2x2(J)
+
+        # Fator D = k * w * |detJ| * invJ @ invJ.T, armazenado pelas entradas 00, 01 e 11
+        if callable(coefficient):
+            x_gauss = np.einsum('eai,qa->eqi', node_coords, N)
+            scale = coefficient(x_gauss[..., 0], x_gauss[..., 1]) * np.abs(detJ)
+        else:
+            scale = coefficient * np.abs(detJ)
+        if not collapsed:
+            scale = scale * weights
+
+        self.D = np.empty(J.shape[:2] + (3,), dtype=storage_dtype())
+        self.D[..., 0] = (invJ[..., 0, 0] ** 2 + invJ[..., 0, 1] ** 2) * scale
+        self.D[..., 1] = (invJ[..., 0, 0] * invJ[..., 1, 0] + invJ[..., 0, 1] * invJ[..., 1, 1]) * scale
+        self.D[..., 2] = (invJ[..., 1, 0] ** 2 + invJ[..., 1, 1] ** 2) * scale
+
+        # Malha afim: os pesos de Gauss ficam na tabela de gradientes
+        self.weights = weights if collapsed else None
+
+        super().__init__(dtype=np.float64, shape=(self.num_nodes, self.num_nodes))
+
+    def _element_fluxes(self, grad_ref):
+        """
+        Aplica D aos gradientes de referência, formato (n_elementos, n_pontos, 2).
+        """
+        D = self.D
+        if self.weights is not None:
+            grad_ref = grad_ref * self.weights[:, None]
+        flux = np.empty_like(grad_ref)
+        flux[..., 0] = D[..., 0] * grad_ref[..., 0] + D[..., 1] * grad_ref[..., 1]
+        flux[..., 1] = D[..., 1] * grad_ref[..., 0] + D[..., 2] * grad_ref[..., 1]
+        return flux
+
+    def _matvec(self, u):
+        """
+        Calcula K @ u elemento a elemento e soma as contribuições.
+        """
+        u = np.array(u, dtype=float).ravel()
+        u_free = u
+        if self.constrained_nodes is not None:
+            u_free = u.copy()
+            u_free[self.constrained_nodes] = 0.0
+
+        if self.sum_factorization:
+            # Contribuições dos elementos por contrações 1D em formato tensorial
+            _, _, _, tensor_index = tensor_tables(self.degree, self.num_points_1d)
+            U = to_tensor(u_free[self.elements], tensor_index, self.degree)
+            y_local = from_tensor(sum_factorized_apply(U, self.factors, self.degree, self.num_points_1d), tensor_index)
+        else:
+            # Gradientes de referência da solução em cada ponto de Gauss
+            grad_ref = np.einsum('ea,qai->eqi', u_free[self.elements], self.dN)
+
+            # Contribuições dos elementos
+            y_local = np.einsum('eqi,qai->ea', self._element_fluxes(grad_ref), self.dN)
+
+        # Soma no vetor global
+        y = np.bincount(self.elements.ravel(), weights=y_local.ravel(), minlength=self.num_nodes)
+
+        if self.constrained_nodes is not None:
+            y[self.constrained_nodes] = u[self.constrained_nodes]
+
+        return y
+
+    def _rmatvec(self, u):
+        # O operador é simétrico
+        return self._matvec(u)
+
+    def diagonal(self):
+        """
+        Extrai a diagonal do operador (para o pré-condicionador de Jacobi) sem montar a matriz.
+
+        Returns:
+        - diagonal (ndarray): Diagonal de K, tamanho n_nos.
+        """
+        if self.sum_factorization:
+            _, _, _, tensor_index = tensor_tables(self.degree, self.num_points_1d)
+            diagonal_local = from_tensor(sum_factorized_diagonal(self.factors, self.degree, self.num_points_1d), tensor_index)
+        else:
+            dN = self.dN
+            if self.weights is not None:
+                dN_weighted = dN * self.weights[:, None, None]
+            else:
+                dN_weighted = dN
+
+            # K_e[a, a] = sum_q dN_a(q) . D(q) dN_a(q)
+            D = np.broadcast_to(self.D, (len(self.elements), dN.shape[0], 3))
+            diagonal_local = (np.einsum('eq,qa,qa->ea', D[..., 0], dN_weighted[..., 0], dN[..., 0])
+                              + 2 * np.einsum('eq,qa,qa->ea', D[..., 1], dN_weighted[..., 0], dN[..., 1])
+                              + np.einsum('eq,qa,qa->ea', D[..., 2], dN_weighted[..., 1], dN[..., 1]))
+        diagonal = np.bincount(self.elements.ravel(), weights=diagonal_local.ravel(), minlength=self.num_nodes)
+
+        if self.constrained_nodes is not None:
+            diagonal[self.constrained_nodes] = 1.0
+
+        return diagonal
+
+    def memory_usage(self, verbose=True):
+        """
+        Bytes usados pelos arrays armazenados no operador (ver memory_mode.memory_report).
+
+        Returns:
+        - report (dict): Nome -> (dtype, formato, bytes), com a entrada 'total' em bytes.
+        """
+        arrays = {'elements': self.elements}
+        if self.sum_factorization:
+            arrays['factors'] = self.factors
+        else:
+            arrays['D'] = self.D
+        if self.constrained_nodes is not None:
+            arrays['constrained_nodes'] = self.constrained_nodes
+        return memory_report(arrays, verbose)
@@ -0,0 +1,125 @@
+import numpy as np
+import scipy.sparse as sp
+
+# Modo de memória global: 'standard' (int64/float64) ou 'compact' (int32/float32 quando possível)
+_memory_mode = {'mode': 'standard'}
+
+def set_memory_mode(mode):
+    """
+    Define o modo de memória usado pela malha, pelo padrão de esparsidade e pelas tabelas geométricas.
+
+    No modo 'compact', conectividades e índices CSR são armazenados como int32 sempre que os
+    tamanhos permitem, e coordenadas e tabelas geométricas por elemento (fatores do operador
+    matrix-free) como float32. As somas (matrizes locais, montagem, produtos do operador) continuam
+    em float64. As tabelas do elemento de referência (reference_tables, tabulation_cache) ficam em
+    float64: seu tamanho não depende da malha, e em float32 elas só acrescentariam erro a todas as
+    integrais.
+
+    Args:
+    - mode (str): 'standard' ou 'compact'.
+    """
+    if mode not in ['standard', 'compact']:
+        raise ValueError("Modo de memória inválido. Deve ser 'standard' ou 'compact'")
+    _memory_mode['mode'] = mode
+
+def get_memory_mode():
+    """
+    Retorna o modo de memória atual ('standard' ou 'compact').
+    """
+    return _memory_mode['mode']
+
+def index_dtype(max_value):
+    """
+    Tipo inteiro usado para índices que não ultrapassam max_value.
+
+    Args:
+    - max_value (int): Maior valor que o índice pode assumir.
+
+    Returns:
+    - dtype (numpy.dtype): int32 no modo 'compact' quando max_value cabe em 32 bits, senão int64.
+    """
+    if get_memory_mode() == 'compact' and max_value <= np.iinfo(np.int32).max:
+        return np.dtype(np.int32)
+    return np.dtype(np.int64)
+
+def storage_dtype():
+    """
+    Tipo de ponto flutuante usado para armazenar coordenadas e tabelas geométricas por elemento.
+
+    Returns:
+    - dtype (numpy.dtype): float32 no modo 'compact', senão float64.
+    """
+    return np.dtype(np.float32) if get_memory_mode() == 'compact' else np.dtype(np.float64)
+
+def as_index_array(elements):
+    """
+    Converte uma conectividade para inteiros com sinal sem copiar arrays int32 ou int64 (tags sem
+    sinal do gmsh, por exemplo, são convertidas para int64).
+
+    Args:
+    - elements (ndarray): Conectividade da malha.
+
+    Returns:
+    - elements (ndarray): Conectividade como int32 ou int64.
+    """
+    elements = np.asarray(elements)
+    if elements.dtype not in (np.int32, np.int64):
+        elements = elements.astype(np.int64)
+    return elements
+
+def compact_mesh(nodes, elements):
+    """
+    Converte os arrays da malha para os tipos do modo de memória atual.
+
+    Args:
+    - nodes (ndarray): Coordenadas dos nós da malha, formato (n_nos, 2).
+    - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento).
+
+    Returns:
+    - nodes (ndarray): Coordenadas no tipo storage_dtype().
+    - elements (ndarray): Conectividade no tipo index_dtype() (C-contígua).
+    """
+    nodes = np.ascontiguousarray(nodes, dtype=storage_dtype())
+    elements = np.asarray(elements)
+    max_value = int(elements.max()) if elements.size else 0
+    elements = np.ascontiguousarray(elements, dtype=index_dtype(max_value))
+    return nodes, elements
+
+def memory_report(arrays, verbose=True):
+    """
+    Calcula os bytes usados por cada array, para planejar o consumo de memória de uma execução.
+
+    Args:
+    - arrays (dict): Nome -> ndarray, matriz esparsa ou tupla de arrays (por exemplo, um padrão de
+      esparsidade). Matrizes esparsas são decompostas em data, indices e indptr (ou row e col).
+    - verbose (bool): Se True, imprime a tabela de consumo.
+
+    Returns:
+    - report (dict): Nome -> (dtype, formato, bytes), com a entrada 'total' em bytes.
+    """
+    report = {}
+    for name, array in arrays.items():
+        if sp.issparse(array):
+            parts = {attribute: getattr(array, attribute) for attribute in ('data', 'indices', 'indptr', 'row', 'col')
+                     if hasattr(array, attribute)}
+        elif isinstance(array, tuple):
+            parts = {str(i): part for i, part in enumerate(array)}
+        else:
+            parts = {None: array}
+
+        for part_name, part in parts.items():
+            part = np.asarray(part)
+            key = name if part_name is None else f"{name}.{part_name}"
+            report[key] = (part.dtype.name, part.shape, part.nbytes)
+
+    report['total'] = sum(nbytes for _, _, nbytes in report.values())
+
+    if verbose:
+        for key, value in report.items():
+            if key == 'total':
+                continue
+            dtype, shape, nbytes = value
+            print(f"{key:<30} {dtype:<10} {str(shape):<20} {nbytes / 2**20:12.3f} MiB")
+        print(f"{'total':<30} {'':<10} {'':<20} {report['total'] / 2**20:12.3f} MiB")
+
+    return report
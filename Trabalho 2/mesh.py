@@ -1,175 +1,123 @@
-import gmsh
 import numpy as np
-import matplotlib.pyplot as plt
+from memory_mode import get_memory_mode, storage_dtype
+from gmsh_mesher import shared_gmsh_mesher
+from mesh_store import cached_mesh, get_mesh_store, load_mesh, store_mesh
+from structured_mesh import BOUNDARY_TAGS, fill_structured_rectangle, structured_rectangle_layout
 
-def generate_mesh(size, refinement_level, element_type, order):
+# Elementos gerados por bloco na malha estruturada (limita a memória ao escrever no armazenamento)
+MESH_BLOCK_SIZE = 2**20
+
+def generate_mesh(size, refinement_level, element_type, order, mesher='auto', pattern='right', return_boundary=False):
     """
-    Gera a malha usando Gmsh com os parâmetros fornecidos.
+    Gera a malha do domínio quadrado [0, size]^2 com os parâmetros fornecidos.
+
+    Como o domínio é um retângulo, o padrão ('auto') é a malha estruturada de structured_mesh, gerada
+    com NumPy sem iniciar o gmsh. O nível de refinamento define o mesmo tamanho de elemento da malha
+    do gmsh, lc = size / refinement_level**2, isto é, refinement_level**2 células por lado.
+
+    Com o armazenamento de malhas ativo (ver mesh_store.set_mesh_store), cada malha é gerada uma
+    única vez por conjunto de parâmetros; as chamadas seguintes mapeiam o arquivo (np.memmap).
 
     Args:
     - size (float): Tamanho do domínio quadrado.
     - refinement_level (int): Nível de refinamento da malha.
     - element_type (str): Tipo de elementos para gerar ('tri' para triangular, 'quad' para quadrilátero).
     - order (int): Ordem do polinômio de Lagrange.
+    - mesher (str): 'auto' ou 'structured' (malha estruturada) ou 'gmsh' (malha não estruturada do
+      gmsh, gerada por uma sessão persistente; ver gmsh_mesher.GmshMesher).
+    - pattern (str): Diagonal dos triângulos da malha estruturada ('right', 'left' ou 'alternate').
+    - return_boundary (bool): Se True, retorna também as arestas de cada lado do quadrado.
 
     Returns:
     - nodes (ndarray): Vetor de vértices da malha.
-    - elements (ndarray): Vetor de elementos da malha.
+    - elements (ndarray): Vetor de elementos da malha (índices dos nós a partir de zero).
+    - boundary_facets (ndarray): Apenas com return_boundary: nós de cada aresta do contorno
+      (extremidades e depois os nós internos).
+    - boundary_tags (ndarray): Apenas com return_boundary: lado de cada aresta (BOUNDARY_TAGS).
     """
-    # Verificar os parâmetros
-    try:
-        # Verificar se o tamanho do lado do quadrado é maior que zero
-        if size <= 0:
-            raise ValueError("Erro: O tamanho do lado do quadrado deve ser maior que zero")
-
-        # Verificar se o nível de refinamento é maior que zero
-        if refinement_level <= 0:
-            raise ValueError("Erro: O nível de refinamento deve ser maior que zero")
-
-        # Verificar se o tipo de elemento é válido
-        if element_type not in ["tri", "quad"]:
-            raise ValueError("Erro: O tipo de elemento deve ser 'tri' ou 'quad'")
-
-        # Verificar se a ordem do polinômio de Lagrange é maior que zero
-        if order <= 0:
-            raise ValueError("Erro: A ordem do polinômio de Lagrange deve ser maior que zero")
-    except:
-        pass
-
-    # Inicializar o Gmsh
-    try:
-        gmsh.initialize()
-    except Exception as e:
+    if mesher not in ['auto', 'structured', 'gmsh']:
+        raise ValueError("Gerador de malha inválido. Deve ser 'auto', 'structured' ou 'gmsh'")
+
+    # Retângulo: malha estruturada com conectividade int32, escrita por blocos
+    if mesher != 'gmsh':
+        divisions = int(refinement_level) ** 2
+        params = {'generator': 'structured', 'size': float(size), 'divisions': divisions, 'element_type': element_type,
+                  'order': int(order), 'pattern': pattern, 'node_dtype': storage_dtype().str}
+        layout = structured_rectangle_layout(divisions, divisions, element_type, order, storage_dtype())
+
+        def fill(arrays):
+            fill_structured_rectangle(arrays, divisions, divisions, element_type, order, size, size, pattern=pattern,
+                                      block_size=MESH_BLOCK_SIZE)
+
+        arrays, _ = cached_mesh(params, layout, fill, {'boundary_tags': BOUNDARY_TAGS})
+        return _mesh_arrays(arrays, return_boundary)
+
+    # Malha do gmsh já armazenada
+    params = {'generator': 'gmsh', 'size': float(size), 'refinement_level': int(refinement_level),
+              'element_type': element_type, 'order': int(order), 'memory_mode': get_memory_mode()}
+    loaded = load_mesh(params)
+    if loaded is not None:
+        arrays, _ = loaded
+        return _mesh_arrays(arrays, return_boundary)
+
+    # Sessão persistente do gmsh: a geometria é reaproveitada e só a malha é refeita
+    try:
+        nodes, elements, boundary_facets, boundary_tags = shared_gmsh_mesher(size).generate(refinement_level, element_type,
+                                                                                           order, boundary=True)
+    except (ImportError, OSError) as e:
         raise ValueError(f"Erro ao inicializar o Gmsh: {e}") from e
 
-    # Criar um domínio para a malha
-    try:
-        gmsh.model.add("Mesh")
-    except Exception as e:
-        raise ValueError(f"Erro ao criar o domínio para a malha: {e}") from e
-
-    # Definir o tamanho do domínio
-    try:
-        lc = size / (refinement_level ** 2)
-    except Exception as e:
-        raise ValueError(f"Erro ao calcular o tamanho da malha: {e}") from e
-
-    # Definir os pontos do domínio
-    try:            
-        p1 = gmsh.model.geo.addPoint(0, 0, 0, lc)
-        p2 = gmsh.model.geo.addPoint(size, 0, 0, lc)
-        p3 = gmsh.model.geo.addPoint(size, size, 0, lc)
-        p4 = gmsh.model.geo.addPoint(0, size, 0, lc)
-    except Exception as e:
-        raise ValueError(f"Erro ao adicionar os pontos do domínio: {e}") from e
-
-    # Criar as linhas do domínio
-    try:
-        l1 = gmsh.model.geo.addLine(p1, p2)
-        l2 = gmsh.model.geo.addLine(p2, p3)
-        l3 = gmsh.model.geo.addLine(p3, p4)
-        l4 = gmsh.model.geo.addLine(p4, p1)
-    except Exception as e:
-        raise ValueError(f"Erro ao criar as linhas do domínio: {e}") from e
-
-    # Criar o loop da superfície
-    try:
-        loop = gmsh.model.geo.addCurveLoop([l1, l2, l3, l4])
-        surface = gmsh.model.geo.addPlaneSurface([loop])
-    except Exception as e:
-        raise ValueError(f"Erro ao criar o loop da superfície: {e}") from e
-
-    # Sincronizar a geometria
-    try:
-        gmsh.model.geo.synchronize()
-    except Exception as e:
-        raise ValueError(f"Erro ao sincronizar a geometria: {e}") from e
-
-    # Definir a ordem do polinômio de Lagrange
-    try:
-        gmsh.option.setNumber("Mesh.ElementOrder", order)
-    except Exception as e:
-        raise ValueError(f"Erro ao definir a ordem do polinômio de Lagrange: {e}") from e
+    # Conectividade int32 do importador (como na malha estruturada); coordenadas no tipo do modo de memória
+    nodes = np.ascontiguousarray(nodes, dtype=storage_dtype())
+    arrays = {'nodes': nodes, 'elements': elements, 'boundary_facets': boundary_facets, 'boundary_tags': boundary_tags}
 
-    # Definir opções de recomposição se necessário
-    if element_type == "quad":
+    if get_mesh_store() is not None:
         try:
-            gmsh.option.setNumber("Mesh.RecombineAll", 1)
-            gmsh.model.mesh.setRecombine(2, surface)
-        except Exception as e:
-            raise ValueError(f"Erro ao definir as opções de recomposição: {e}") from e
-
-    # Gerar a malha
-    try:
-        gmsh.model.mesh.generate(2)
-    except Exception as e:
-        raise ValueError(f"Erro ao gerar a malha: {e}") from e
-
-    # Obter nós e elementos da malha
-    try:
-        node_tags, node_coords, _ = gmsh.model.mesh.getNodes()
-        element_types, element_tags, element_node_tags = gmsh.model.mesh.getElements(2)
-    except Exception as e:
-        raise ValueError(f"Erro ao obter serviços da malha: {e}") from e
+            arrays, _ = store_mesh(params, arrays, {'boundary_tags': BOUNDARY_TAGS})
+        except OSError:
+            pass
 
-    # Converter os resultados para numpy arrays
-    try:
-        nodes = np.array(node_coords).reshape((-1, 3))[:, :2]
-    except Exception as e:
-        raise ValueError(f"Erro ao converter os resultados para numpy arrays: {e}") from e
-
-    # Verificar o tipo de elementos e ajustá-los corretamente
-    try:    
-        if element_type == "tri":
-            elements = []
-            for i, elem_type in enumerate(element_types):
-                if elem_type == 2:  # 2 é o código para elementos triangulares
-                    elements = np.array(element_node_tags[i]).reshape((-1, 3))
-                    break
-        else:    
-            elements = []        
-            for i, elem_type in enumerate(element_types):    
-                if elem_type == 3:  # 3 é o código para elementos quadriláteros 
-                    elements = np.array(element_node_tags[i]).reshape((-1, 4))
-                    break
-    except Exception as e:
-        raise ValueError(f"Erro ao verificar o tipo de elementos e ajustá-los corretamente: {e}") from e
+    return _mesh_arrays(arrays, return_boundary)
 
-    # Finalizar o Gmsh
-    try:
-        gmsh.finalize()
-    except Exception as e:
-        raise ValueError(f"Erro ao finalizar o Gmsh: {e}") from e
+def _mesh_arrays(arrays, return_boundary):
+    if return_boundary:
+        return arrays['nodes'], arrays['elements'], arrays['boundary_facets'], arrays['boundary_tags']
+    return arrays['nodes'], arrays['elements']
 
-    return nodes, elements
-
-def plot_mesh(nodes, elements, display):
+def plot_mesh(nodes, elements, display, element_type=None):
     """
     Plota a malha de elementos finitos.
+
+    Cada aresta é desenhada uma única vez, como uma linha que passa pelos seus nós (arestas da
+    mesh_topology.Mesh, em cache na malha).
     
     Args:
-    - nodes (ndarray): Vetor de vértices da malha.
-    - elements (ndarray): Vetor de elementos da malha.
+    - nodes (ndarray ou mesh_topology.Mesh): Vetor de vértices da malha, ou a própria malha.
+    - elements (ndarray): Vetor de elementos da malha (não usado com uma Mesh).
     - display (str): Opção de exibição:
         - "no": Não plota a malha.
         - "mesh": Plota apenas a malha.
         - "nodes": Plota a malha e os nós.
         - "val": Plota a malha e numera os nós.
+    - element_type (str): 'tri' ou 'quad'; se None, é deduzido do número de nós por elemento.
     """
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+    from mesh_topology import Mesh
+
+    mesh = Mesh.from_arrays(nodes, elements, element_type)
+    nodes = mesh.nodes
+
     # Criar uma figura
     try:
         plt.figure(figsize=(8, 8))
     except Exception as e:
         raise ValueError(f"Erro ao criar a figura: {e}") from e
 
-    # Plotar os elementos ligando os vértices por linhas
+    # Plotar as arestas da malha, cada uma uma única vez ('k' para linhas pretas)
     try:
-        for elem in elements:
-            elem_vertices = nodes[elem - 1, :]  # Ajustar índice para zero-based
-            for i in range(len(elem)):
-                x = [elem_vertices[i, 0], elem_vertices[(i + 1) % len(elem), 0]]
-                y = [elem_vertices[i, 1], elem_vertices[(i + 1) % len(elem), 1]]
-                plt.plot(x, y, 'k-', linewidth=0.7)  # 'k-' para linhas pretas
+        plt.gca().add_collection(LineCollection(nodes[mesh.edge_nodes], colors='k', linewidths=0.7))
+        plt.gca().autoscale_view()
     except Exception as e:
         raise ValueError(f"Erro ao plotar os elementos: {e}") from e
    
@@ -185,7 +133,7 @@ def plot_mesh(nodes, elements, display):
         elif display == 'val':
             # Numerando os nós
             for i, (x, y) in enumerate(nodes):
-                plt.text(x, y, f'{i+1}', fontsize=8, ha='right', va='top')
+                plt.text(x, y, f'{i}', fontsize=8, ha='right', va='top')
     except Exception as e:
         raise ValueError(f"Erro ao plotar a malha: {e}") from e
     
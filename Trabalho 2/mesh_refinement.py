@@ -0,0 +1,230 @@
+from functools import lru_cache
+import numpy as np
+from hierarchical_basis import EDGES
+from lagrange_basis import basis_degree, reference_nodes, tabulate_basis
+from memory_mode import as_index_array
+from mesh_topology import mesh_edges
+
+# Filhos de cada elemento no refinamento uniforme
+NUM_CHILDREN = 4
+
+# Refinamento vermelho do triângulo, em vértices e pontos médios do triângulo de referência com
+# coordenadas multiplicadas por 2: os três triângulos de canto e o central (todos anti-horários)
+_TRIANGLE_CHILDREN = np.array([
+    [[0, 0], [1, 0], [0, 1]],
+    [[1, 0], [2, 0], [1, 1]],
+    [[0, 1], [1, 1], [0, 2]],
+    [[1, 1], [0, 1], [1, 0]],
+])
+
+# Quadrilátero: canto inferior esquerdo de cada filho, em unidades de meio lado (anti-horário)
+_QUAD_CHILDREN = np.array([[0, 0], [1, 0], [1, 1], [0, 1]])
+
+@lru_cache(maxsize=None)
+def _refinement_tables(type_element, degree):
+    """
+    Pontos da grade de passo 1/(2k) do elemento de referência usados pelos filhos, classificados
+    em nós do elemento pai, pontos de aresta e pontos interiores.
+
+    Returns:
+    - lattice (ndarray): Coordenadas inteiras (i, j) de cada ponto, formato (n_pontos, 2).
+    - coarse_local (ndarray): Nó local do pai no ponto (-1 se o ponto for novo).
+    - edge (ndarray): Aresta local que contém o ponto novo (-1 se não estiver em aresta).
+    - edge_position (ndarray): Posição do ponto na aresta, 1 .. 2k - 1 a partir do primeiro vértice.
+    - interior_slot (ndarray): Índice do ponto novo interior (-1 nos demais).
+    - children (ndarray): Ponto de cada nó local de cada filho, formato (4, n_nos_elemento).
+    - reference (ndarray): Coordenadas de referência de cada ponto, formato (n_pontos, 2).
+    """
+    k = degree
+    n = 2 * k
+    if type_element == 'tri':
+        lattice = np.array([(i, j) for j in range(n + 1) for i in range(n + 1 - j)])
+        corners = np.array([[0, 0], [n, 0], [0, n]])
+        coarse = np.rint(reference_nodes('tri', k) * k).astype(int) * 2
+        child_nodes = np.rint(reference_nodes('tri', k) * k).astype(int)
+        A, B, C = _TRIANGLE_CHILDREN[:, 0], _TRIANGLE_CHILDREN[:, 1], _TRIANGLE_CHILDREN[:, 2]
+        child_points = (A[:, None] * k + child_nodes[None, :, :1] * (B - A)[:, None]
+                        + child_nodes[None, :, 1:] * (C - A)[:, None])
+        reference = lattice / n
+    else:
+        lattice = np.array([(i, j) for j in range(n + 1) for i in range(n + 1)])
+        corners = np.array([[0, 0], [n, 0], [n, n], [0, n]])
+        coarse = np.rint((reference_nodes('quad', k) + 1.0) * k / 2).astype(int) * 2
+        child_nodes = np.rint((reference_nodes('quad', k) + 1.0) * k / 2).astype(int)
+        child_points = _QUAD_CHILDREN[:, None, :] * k + child_nodes[None]
+        reference = lattice / k - 1.0
+
+    index = {tuple(point): p for p, point in enumerate(lattice)}
+    num_points = len(lattice)
+
+    coarse_local = np.full(num_points, -1)
+    coarse_local[[index[tuple(point)] for point in coarse]] = np.arange(len(coarse))
+
+    edge = np.full(num_points, -1)
+    edge_position = np.zeros(num_points, dtype=int)
+    for local_edge, (a, b) in enumerate(EDGES[type_element]):
+        d = corners[b] - corners[a]
+        r = lattice - corners[a]
+        on_edge = (d[0] * r[:, 1] - d[1] * r[:, 0] == 0) & (r @ d > 0) & (r @ d < d @ d) & (coarse_local < 0)
+        edge[on_edge] = local_edge
+        edge_position[on_edge] = np.abs(r[on_edge]).max(axis=1)
+
+    interior = (coarse_local < 0) & (edge < 0)
+    interior_slot = np.full(num_points, -1)
+    interior_slot[interior] = np.arange(np.count_nonzero(interior))
+
+    children = np.array([[index[tuple(point)] for point in points] for points in child_points])
+    return lattice, coarse_local, edge, edge_position, interior_slot, children, reference
+
+def refine_uniform(nodes, elements, type_element):
+    """
+    Refinamento uniforme aninhado: cada triângulo é dividido em 4 pelos pontos médios das arestas
+    (refinamento vermelho) e cada quadrilátero em 4 pelos pontos médios das arestas e pelo centro.
+
+    Funciona em qualquer ordem k: os nós da malha fina ficam na grade de passo 1/(2k) de cada
+    elemento pai, que contém os nós do pai. Os nós da malha grossa mantêm seus índices; os novos
+    nós de aresta são numerados uma única vez por aresta global e os interiores por elemento, e
+    suas coordenadas vêm do mapeamento do pai (a geometria de elementos curvos é preservada).
+
+    Args:
+    - nodes (ndarray): Coordenadas dos nós da malha grossa, formato (n_nos, 2).
+    - elements (ndarray): Conectividade da malha grossa, formato (n_elementos, n_nos_elemento).
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+
+    Returns:
+    - fine_nodes (ndarray): Coordenadas dos nós da malha fina.
+    - fine_elements (ndarray): Conectividade da malha fina; os filhos do elemento e são as linhas
+      4e .. 4e + 3.
+    - parent (ndarray): Elemento pai de cada elemento fino.
+    - coarse_to_fine (ndarray): Nó fino de cada nó grosso.
+    """
+    if type_element not in ['tri', 'quad']:
+        raise ValueError("Tipo de elemento inválido. Deve ser 'tri' ou 'quad'")
+    nodes = np.asarray(nodes)[:, :2]
+    elements = as_index_array(elements)
+    num_elements, num_element_nodes = elements.shape
+    k = basis_degree(type_element, num_element_nodes)
+    num_nodes = len(nodes)
+
+    _, coarse_local, edge, edge_position, interior_slot, children, reference = _refinement_tables(type_element, k)
+    edges, element_edges = mesh_edges(elements, type_element)
+    num_interior = int(interior_slot.max()) + 1
+    num_fine_nodes = num_nodes + len(edges) * k + num_elements * num_interior
+
+    # Índice global de cada ponto da grade de cada elemento, formato (n_elementos, n_pontos)
+    ids = np.empty((num_elements, len(coarse_local)), dtype=np.int64)
+    is_coarse = coarse_local >= 0
+    ids[:, is_coarse] = elements[:, coarse_local[is_coarse]]
+
+    # Pontos de aresta: posições ímpares da aresta, contadas a partir do vértice de menor índice
+    on_edge = edge >= 0
+    local_edges = np.array(EDGES[type_element])[edge[on_edge]]
+    forward = elements[:, local_edges[:, 0]] < elements[:, local_edges[:, 1]]
+    position = np.where(forward, edge_position[on_edge], 2 * k - edge_position[on_edge])
+    ids[:, on_edge] = num_nodes + element_edges[:, edge[on_edge]].astype(np.int64) * k + (position - 1) // 2
+
+    is_interior = interior_slot >= 0
+    ids[:, is_interior] = (num_nodes + len(edges) * k + np.arange(num_elements, dtype=np.int64)[:, None] * num_interior
+                           + interior_slot[is_interior])
+
+    # Coordenadas dos novos nós pelo mapeamento de cada pai (nós de aresta repetidos recebem o mesmo valor)
+    new = ~is_coarse
+    N, _ = tabulate_basis(type_element, k, reference[new])
+    fine_nodes = np.empty((num_fine_nodes, 2), dtype=nodes.dtype)
+    fine_nodes[:num_nodes] = nodes
+    fine_nodes[ids[:, new]] = np.einsum('pa,ead->epd', N, nodes[elements].astype(float))
+
+    dtype = elements.dtype if num_fine_nodes - 1 <= np.iinfo(elements.dtype).max else np.dtype(np.int64)
+    fine_elements = np.ascontiguousarray(ids[:, children].reshape(-1, num_element_nodes), dtype=dtype)
+    parent = np.repeat(np.arange(num_elements, dtype=dtype), NUM_CHILDREN)
+    coarse_to_fine = np.arange(num_nodes, dtype=dtype)
+    return fine_nodes, fine_elements, parent, coarse_to_fine
+
+def refinement_hierarchy(nodes, elements, type_element, num_levels):
+    """
+    Sequência de malhas aninhadas obtida por refinamentos uniformes sucessivos da malha grossa.
+
+    Args:
+    - nodes, elements, type_element: Malha grossa (ver refine_uniform).
+    - num_levels (int): Número de malhas da sequência (a primeira é a malha grossa).
+
+    Returns:
+    - levels (list): Um dicionário por malha com 'nodes', 'elements', 'parent' (pai de cada elemento
+      na malha anterior) e 'coarse_to_fine' (nó de cada nó da malha anterior); os dois últimos são
+      None na malha grossa.
+    """
+    if not isinstance(num_levels, (int, np.integer)) or num_levels < 1:
+        raise ValueError("O número de níveis deve ser um inteiro positivo.")
+
+    levels = [{'nodes': np.asarray(nodes)[:, :2], 'elements': as_index_array(elements), 'parent': None,
+               'coarse_to_fine': None}]
+    for _ in range(1, num_levels):
+        _refine_last_level(levels, type_element)
+    return levels
+
+def _refine_last_level(levels, type_element):
+    """
+    Acrescenta à hierarquia o refinamento uniforme da sua última malha.
+    """
+    fine_nodes, fine_elements, parent, coarse_to_fine = refine_uniform(levels[-1]['nodes'], levels[-1]['elements'],
+                                                                       type_element)
+    levels.append({'nodes': fine_nodes, 'elements': fine_elements, 'parent': parent, 'coarse_to_fine': coarse_to_fine})
+
+def prolongate(u_coarse, coarse_elements, fine_elements, type_element):
+    """
+    Interpola uma função da malha grossa na malha fina obtida por refine_uniform (exata, pois os
+    espaços são aninhados).
+
+    Args:
+    - u_coarse (ndarray): Valores nodais na malha grossa (base de Lagrange).
+    - coarse_elements (ndarray): Conectividade da malha grossa.
+    - fine_elements (ndarray): Conectividade da malha fina (4 filhos consecutivos por pai).
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+
+    Returns:
+    - u_fine (ndarray): Valores nodais na malha fina.
+    """
+    coarse_elements = as_index_array(coarse_elements)
+    fine_elements = as_index_array(fine_elements)
+    k = basis_degree(type_element, coarse_elements.shape[1])
+    _, _, _, _, _, children, reference = _refinement_tables(type_element, k)
+
+    # Funções do pai nos nós de cada filho, formato (4, n_nos_filho, n_nos_pai)
+    N, _ = tabulate_basis(type_element, k, reference[children.ravel()])
+    N = N.reshape(NUM_CHILDREN, -1, coarse_elements.shape[1])
+
+    u_coarse = np.asarray(u_coarse, dtype=float)
+    values = np.einsum('cab,eb->eca', N, u_coarse[coarse_elements])
+    u_fine = np.empty(int(fine_elements.max()) + 1)
+    u_fine[fine_elements.reshape(len(coarse_elements), NUM_CHILDREN, -1)] = values
+    return u_fine
+
+def nested_mesh_generator(coarse_divisions=1, pattern='right'):
+    """
+    Gerador de malhas aninhadas para PoissonProblem (argumento mesh_generator): o nível de
+    refinamento L é a malha estruturada com coarse_divisions células por lado refinada L - 1 vezes,
+    isto é, coarse_divisions * 2**(L - 1) células por lado. Os níveis já calculados ficam em
+    generate.hierarchies, de modo que cada novo nível custa um único refinamento.
+
+    Returns:
+    - generate (callable): Função (size, refinement_level, element_type, order) -> (nós, elementos).
+    """
+    from structured_mesh import structured_rectangle_mesh
+
+    hierarchies = {}
+
+    def generate(size, refinement_level, element_type, order):
+        if refinement_level < 1:
+            raise ValueError("Erro: O nível de refinamento deve ser maior que zero")
+        key = (float(size), element_type, int(order))
+        if key not in hierarchies:
+            nodes, elements, _, _ = structured_rectangle_mesh(coarse_divisions, coarse_divisions, element_type, order,
+                                                              size, size, pattern=pattern)
+            hierarchies[key] = refinement_hierarchy(nodes, elements, element_type, 1)
+        levels = hierarchies[key]
+        while len(levels) < refinement_level:
+            _refine_last_level(levels, element_type)
+        return levels[refinement_level - 1]['nodes'], levels[refinement_level - 1]['elements']
+
+    generate.hierarchies = hierarchies
+    return generate
@@ -1,37 +1,52 @@
 import numpy as np
+from memory_mode import as_index_array
+from numba_kernels import numba_enabled, polygon_areas_numba
 
 
-def calculate_mesh_size(vertices, elements, type_element):
+def calculate_mesh_size(vertices, elements=None, type_element=None):
     """
     Calcula o tamanho médio da malha (h) a partir de suas vértices e elementos.
 
     Parameters
     ----------
-    vertices : ndarray
-        Array de vértices da malha.
+    vertices : ndarray ou mesh_topology.Mesh
+        Array de vértices da malha, ou uma Mesh (as áreas ficam em cache na malha).
     elements : ndarray
-        Array de elementos da malha.
+        Array de elementos da malha (não usado com uma Mesh).
+    type_element : str
+        Tipo de elemento ('tri' ou 'quad'; não usado com uma Mesh).
 
     Returns
     -------
     float
         Tamanho médio da malha (h).
     """
-    areas = []
-    if type_element == "tri":
-        for elem in elements:
-            node_coords = vertices[elem]
-            area=0.5 * abs(np.linalg.det(np.array([[1, node_coords[0][0], node_coords[0][1]],
-                                                  [1, node_coords[1][0], node_coords[1][1]],
-                                                  [1, node_coords[2][0], node_coords[2][1]]])))
-            areas.append(area)
-    elif type_element == "quad":
-        for elem in elements:
-            node_coords = vertices[elem]
-            area=0.5 * abs(np.linalg.det(np.array([[1, node_coords[0][0], node_coords[0][1]],
-                                                  [1, node_coords[1][0], node_coords[1][1]],
-                                                  [1, node_coords[2][0], node_coords[2][1]],
-                                                  [1, node_coords[3][0], node_coords[3][1]]])))
-        areas.append(area)
-
-    return np.mean(areas)
\ No newline at end of file
+    from mesh_topology import Mesh
+
+    if isinstance(vertices, Mesh):
+        return np.mean(vertices.element_areas)
+    return np.mean(element_areas(vertices, elements, type_element))
+
+def element_areas(vertices, elements, type_element):
+    """
+    Área do polígono formado pelos vértices de canto de cada elemento.
+
+    Returns:
+    - areas (ndarray): Área de cada elemento.
+    """
+    if type_element not in ['tri', 'quad']:
+        raise ValueError("Tipo de elemento inválido. Deve ser 'tri' ou 'quad'")
+
+    vertices = np.asarray(vertices, dtype=float)[:, :2]
+    elements = as_index_array(elements)
+
+    # Área do polígono formado pelos vértices de canto de cada elemento (fórmula do laço)
+    num_corners = 3 if type_element == "tri" else 4
+    if numba_enabled():
+        areas = polygon_areas_numba(vertices, elements, num_corners)
+    else:
+        corners = vertices[elements[:, :num_corners]]
+        x, y = corners[..., 0], corners[..., 1]
+        areas = 0.5 * np.abs(np.sum(x * np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1) * y, axis=1))
+
+    return areas
@@ -0,0 +1,263 @@
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
+
+# Versão do formato e da geração das malhas: altere sempre que a numeração dos nós ou dos elementos
+# mudar, para que malhas antigas não sejam reaproveitadas
+MESH_STORE_VERSION = '3'
+
+# Diretório e limite de tamanho lidos do ambiente, para que processos filhos herdem a configuração
+MESH_STORE_ENV = 'FEM_MESH_STORE'
+MESH_STORE_MAX_BYTES_ENV = 'FEM_MESH_STORE_MAX_BYTES'
+DEFAULT_MAX_BYTES = 4 * 2**30
+
+# Arquivo de cada malha: assinatura, tamanho do cabeçalho (uint64), cabeçalho JSON e os arrays
+# brutos, cada um alinhado em _ALIGNMENT bytes
+_MAGIC = b'FEMMESH\x00'
+_ALIGNMENT = 64
+_SUFFIX = '.mesh'
+
+def set_mesh_store(path, max_bytes=None):
+    """
+    Ativa (ou desativa, com path=None) o armazenamento em disco das malhas geradas.
+
+    Args:
+    - path (str): Diretório das malhas; None desativa o armazenamento.
+    - max_bytes (int): Tamanho máximo do diretório; as malhas usadas há mais tempo são removidas.
+    """
+    if path is None:
+        os.environ.pop(MESH_STORE_ENV, None)
+    else:
+        os.environ[MESH_STORE_ENV] = os.fspath(path)
+    if max_bytes is not None:
+        if max_bytes <= 0:
+            raise ValueError("O tamanho máximo do armazenamento deve ser positivo.")
+        os.environ[MESH_STORE_MAX_BYTES_ENV] = str(int(max_bytes))
+
+def get_mesh_store():
+    """
+    Retorna o diretório da versão atual do armazenamento, ou None se ele estiver desativado.
+    """
+    root = os.environ.get(MESH_STORE_ENV)
+    if not root:
+        return None
+    return os.path.join(root, f"v{MESH_STORE_VERSION}")
+
+def mesh_key(params):
+    """
+    Chave de uma malha: hash dos parâmetros de geração (gerador, dimensões, refinamento, tipo,
+    ordem, tipos dos arrays, ...).
+
+    Args:
+    - params (dict): Parâmetros de geração (valores serializáveis em JSON).
+
+    Returns:
+    - key (str): Hash hexadecimal de 32 caracteres.
+    """
+    text = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.blake2b(f"{MESH_STORE_VERSION}:{text}".encode(), digest_size=16).hexdigest()
+
+def cached_mesh(params, layout, fill, metadata=None):
+    """
+    Retorna a malha dos parâmetros dados, gerando-a apenas se ela não estiver armazenada.
+
+    Com o armazenamento ativo, os arrays são alocados diretamente no arquivo da malha (np.memmap) e
+    preenchidos por fill, de modo que malhas maiores que a memória podem ser geradas por blocos; as
+    leituras seguintes apenas mapeiam o arquivo. Sem armazenamento, os arrays ficam em memória.
+
+    Args:
+    - params (dict): Parâmetros de geração (ver mesh_key).
+    - layout (dict): Nome -> (dtype, formato) de cada array.
+    - fill (callable): Função fill(arrays) que escreve os arrays alocados.
+    - metadata (dict): Informações adicionais guardadas no cabeçalho.
+
+    Returns:
+    - arrays (dict): Nome -> array (np.memmap somente leitura quando armazenado).
+    - metadata (dict): Metadados da malha.
+    """
+    directory = get_mesh_store()
+    if directory is None:
+        arrays = {name: np.empty(shape, dtype) for name, (dtype, shape) in layout.items()}
+        fill(arrays)
+        return arrays, dict(metadata or {})
+
+    loaded = load_mesh(params, directory)
+    if loaded is not None:
+        return loaded
+
+    try:
+        return create_mesh(params, layout, fill, metadata, directory)
+    except OSError:
+        # Armazenamento indisponível (disco cheio, sem permissão): gera a malha em memória
+        arrays = {name: np.empty(shape, dtype) for name, (dtype, shape) in layout.items()}
+        fill(arrays)
+        return arrays, dict(metadata or {})
+
+def store_mesh(params, arrays, metadata=None, directory=None):
+    """
+    Grava arrays já calculados (por exemplo, a malha do gmsh) e os retorna mapeados do arquivo.
+
+    Args:
+    - params (dict): Parâmetros de geração (ver mesh_key).
+    - arrays (dict): Nome -> ndarray.
+    - metadata (dict): Informações adicionais guardadas no cabeçalho.
+    - directory (str): Diretório do armazenamento (padrão: o da versão atual).
+
+    Returns:
+    - arrays (dict), metadata (dict): Ver load_mesh.
+    """
+    arrays = {name: np.asarray(array) for name, array in arrays.items()}
+    layout = {name: (array.dtype, array.shape) for name, array in arrays.items()}
+
+    def fill(targets):
+        for name, array in arrays.items():
+            targets[name][...] = array
+
+    return create_mesh(params, layout, fill, metadata, directory)
+
+def create_mesh(params, layout, fill, metadata=None, directory=None):
+    """
+    Cria o arquivo de uma malha: aloca os arrays no arquivo, chama fill(arrays) e grava o cabeçalho.
+
+    O arquivo é escrito com outro nome e renomeado no final, então processos concorrentes podem
+    gerar a mesma malha sem corromper o armazenamento.
+
+    Returns:
+    - arrays (dict), metadata (dict): Ver load_mesh.
+    """
+    directory = get_mesh_store() if directory is None else directory
+    if directory is None:
+        raise ValueError("O armazenamento de malhas está desativado (ver set_mesh_store).")
+    os.makedirs(directory, exist_ok=True)
+
+    # Posição de cada array no arquivo, depois do cabeçalho
+    header = {'version': MESH_STORE_VERSION, 'params': params, 'metadata': metadata or {}, 'arrays': {}}
+    offset = 0
+    for name, (dtype, shape) in layout.items():
+        dtype = np.dtype(dtype)
+        shape = tuple(int(n) for n in shape)
+        header['arrays'][name] = {'dtype': dtype.str, 'shape': list(shape), 'offset': offset}
+        offset += _aligned(int(np.prod(shape)) * dtype.itemsize)
+    header_bytes = json.dumps(header, default=str).encode()
+    data_start = _aligned(len(_MAGIC) + 8 + len(header_bytes))
+
+    descriptor, temporary = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix=_SUFFIX)
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(_MAGIC)
+            file.write(np.uint64(len(header_bytes)).tobytes())
+            file.write(header_bytes)
+            file.truncate(data_start + offset)
+
+        # Preenchimento direto no arquivo
+        arrays = _map_arrays(temporary, header, data_start, mode='r+')
+        fill(arrays)
+        for array in arrays.values():
+            if isinstance(array, np.memmap):
+                array.flush()
+        del arrays
+
+        os.replace(temporary, _entry_path(directory, params))
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+    evict_mesh_store(directory)
+    loaded = load_mesh(params, directory)
+    if loaded is None:
+        raise OSError("A malha gravada não pôde ser lida.")
+    return loaded
+
+def load_mesh(params, directory=None):
+    """
+    Carrega uma malha armazenada, mapeando os arrays do arquivo com np.memmap (somente leitura).
+
+    Args:
+    - params (dict): Parâmetros de geração (ver mesh_key).
+    - directory (str): Diretório do armazenamento (padrão: o da versão atual).
+
+    Returns:
+    - arrays (dict): Nome -> np.memmap.
+    - metadata (dict): Metadados da malha.
+    Ou None, se a malha não estiver armazenada (ou o arquivo estiver incompleto).
+    """
+    directory = get_mesh_store() if directory is None else directory
+    if directory is None:
+        return None
+
+    path = _entry_path(directory, params)
+    try:
+        with open(path, 'rb') as file:
+            if file.read(len(_MAGIC)) != _MAGIC:
+                return None
+            header_size = int(np.frombuffer(file.read(8), dtype=np.uint64)[0])
+            header = json.loads(file.read(header_size))
+        if header.get('version') != MESH_STORE_VERSION:
+            return None
+        arrays = _map_arrays(path, header, _aligned(len(_MAGIC) + 8 + header_size), mode='r')
+        os.utime(path)
+    except (OSError, ValueError, IndexError):
+        return None
+
+    return arrays, header['metadata']
+
+def _map_arrays(path, header, data_start, mode):
+    """
+    Mapeia cada array descrito no cabeçalho (arrays vazios não podem ser mapeados e são criados em memória).
+    """
+    arrays = {}
+    for name, entry in header['arrays'].items():
+        dtype, shape = np.dtype(entry['dtype']), tuple(entry['shape'])
+        if int(np.prod(shape)) == 0:
+            arrays[name] = np.empty(shape, dtype)
+        else:
+            arrays[name] = np.memmap(path, dtype=dtype, mode=mode, offset=data_start + entry['offset'], shape=shape)
+    return arrays
+
+def _aligned(nbytes):
+    return -(-nbytes // _ALIGNMENT) * _ALIGNMENT
+
+def _entry_path(directory, params):
+    return os.path.join(directory, mesh_key(params) + _SUFFIX)
+
+def evict_mesh_store(directory=None, max_bytes=None):
+    """
+    Remove as malhas usadas há mais tempo até o armazenamento caber em max_bytes.
+
+    Args:
+    - directory (str): Diretório do armazenamento (padrão: o da versão atual).
+    - max_bytes (int): Limite em bytes (padrão: FEM_MESH_STORE_MAX_BYTES ou 4 GiB).
+    """
+    directory = get_mesh_store() if directory is None else directory
+    if directory is None or not os.path.isdir(directory):
+        return
+    if max_bytes is None:
+        max_bytes = int(os.environ.get(MESH_STORE_MAX_BYTES_ENV, DEFAULT_MAX_BYTES))
+
+    entries = []
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if name.startswith('.tmp-') or not name.endswith(_SUFFIX):
+            continue
+        try:
+            entries.append((os.path.getmtime(path), os.path.getsize(path), path))
+        except OSError:
+            continue
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+def clear_mesh_store(directory=None):
+    """
+    Remove todas as malhas da versão atual do armazenamento.
+    """
+    evict_mesh_store(directory, max_bytes=0)
@@ -0,0 +1,334 @@
+import numpy as np
+from hierarchical_basis import EDGES
+from lagrange_basis import basis_degree
+from memory_mode import as_index_array
+from mesh_size import element_areas
+
+def mesh_edges(elements, type_element):
+    """
+    Arestas da malha, sem repetição, a partir dos vértices de cada elemento.
+
+    Args:
+    - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento); as primeiras
+      colunas são os vértices (numeração local de lagrange_basis.reference_nodes).
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+
+    Returns:
+    - edges (ndarray): Vértices de cada aresta, do menor índice para o maior, formato (n_arestas, 2).
+    - element_edges (ndarray): Aresta global de cada aresta local (EDGES), formato (n_elementos, n_arestas_elemento).
+    """
+    elements = as_index_array(elements)
+    pairs = elements[:, np.array(EDGES[type_element])].astype(np.int64)
+    low, high = pairs.min(axis=2), pairs.max(axis=2)
+
+    # Chave única de cada par (menor, maior)
+    num_nodes = int(elements.max()) + 1 if elements.size else 0
+    keys, element_edges = np.unique((low * num_nodes + high).ravel(), return_inverse=True)
+    edges = np.stack([keys // num_nodes, keys % num_nodes], axis=1).astype(elements.dtype)
+    return edges, element_edges.reshape(low.shape).astype(elements.dtype)
+
+def local_edge_nodes(type_element, degree):
+    """
+    Nós locais de cada aresta do elemento: as duas extremidades e depois os nós internos no sentido
+    da aresta (numeração de lagrange_basis.reference_nodes).
+
+    Returns:
+    - nodes (ndarray): Formato (n_arestas_elemento, degree + 1).
+    """
+    num_vertices = len(EDGES[type_element])
+    return np.array([[a, b] + [num_vertices + edge * (degree - 1) + m for m in range(degree - 1)]
+                     for edge, (a, b) in enumerate(EDGES[type_element])])
+
+class Mesh:
+    """
+    Malha com arrays contíguos e topologia derivada calculada sob demanda.
+
+    Cada estrutura (arestas, vizinhos, contorno, adjacência nó-elemento, valência, áreas) é
+    construída com ordenação/np.unique na primeira vez que é acessada e guardada, de modo que todas
+    as etapas seguintes (apply_dirichlet, mesh_size, plot_mesh) compartilhem a mesma construção O(n log n). A malha não deve ser alterada depois de
+    criada. Para compatibilidade com o código que usa tuplas, nodes, elements = mesh funciona.
+
+    O contorno é topológico: as arestas que pertencem a um único elemento, com seus nós de ordem
+    alta. Os lados podem receber tags (por exemplo, os grupos físicos do gmsh ou BOUNDARY_TAGS da
+    malha estruturada; ver set_boundary_tags), e os nós de cada conjunto de tags são calculados uma
+    única vez (ver boundary_nodes).
+
+    Args:
+    - nodes (ndarray): Coordenadas dos nós, formato (n_nos, 2).
+    - elements (ndarray): Conectividade com índices a partir de zero, formato (n_elementos, n_nos_elemento).
+    - element_type (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    """
+
+    __slots__ = ('nodes', 'elements', 'element_type', 'order', '_edges', '_element_edges', '_edge_elements',
+                 '_neighbors', '_boundary', '_node_elements', '_valence', '_facet_tags', '_boundary_node_sets',
+                 '_edge_nodes', '_areas')
+
+    def __init__(self, nodes, elements, element_type):
+        if element_type not in ['tri', 'quad']:
+            raise ValueError("Tipo de elemento inválido. Deve ser 'tri' ou 'quad'")
+        nodes = np.asarray(nodes)
+        self.nodes = np.ascontiguousarray(nodes[:, :2])
+        self.elements = np.ascontiguousarray(as_index_array(elements))
+        self.element_type = element_type
+        self.order = basis_degree(element_type, self.elements.shape[1])
+        self._edges = self._element_edges = self._edge_elements = self._neighbors = None
+        self._boundary = self._node_elements = self._valence = self._facet_tags = None
+        self._boundary_node_sets = {}
+        self._edge_nodes = self._areas = None
+
+    @classmethod
+    def generate(cls, size, refinement_level, element_type, order, **kwargs):
+        """
+        Gera a malha do quadrado com mesh.generate_mesh (kwargs: mesher, pattern).
+        """
+        from mesh import generate_mesh
+        nodes, elements = generate_mesh(size, refinement_level, element_type, order, **kwargs)
+        return cls(nodes, elements, element_type)
+
+    def __iter__(self):
+        return iter((self.nodes, self.elements))
+
+    def __repr__(self):
+        return (f"Mesh({self.element_type!r}, ordem {self.order}, {self.num_nodes} nós, "
+                f"{self.num_elements} elementos)")
+
+    @classmethod
+    def from_arrays(cls, nodes, elements=None, element_type=None):
+        """
+        Retorna nodes se já for uma Mesh; senão, cria a malha, deduzindo o tipo de elemento do
+        número de nós por elemento quando element_type é None.
+
+        Raises:
+        - ValueError: Se o tipo não puder ser deduzido (por exemplo, 36 nós: P7 ou Q5).
+        """
+        if isinstance(nodes, cls):
+            return nodes
+        if element_type is None:
+            num_element_nodes = np.shape(elements)[1]
+            candidates = []
+            for candidate in ('tri', 'quad'):
+                try:
+                    basis_degree(candidate, num_element_nodes)
+                    candidates.append(candidate)
+                except ValueError:
+                    pass
+            if len(candidates) != 1:
+                raise ValueError(f"Não é possível deduzir o tipo de elemento com {num_element_nodes} nós; informe element_type.")
+            element_type = candidates[0]
+        return cls(nodes, elements, element_type)
+
+    @property
+    def num_nodes(self):
+        return len(self.nodes)
+
+    @property
+    def num_elements(self):
+        return len(self.elements)
+
+    @property
+    def edges(self):
+        """
+        Vértices de cada aresta, do menor índice para o maior, formato (n_arestas, 2).
+        """
+        if self._edges is None:
+            self._edges, self._element_edges = mesh_edges(self.elements, self.element_type)
+        return self._edges
+
+    @property
+    def element_edges(self):
+        """
+        Aresta global de cada aresta local (EDGES), formato (n_elementos, n_arestas_elemento).
+        """
+        if self._element_edges is None:
+            self._edges, self._element_edges = mesh_edges(self.elements, self.element_type)
+        return self._element_edges
+
+    @property
+    def edge_elements(self):
+        """
+        Os dois elementos de cada aresta, formato (n_arestas, 2); -1 no segundo para arestas do contorno.
+        """
+        if self._edge_elements is None:
+            element_edges = self.element_edges
+            num_edges, num_local = len(self.edges), element_edges.shape[1]
+
+            # Ocorrências de cada aresta ordenadas por aresta: a primeira e, se houver, a segunda
+            flat = element_edges.ravel()
+            order = np.argsort(flat, kind='stable')
+            counts = np.bincount(flat, minlength=num_edges)
+            if np.any(counts > 2):
+                raise ValueError("Malha não conforme: há arestas compartilhadas por mais de dois elementos.")
+            first = np.zeros(num_edges + 1, dtype=np.int64)
+            np.cumsum(counts, out=first[1:])
+
+            edge_elements = np.full((num_edges, 2), -1, dtype=self.elements.dtype)
+            edge_elements[:, 0] = order[first[:-1]] // num_local
+            shared = counts == 2
+            edge_elements[shared, 1] = order[first[:-1][shared] + 1] // num_local
+            self._edge_elements = edge_elements
+        return self._edge_elements
+
+    @property
+    def edge_nodes(self):
+        """
+        Nós de cada aresta em sequência ao longo dela (extremidade, nós internos, outra extremidade),
+        no sentido do primeiro elemento da aresta, formato (n_arestas, order + 1).
+        """
+        if self._edge_nodes is None:
+            edges = np.arange(len(self.edges))
+            elements = self.edge_elements[:, 0]
+            local_edges = np.argmax(self.element_edges[elements] == edges[:, None], axis=1)
+            local_nodes = local_edge_nodes(self.element_type, self.order)
+            path = [0] + list(range(2, self.order + 1)) + [1]
+            self._edge_nodes = np.ascontiguousarray(self.elements[elements[:, None], local_nodes[local_edges][:, path]])
+        return self._edge_nodes
+
+    @property
+    def element_areas(self):
+        """
+        Área do polígono dos vértices de canto de cada elemento (ver mesh_size.element_areas).
+        """
+        if self._areas is None:
+            self._areas = element_areas(self.nodes, self.elements, self.element_type)
+        return self._areas
+
+    @property
+    def neighbors(self):
+        """
+        Elemento vizinho através de cada aresta local, formato (n_elementos, n_arestas_elemento); -1 no contorno.
+        """
+        if self._neighbors is None:
+            pairs = self.edge_elements[self.element_edges]
+            own = np.arange(self.num_elements)[:, None]
+            self._neighbors = np.where(pairs[..., 0] == own, pairs[..., 1], pairs[..., 0])
+        return self._neighbors
+
+    def _build_boundary(self):
+        """
+        Arestas que pertencem a um único elemento, com o elemento, a aresta local e os nós.
+        """
+        boundary_edges = np.flatnonzero(self.edge_elements[:, 1] < 0)
+        elements = self.edge_elements[boundary_edges, 0]
+        local_edges = np.argmax(self.element_edges[elements] == boundary_edges[:, None], axis=1)
+        local_nodes = local_edge_nodes(self.element_type, self.order)
+        facets = self.elements[elements[:, None], local_nodes[local_edges]]
+        self._boundary = (boundary_edges, elements, local_edges, np.ascontiguousarray(facets))
+
+    @property
+    def boundary_edges(self):
+        """
+        Índices (em edges) das arestas do contorno.
+        """
+        if self._boundary is None:
+            self._build_boundary()
+        return self._boundary[0]
+
+    @property
+    def boundary_facets(self):
+        """
+        Nós de cada aresta do contorno (extremidades e depois os nós internos, no sentido do elemento,
+        anti-horário se os elementos forem anti-horários), formato (n_arestas_contorno, order + 1).
+        """
+        if self._boundary is None:
+            self._build_boundary()
+        return self._boundary[3]
+
+    @property
+    def boundary_facet_elements(self):
+        """
+        Elemento e aresta local de cada aresta do contorno.
+        """
+        if self._boundary is None:
+            self._build_boundary()
+        return self._boundary[1], self._boundary[2]
+
+    @property
+    def boundary_tags(self):
+        """
+        Tag de cada aresta do contorno (na ordem de boundary_facets); 0 nas arestas sem tag.
+        """
+        if self._facet_tags is None:
+            self._facet_tags = np.zeros(len(self.boundary_edges), dtype=np.int32)
+        return self._facet_tags
+
+    def set_boundary_tags(self, facets, tags):
+        """
+        Associa tags às arestas do contorno.
+
+        Args:
+        - facets (ndarray): Nós das arestas marcadas, formato (n_arestas, >= 2), com as duas
+          extremidades nas primeiras colunas (como os boundary_facets de structured_mesh ou do gmsh).
+        - tags (ndarray): Tag de cada aresta (inteiro positivo).
+
+        Raises:
+        - ValueError: Se alguma aresta não estiver no contorno da malha.
+        """
+        facets = np.asarray(facets, dtype=np.int64).reshape(len(facets), -1)
+        tags = np.asarray(tags, dtype=np.int32)
+        if len(tags) != len(facets) or np.any(tags <= 0):
+            raise ValueError("Deve haver uma tag positiva para cada aresta do contorno.")
+
+        # As arestas do contorno estão em ordem crescente de chave (menor, maior), como em edges
+        edges = self.edges[self.boundary_edges].astype(np.int64)
+        keys = edges[:, 0] * self.num_nodes + edges[:, 1]
+        low, high = np.minimum(facets[:, 0], facets[:, 1]), np.maximum(facets[:, 0], facets[:, 1])
+        facet_keys = low * self.num_nodes + high
+        position = np.minimum(np.searchsorted(keys, facet_keys), max(len(keys) - 1, 0))
+        if len(keys) == 0 or np.any(keys[position] != facet_keys):
+            raise ValueError("Há arestas marcadas que não pertencem ao contorno da malha.")
+
+        facet_tags = self.boundary_tags.copy()
+        facet_tags[position] = tags
+        self._facet_tags = facet_tags
+        self._boundary_node_sets = {}
+
+    def boundary_nodes(self, tags=None):
+        """
+        Nós (vértices e nós de ordem alta) das arestas do contorno com as tags dadas.
+
+        Os conjuntos são calculados uma vez por combinação de tags e reaproveitados.
+
+        Args:
+        - tags (int ou iterável): Tags dos lados; None inclui todo o contorno.
+
+        Returns:
+        - nodes (ndarray): Índices ordenados dos nós (somente leitura).
+        """
+        key = None if tags is None else tuple(sorted({int(tag) for tag in np.atleast_1d(tags)}))
+        if key not in self._boundary_node_sets:
+            facets = self.boundary_facets
+            if key is not None:
+                missing = set(key) - set(np.unique(self.boundary_tags).tolist())
+                if missing:
+                    raise ValueError(f"Tags de contorno inexistentes na malha: {sorted(missing)}.")
+                facets = facets[np.isin(self.boundary_tags, key)]
+            nodes = np.unique(facets)
+            nodes.setflags(write=False)
+            self._boundary_node_sets[key] = nodes
+        return self._boundary_node_sets[key]
+
+    @property
+    def node_elements(self):
+        """
+        Adjacência nó -> elementos no formato CSR: os elementos do nó i são indices[indptr[i]:indptr[i + 1]].
+
+        Returns:
+        - indptr (ndarray), indices (ndarray)
+        """
+        if self._node_elements is None:
+            flat = self.elements.ravel()
+            order = np.argsort(flat, kind='stable')
+            indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+            np.cumsum(np.bincount(flat, minlength=self.num_nodes), out=indptr[1:])
+            indices = (order // self.elements.shape[1]).astype(self.elements.dtype)
+            self._node_elements = (indptr, indices)
+        return self._node_elements
+
+    @property
+    def valence(self):
+        """
+        Número de arestas que chegam a cada nó (zero nos nós que não são vértices).
+        """
+        if self._valence is None:
+            self._valence = np.bincount(self.edges.ravel(), minlength=self.num_nodes)
+        return self._valence
@@ -0,0 +1,263 @@
+import importlib.util
+import warnings
+import numpy as np
+
+# Numba é opcional: sem ele, todas as rotinas usam a implementação NumPy. Apenas sua presença é
+# verificada aqui; o módulo (de carga lenta) só é importado quando os núcleos são compilados
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+
+# Backend global: 'numpy' (padrão) ou 'numba'
+_backend = {'name': 'numpy'}
+
+# Núcleos compilados, criados na primeira utilização
+_kernels = {}
+
+def set_backend(name):
+    """
+    Seleciona o backend dos núcleos por elemento (montagem, integração dos erros, tamanho da malha).
+
+    Com 'numba', os laços sobre elementos e pontos de Gauss são compilados (nopython, parallel=True)
+    e fundidos, sem os arrays intermediários da versão NumPy. Se o Numba não estiver instalado, um
+    aviso é emitido e a implementação NumPy continua sendo usada.
+
+    Os resultados coincidem com os do backend NumPy até o arredondamento, e não bit a bit: o núcleo
+    soma ponto a ponto e cor a cor, enquanto o NumPy usa tensores de referência nos elementos afins
+    e soma na ordem dos elementos. As diferenças ficam abaixo de 1e-12 relativo ao maior |K_ij| e
+    |F_i| (cerca de 1e-13 em P3).
+
+    Args:
+    - name (str): 'numpy' ou 'numba'.
+    """
+    if name not in ['numpy', 'numba']:
+        raise ValueError("Backend inválido. Deve ser 'numpy' ou 'numba'")
+    if name == 'numba' and not NUMBA_AVAILABLE:
+        warnings.warn("Numba não está instalado; usando o backend NumPy.")
+        name = 'numpy'
+    _backend['name'] = name
+
+def get_backend():
+    """
+    Retorna o backend atual ('numpy' ou 'numba').
+    """
+    return _backend['name']
+
+def numba_enabled():
+    """
+    Indica se os núcleos compilados com Numba devem ser usados.
+    """
+    return _backend['name'] == 'numba' and NUMBA_AVAILABLE
+
+def _get_kernels():
+    """
+    Compila (uma única vez) os núcleos Numba.
+    """
+    if _kernels:
+        return _kernels
+
+    import numba
+    njit = numba.njit
+    prange = numba.prange
+
+    @njit(cache=True)
+    def color_elements(elements, num_nodes):
+        # Coloração gulosa: elementos da mesma cor não compartilham nós. As cores de cada nó são um
+        # conjunto de bits em palavras de 64 bits, e o número de palavras dobra quando todas as
+        # cores disponíveis estão em uso (malhas com nós de valência alta)
+        num_elements, num_element_nodes = elements.shape
+        num_words = 1
+        node_colors = np.zeros((num_nodes, num_words), dtype=np.uint64)
+        used = np.zeros(num_words, dtype=np.uint64)
+        colors = np.empty(num_elements, dtype=np.int64)
+        one = np.uint64(1)
+        for e in range(num_elements):
+            used[:] = 0
+            for a in range(num_element_nodes):
+                used |= node_colors[elements[e, a]]
+            color = 0
+            while color < 64 * num_words and (used[color // 64] >> np.uint64(color % 64)) & one:
+                color += 1
+            if color == 64 * num_words:
+                grown = np.zeros((num_nodes, 2 * num_words), dtype=np.uint64)
+                grown[:, :num_words] = node_colors
+                node_colors = grown
+                num_words *= 2
+                used = np.zeros(num_words, dtype=np.uint64)
+            colors[e] = color
+            for a in range(num_element_nodes):
+                node_colors[elements[e, a], color // 64] |= one << np.uint64(color % 64)
+        return colors
+
+    @njit(inline='always', error_model='numpy')
+    def jacobian_inverse(node_coords, dN, e, q):
+        # J[i, j] = sum_a x_a[i] * dN_a/dxi_j e sua inversa pela fórmula fechada (detJ = 0 é
+        # verificado por quem chama, pois exceções impedem a paralelização do laço)
+        J00 = 0.0
+        J01 = 0.0
+        J10 = 0.0
+        J11 = 0.0
+        for a in range(dN.shape[1]):
+            J00 += node_coords[e, a, 0] * dN[q, a, 0]
+            J01 += node_coords[e, a, 0] * dN[q, a, 1]
+            J10 += node_coords[e, a, 1] * dN[q, a, 0]
+            J11 += node_coords[e, a, 1] * dN[q, a, 1]
+        detJ = J00 * J11 - J01 * J10
+        return detJ, J11 / detJ, -J01 / detJ, -J10 / detJ, J00 / detJ
+
+    @njit(parallel=True, cache=True, error_model='numpy')
+    def assemble(node_coords, elements, dN, N, weights, k_values, f_values, scatter_map, order_by_color,
+                 color_offsets, data, F, singular):
+        # Montagem fundida: matrizes locais somadas diretamente em K.data e F, cor a cor
+        num_element_nodes = dN.shape[1]
+        num_points = dN.shape[0]
+        for c in range(len(color_offsets) - 1):
+            for k in prange(color_offsets[c], color_offsets[c + 1]):
+                e = order_by_color[k]
+                grad = np.empty((num_element_nodes, 2))
+                base = e * num_element_nodes * num_element_nodes
+                for q in range(num_points):
+                    detJ, i00, i01, i10, i11 = jacobian_inverse(node_coords, dN, e, q)
+                    if detJ == 0.0:
+                        singular[e] = True
+                    dx = abs(detJ) * weights[q]
+                    k_dx = k_values[e, q] * dx
+                    f_dx = f_values[e, q] * dx
+                    # Gradientes físicos invJ.T @ dN
+                    for a in range(num_element_nodes):
+                        grad[a, 0] = i00 * dN[q, a, 0] + i10 * dN[q, a, 1]
+                        grad[a, 1] = i01 * dN[q, a, 0] + i11 * dN[q, a, 1]
+                    for a in range(num_element_nodes):
+                        F[elements[e, a]] += f_dx * N[q, a]
+                        for b in range(num_element_nodes):
+                            data[scatter_map[base + a * num_element_nodes + b]] += \
+                                k_dx * (grad[a, 0] * grad[b, 0] + grad[a, 1] * grad[b, 1])
+
+    @njit(parallel=True, cache=True, error_model='numpy')
+    def element_errors(node_coords, u_local, dN, N, weights, u_exact, grad_exact, singular):
+        # Quadrados dos erros L2 e de energia de cada elemento
+        num_elements, num_element_nodes = u_local.shape
+        l2_sq = np.zeros(num_elements)
+        energy_sq = np.zeros(num_elements)
+        for e in prange(num_elements):
+            for q in range(dN.shape[0]):
+                detJ, i00, i01, i10, i11 = jacobian_inverse(node_coords, dN, e, q)
+                if detJ == 0.0:
+                    singular[e] = True
+                dx = abs(detJ) * weights[q]
+                u_h = 0.0
+                du_xi = 0.0
+                du_eta = 0.0
+                for a in range(num_element_nodes):
+                    u_h += u_local[e, a] * N[q, a]
+                    du_xi += u_local[e, a] * dN[q, a, 0]
+                    du_eta += u_local[e, a] * dN[q, a, 1]
+                du_x = i00 * du_xi + i10 * du_eta
+                du_y = i01 * du_xi + i11 * du_eta
+                l2_sq[e] += (u_exact[e, q] - u_h) ** 2 * dx
+                energy_sq[e] += ((grad_exact[e, q, 0] - du_x) ** 2 + (grad_exact[e, q, 1] - du_y) ** 2) * dx
+        return l2_sq, energy_sq
+
+    @njit(parallel=True, cache=True)
+    def polygon_areas(vertices, elements, num_corners):
+        # Fórmula do laço (shoelace) nos vértices de canto de cada elemento
+        num_elements = elements.shape[0]
+        areas = np.empty(num_elements)
+        for e in prange(num_elements):
+            twice_area = 0.0
+            for a in range(num_corners):
+                b = (a + 1) % num_corners
+                twice_area += (vertices[elements[e, a], 0] * vertices[elements[e, b], 1]
+                               - vertices[elements[e, b], 0] * vertices[elements[e, a], 1])
+            areas[e] = 0.5 * abs(twice_area)
+        return areas
+
+    _kernels.update(color_elements=color_elements, assemble=assemble, element_errors=element_errors,
+                    polygon_areas=polygon_areas)
+    return _kernels
+
+def check_singular(singular):
+    """
+    Levanta o mesmo erro de inverse_2x2 se algum elemento teve determinante do Jacobiano zero.
+    """
+    if np.any(singular):
+        raise ValueError("Verificando se o determinante do Jacobiano é zero (configuração singular).")
+
+def element_coloring(elements, num_nodes):
+    """
+    Agrupa os elementos em cores sem nós compartilhados, para que os elementos de uma mesma cor
+    possam ser somados em paralelo sem condições de corrida.
+
+    Args:
+    - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento).
+    - num_nodes (int): Número total de nós da malha.
+
+    Returns:
+    - order_by_color (ndarray): Índices dos elementos ordenados por cor (ordem original dentro de cada cor).
+    - color_offsets (ndarray): Início de cada cor em order_by_color, tamanho n_cores + 1.
+    """
+    colors = _get_kernels()['color_elements'](np.ascontiguousarray(elements), num_nodes)
+    order_by_color = np.argsort(colors, kind='stable')
+    color_offsets = np.zeros(colors.max() + 2 if colors.size else 1, dtype=np.int64)
+    np.cumsum(np.bincount(colors), out=color_offsets[1:])
+    return order_by_color, color_offsets
+
+def assemble_numba(node_coords, elements, dN, N, weights, k_values, f_values, pattern, num_nodes):
+    """
+    Monta K e F com o núcleo Numba fundido (geometria, matrizes locais e soma global no mesmo laço).
+    O resultado coincide com o do backend NumPy até o arredondamento (ver set_backend).
+
+    Args:
+    - node_coords (ndarray): Coordenadas dos nós de cada elemento, formato (n_elementos, n_nos_elemento, 2).
+    - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento).
+    - dN, N (ndarray): Tabelas do elemento de referência (ver reference_tables).
+    - weights (ndarray): Pesos de Gauss, tamanho n_pontos.
+    - k_values, f_values (ndarray): Coeficiente de difusão e fonte nos pontos de Gauss, formato (n_elementos, n_pontos).
+    - pattern (tuple): Padrão (indptr, indices, scatter_map) retornado por get_sparsity_pattern.
+    - num_nodes (int): Número total de nós da malha.
+
+    Returns:
+    - data (ndarray): Valores de K na ordem do padrão CSR.
+    - F (ndarray): O vetor de força global.
+    """
+    _, indices, scatter_map = pattern
+    order_by_color, color_offsets = element_coloring(elements, num_nodes)
+    data = np.zeros(indices.size)
+    F = np.zeros(num_nodes)
+    singular = np.zeros(len(elements), dtype=np.bool_)
+    _get_kernels()['assemble'](np.ascontiguousarray(node_coords), np.ascontiguousarray(elements), np.ascontiguousarray(dN),
+                               np.ascontiguousarray(N), weights, np.ascontiguousarray(k_values),
+                               np.ascontiguousarray(f_values), scatter_map, order_by_color, color_offsets, data, F,
+                               singular)
+    check_singular(singular)
+    return data, F
+
+def element_errors_numba(node_coords, u_local, dN, N, weights, u_exact, grad_exact):
+    """
+    Quadrados dos erros L2 e de energia de cada elemento com o núcleo Numba.
+
+    Args:
+    - node_coords (ndarray): Coordenadas dos nós de cada elemento, formato (n_elementos, n_nos_elemento, 2).
+    - u_local (ndarray): Solução numérica nos nós de cada elemento, formato (n_elementos, n_nos_elemento).
+    - dN, N (ndarray): Tabelas do elemento de referência (ver reference_tables).
+    - weights (ndarray): Pesos de Gauss, tamanho n_pontos.
+    - u_exact (ndarray): Solução exata nos pontos de Gauss, formato (n_elementos, n_pontos).
+    - grad_exact (ndarray): Gradiente exato nos pontos de Gauss, formato (n_elementos, n_pontos, 2).
+
+    Returns:
+    - l2_sq (ndarray): Quadrado do erro L2 em cada elemento.
+    - energy_sq (ndarray): Quadrado do erro de energia em cada elemento.
+    """
+    singular = np.zeros(len(u_local), dtype=np.bool_)
+    l2_sq, energy_sq = _get_kernels()['element_errors'](np.ascontiguousarray(node_coords),
+                                                        np.ascontiguousarray(u_local, dtype=float),
+                                                        np.ascontiguousarray(dN), np.ascontiguousarray(N), weights,
+                                                        np.ascontiguousarray(u_exact), np.ascontiguousarray(grad_exact),
+                                                        singular)
+    check_singular(singular)
+    return l2_sq, energy_sq
+
+def polygon_areas_numba(vertices, elements, num_corners):
+    """
+    Áreas dos elementos (polígono dos num_corners primeiros nós) com o núcleo Numba.
+    """
+    return _get_kernels()['polygon_areas'](np.ascontiguousarray(vertices, dtype=float), np.ascontiguousarray(elements),
+                                           num_corners)
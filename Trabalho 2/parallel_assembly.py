@@ -0,0 +1,285 @@
+import atexit
+import multiprocessing
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, wait
+from scipy.sparse import csr_matrix
+from multiprocessing import shared_memory
+from assemble_system_vectorized import compute_local_systems
+from calculate_errors_vectorized import compute_element_errors
+from memory_mode import as_index_array
+from quadrature_selection import quadrature_degrees
+from sparsity_pattern import get_sparsity_pattern
+
+# Elementos por bloco da montagem paralela. O tamanho não depende do número de processos: as
+# somas de cada bloco e a soma dos blocos (na ordem dos blocos) são sempre as mesmas, e K e F
+# saem idênticos bit a bit para qualquer número de processos
+ASSEMBLY_BLOCK_SIZE = 2048
+
+# Os processos do pool são criados por um servidor 'forkserver' (quando disponível) e não por fork do
+# processo principal: depois de o backend 'numba' rodar, o processo principal tem threads do laço
+# paralelo, e um fork com essas threads ativas trava os processos filhos. Como no Windows, o script
+# que chama a montagem paralela precisa do guarda if __name__ == '__main__'
+_MP_CONTEXT = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else None
+
+# Pool de processos reaproveitado entre as chamadas (recriado apenas se o número de processos mudar)
+_pool = {'executor': None, 'num_workers': 0, 'registered': False}
+
+def assemble_system_parallel(vertices, elements, order, type_element, num_workers=None, source_function=None, coefficient=1.0,
+                             basis='lagrange', quadrature_degree=None):
+    """
+    Monta o sistema FEM dividindo os elementos em blocos contíguos processados em paralelo.
+
+    As coordenadas, a conectividade e o mapa de espalhamento do padrão de esparsidade são
+    compartilhados com os processos via memória compartilhada. Os blocos têm ASSEMBLY_BLOCK_SIZE
+    elementos, qualquer que seja o número de processos. Cada bloco soma as suas matrizes locais
+    nas posições de K.data (e nos nós de F) que ele alcança e devolve apenas essas posições e somas,
+    de modo que as matrizes locais densas da malha inteira nunca existem no processo principal.
+    O processo principal acumula os blocos na ordem dos elementos, portanto K e F são idênticos bit
+    a bit para qualquer número de processos (e diferem do modo 'vectorized' apenas por
+    arredondamento, pela ordem das somas).
+
+    Args:
+    - vertices (ndarray): Coordenadas dos nós da malha, formato (n_nos, 2).
+    - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento).
+    - order (int): A ordem polinomial para as funções de forma.
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - num_workers (int): Número de processos. Se None, usa o número de CPUs.
+    - source_function (callable): Função de fonte f(x, y), definida no nível de módulo. Se None, usa a fonte padrão.
+    - coefficient (float ou callable): Coeficiente de difusão k ou função k(x, y) definida no nível de módulo.
+    - basis (str): 'lagrange' ou 'hierarchical' (ver hierarchical_basis).
+    - quadrature_degree (int ou dict): Grau da quadratura (None: escolha por integrando; ver quadrature_selection).
+
+    Returns:
+    - K (scipy.sparse.csr_matrix): A matriz de rigidez global.
+    - F (numpy.ndarray): O vetor de força global.
+    """
+    if vertices is None or elements is None:
+        raise ValueError("Matriz K, vetor F, ou vértices não podem ser vazios")
+    if type_element not in ['tri', 'quad']:
+        raise ValueError("Tipo de elemento inválido. Deve ser 'tri' ou 'quad'")
+
+    vertices = np.ascontiguousarray(np.asarray(vertices, dtype=float)[:, :2])
+    elements = np.ascontiguousarray(as_index_array(elements))
+    num_nodes = len(vertices)
+
+    # Graus da quadratura escolhidos para a malha inteira, para que todos os blocos usem as mesmas regras
+    degrees = quadrature_degrees(vertices, elements, type_element, ('stiffness', 'load'), quadrature_degree=quadrature_degree)
+
+    # Padrão de esparsidade da malha inteira; os blocos somam em trechos do seu K.data
+    indptr, indices, scatter_map = get_sparsity_pattern(elements, num_nodes)
+    blocks = fixed_blocks(len(elements), ASSEMBLY_BLOCK_SIZE)
+    results = iter_blocks(_assemble_block, [vertices, elements, scatter_map], len(elements), num_workers,
+                          order, type_element, source_function, coefficient, basis, degrees, blocks=blocks)
+
+    # Soma dos blocos na ordem dos elementos (cada bloco é descartado depois de somado)
+    data = np.zeros(len(indices))
+    F_global = np.zeros(num_nodes)
+    for (positions, data_block), (nodes, F_block) in results:
+        data[positions] += data_block
+        F_global[nodes] += F_block
+    K_global = csr_matrix((data, indices, indptr), shape=(num_nodes, num_nodes))
+
+    return K_global, F_global
+
+def calculate_errors_parallel(vertices, elements, u_numeric, order, element_type, num_workers=None, basis='lagrange',
+                              quadrature_degree=None):
+    """
+    Calcula os erros L2 e de energia dividindo os elementos em blocos contíguos processados
+    em paralelo. As contribuições por elemento são somadas na ordem dos elementos, portanto o
+    resultado é idêntico para qualquer número de processos.
+
+    Args:
+    - vertices (ndarray): Coordenadas dos nós da malha, formato (n_nos, 2).
+    - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento).
+    - u_numeric (ndarray): Solução numérica nos nós.
+    - order (int): Ordem dos polinômios de Lagrange usados no cálculo.
+    - element_type (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - num_workers (int): Número de processos. Se None, usa o número de CPUs.
+    - basis (str): 'lagrange' ou 'hierarchical' (u_numeric são então coeficientes modais).
+    - quadrature_degree (int ou dict): Grau da quadratura dos erros (None: 2p + 2; ver quadrature_selection).
+
+    Returns:
+    - l2_error (float): Erro L2 entre as soluções numérica e exata.
+    - energy_error (float): Erro de energia entre as soluções numérica e exata.
+    """
+    vertices = np.ascontiguousarray(np.asarray(vertices, dtype=float)[:, :2])
+    elements = np.ascontiguousarray(as_index_array(elements))
+    u_numeric = np.ascontiguousarray(u_numeric, dtype=float)
+    degrees = quadrature_degrees(vertices, elements, element_type, ('error',), quadrature_degree=quadrature_degree)
+
+    results = run_blocks(_errors_block, [vertices, elements, u_numeric], len(elements), num_workers,
+                         order, element_type, basis, degrees)
+    l2_sq = np.concatenate([l2_block for l2_block, _ in results])
+    energy_sq = np.concatenate([energy_block for _, energy_block in results])
+
+    return np.sqrt(np.sum(l2_sq)), np.sqrt(np.sum(energy_sq))
+
+def run_blocks(block_function, arrays, num_elements, num_workers, *args, blocks=None):
+    """
+    Executa block_function em blocos contíguos de elementos, compartilhando os arrays da malha
+    com os processos via multiprocessing.shared_memory.
+
+    Args:
+    - block_function (callable): Função de nível de módulo chamada como block_function(descritores, início, fim, *args).
+    - arrays (list of ndarray): Arrays compartilhados com os processos.
+    - num_elements (int): Número total de elementos.
+    - num_workers (int): Número de processos. Se None, usa o número de CPUs.
+    - blocks (list of tuples): Intervalos (início, fim); se None, um bloco por processo (partition_elements).
+
+    Returns:
+    - results (list): Resultados de cada bloco, na ordem dos elementos.
+    """
+    return list(iter_blocks(block_function, arrays, num_elements, num_workers, *args, blocks=blocks))
+
+def iter_blocks(block_function, arrays, num_elements, num_workers, *args, blocks=None):
+    """
+    Como run_blocks, mas produz os resultados um a um, na ordem dos elementos, sem manter os já
+    entregues.
+    """
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    if not isinstance(num_workers, int) or num_workers < 1:
+        raise ValueError("O número de processos deve ser um inteiro positivo.")
+
+    if blocks is None:
+        blocks = partition_elements(num_elements, num_workers)
+
+    # Um único processo: executa no processo atual sem memória compartilhada
+    if num_workers == 1:
+        descriptors = [('local', array) for array in arrays]
+        for start, stop in blocks:
+            yield block_function(descriptors, start, stop, *args)
+        return
+
+    executor = _get_executor(num_workers)
+
+    # Copia os arrays da malha para a memória compartilhada
+    shared_blocks = []
+    descriptors = []
+    futures = []
+    try:
+        for array in arrays:
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            shared_blocks.append(shm)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+            descriptors.append(('shared', (shm.name, array.shape, array.dtype.str)))
+
+        futures = [executor.submit(block_function, descriptors, start, stop, *args) for start, stop in blocks]
+        for i in range(len(futures)):
+            result = futures[i].result()
+            futures[i] = None
+            yield result
+    finally:
+        # Interrompido antes do fim: os blocos em execução terminam antes de a memória ser liberada
+        pending = [future for future in futures if future is not None and not future.cancel()]
+        wait(pending)
+        for shm in shared_blocks:
+            shm.close()
+            shm.unlink()
+
+def _get_executor(num_workers):
+    """
+    Pool de processos compartilhado: criado na primeira chamada e reaproveitado pelas seguintes
+    com o mesmo número de processos, para não pagar a criação dos processos a cada montagem.
+    """
+    if _pool['executor'] is None or _pool['num_workers'] != num_workers:
+        shutdown_pool()
+        if not _pool['registered']:
+            atexit.register(shutdown_pool)
+            _pool['registered'] = True
+        _pool['executor'] = ProcessPoolExecutor(max_workers=num_workers,
+                                                  mp_context=multiprocessing.get_context(_MP_CONTEXT))
+        _pool['num_workers'] = num_workers
+    return _pool['executor']
+
+def shutdown_pool():
+    """
+    Encerra o pool de processos compartilhado (ele é recriado na próxima montagem paralela).
+    """
+    if _pool['executor'] is not None:
+        _pool['executor'].shutdown()
+    _pool['executor'] = None
+    _pool['num_workers'] = 0
+
+def fixed_blocks(num_elements, block_size):
+    """
+    Divide os elementos em blocos contíguos de block_size elementos (o último pode ser menor).
+    """
+    return [(start, min(start + block_size, num_elements)) for start in range(0, num_elements, block_size)]
+
+def partition_elements(num_elements, num_blocks):
+    """
+    Divide os elementos em blocos contíguos de tamanhos aproximadamente iguais.
+
+    Args:
+    - num_elements (int): Número total de elementos.
+    - num_blocks (int): Número de blocos desejado.
+
+    Returns:
+    - blocks (list of tuples): Lista de intervalos (início, fim) não vazios.
+    """
+    bounds = np.linspace(0, num_elements, min(num_blocks, max(num_elements, 1)) + 1).astype(np.int64)
+    return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+def _attach_arrays(descriptors):
+    """
+    Reconstrói os arrays da malha a partir dos descritores de memória compartilhada.
+
+    Returns:
+    - arrays (list of ndarray): Arrays da malha.
+    - handles (list): Blocos de memória compartilhada abertos (devem ser fechados após o uso).
+    """
+    arrays = []
+    handles = []
+    for kind, value in descriptors:
+        if kind == 'local':
+            arrays.append(value)
+        else:
+            name, shape, dtype = value
+            shm = shared_memory.SharedMemory(name=name)
+            handles.append(shm)
+            arrays.append(np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf))
+    return arrays, handles
+
+def _assemble_block(descriptors, start, stop, order, type_element, source_function, coefficient, basis, degrees):
+    """
+    Soma as matrizes e vetores locais dos elementos [start, stop) nas posições de K.data e nos nós
+    de F que eles alcançam (somas na ordem dos elementos do bloco).
+
+    Returns:
+    - K_part (tuple): (posições de K.data alcançadas, ordenadas; soma das entradas do bloco em cada uma).
+    - F_part (tuple): (nós alcançados, ordenados; soma dos vetores locais do bloco em cada um).
+    """
+    (vertices, elements, scatter_map), handles = _attach_arrays(descriptors)
+    try:
+        # Cópias: nenhuma vista da memória compartilhada pode sobreviver ao close
+        block = np.array(elements[start:stop])
+        K_local, F_local = compute_local_systems(vertices, block, order, type_element, source_function, coefficient,
+                                                 basis=basis, quadrature_degree=degrees)
+        num_entries = block.shape[1] ** 2
+        positions = np.array(scatter_map[start * num_entries:stop * num_entries], dtype=np.int64)
+        positions, slots = np.unique(positions, return_inverse=True)
+        data_block = np.bincount(slots.ravel(), weights=K_local.ravel(), minlength=len(positions))
+        del K_local
+
+        nodes, slots = np.unique(block.ravel(), return_inverse=True)
+        F_block = np.bincount(slots.ravel(), weights=F_local.ravel(), minlength=len(nodes))
+        return (positions, data_block), (nodes, F_block)
+    finally:
+        del vertices, elements, scatter_map
+        for shm in handles:
+            shm.close()
+
+def _errors_block(descriptors, start, stop, order, element_type, basis, degrees):
+    """
+    Calcula as contribuições de erro dos elementos [start, stop).
+    """
+    (vertices, elements, u_numeric), handles = _attach_arrays(descriptors)
+    try:
+        return compute_element_errors(vertices, elements[start:stop], u_numeric, order, element_type, basis=basis,
+                                      quadrature_degree=degrees)
+    finally:
+        del vertices, elements, u_numeric
+        for shm in handles:
+            shm.close()
@@ -1,4 +1,6 @@
 def plot_convergence(h_values, l2_errors, energy_errors):
+    import matplotlib.pyplot as plt
+
     plt.figure()
     plt.loglog(h_values, l2_errors, label='Erro L2', marker='o')
     plt.loglog(h_values, energy_errors, label='Erro de Energia', marker='x')
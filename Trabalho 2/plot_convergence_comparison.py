@@ -1,5 +1,3 @@
-from matplotlib import pyplot as plt
-
 def plot_convergence_comparison(h_values_dict, l2_errors_dict, energy_errors_dict):
     """
     Função para plotar a convergência da solução numérica para diferentes ordens de Lagrange.
@@ -16,7 +14,9 @@ def plot_convergence_comparison(h_values_dict, l2_errors_dict, energy_errors_dic
     
     if not h_values_dict or not l2_errors_dict or not energy_errors_dict:
         raise ValueError("Os dicionários de entrada não podem ser vazios.")
-    
+
+    from matplotlib import pyplot as plt
+
     plt.figure(figsize=(12, 6))
     
     # Subplot para o erro L2
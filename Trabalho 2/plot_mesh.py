@@ -1,36 +1,39 @@
-from matplotlib import pyplot as plt
-
-def plot_mesh(nodes, elements, display):
+def plot_mesh(nodes, elements, display, element_type=None):
     """
     Plota a malha de elementos finitos.
+
+    Cada aresta é desenhada uma única vez, como uma linha que passa pelos seus nós (arestas da
+    mesh_topology.Mesh, em cache na malha).
     
     Args:
-    - nodes (ndarray): Array de vértices da malha.
-    - elements (ndarray): Array de elementos da malha.
+    - nodes (ndarray ou mesh_topology.Mesh): Array de vértices da malha, ou a própria malha.
+    - elements (ndarray): Array de elementos da malha (não usado com uma Mesh).
     - display (str): Opção de exibição:
         - "no": Não plota a malha.
         - "mesh": Plota apenas a malha.
         - "nodes": Plota a malha e os nós.
         - "val": Plota a malha e numera os nós.
+    - element_type (str): 'tri' ou 'quad'; se None, é deduzido do número de nós por elemento.
     """
-    
-    if nodes is None or elements is None:
+    from mesh_topology import Mesh
+
+    if nodes is None or (elements is None and not isinstance(nodes, Mesh)):
         raise ValueError("Nodes and elements cannot be None")
 
     if display not in ["no", "mesh", "nodes", "val"]:
         raise ValueError("Invalid display option")
 
+    from matplotlib import pyplot as plt
+    from matplotlib.collections import LineCollection
+
+    mesh = Mesh.from_arrays(nodes, elements, element_type)
+    nodes = mesh.nodes
+
     plt.figure(figsize=(8, 8))
 
-    # Plotar os elementos ligando os vértices por linhas
-    for elem in elements:
-        if elem is None:
-            raise ValueError("Elements cannot be None")
-        elem_vertices = nodes[elem - 1, :]  # Ajustar índice para zero-based
-        for i in range(len(elem)):
-            x = [elem_vertices[i, 0], elem_vertices[(i + 1) % len(elem), 0]]
-            y = [elem_vertices[i, 1], elem_vertices[(i + 1) % len(elem), 1]]
-            plt.plot(x, y, 'k-', linewidth=0.7)  # 'k-' para linhas pretas
+    # Plotar as arestas da malha, cada uma uma única vez ('k' para linhas pretas)
+    plt.gca().add_collection(LineCollection(nodes[mesh.edge_nodes], colors='k', linewidths=0.7))
+    plt.gca().autoscale_view()
     
     if display == "no":
         quit()
@@ -1,10 +1,5 @@
 
 import numpy as np
-from scipy.interpolate import griddata
-import matplotlib.pyplot as plt
-
-import calculate_exact_solution
-from calculate_exact_solution import calculate_exact_solution
 from plot_mesh import plot_mesh
 
 def plot_numerical_contour(vertices, elements, u_numeric, u_exact, order):
@@ -40,6 +35,10 @@ def plot_numerical_contour(vertices, elements, u_numeric, u_exact, order):
     # if vertices.ndim != 2 or elements.ndim != 2 or u_numeric.ndim != 1 or u_exact.ndim != 1:
     #     raise ValueError("Vetores de entrada devem ter dimensões correspondentes")
 
+    # Bibliotecas de interpolação e gráficos, carregadas apenas quando há algo a plotar
+    import matplotlib.pyplot as plt
+    from scipy.interpolate import griddata
+
     # Extraindo as coordenadas de x e y
     x, y = zip(*vertices)
 
@@ -57,7 +56,7 @@ def plot_numerical_contour(vertices, elements, u_numeric, u_exact, order):
     zi = griddata((x, y), u_numeric, (xi, yi), method = 'cubic')
 
     #Interpolação dos valores de u_exact na grade regular
-    ze = griddata((x, y), calculate_exact_solution(100), (xi, yi), method = 'cubic')
+    ze = griddata((x, y), u_exact, (xi, yi), method = 'cubic')
 
     # Plotando as linhas de contorno
     plt.figure(figsize = (8, 6))
@@ -0,0 +1,327 @@
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from assemble_system_vectorized import assemble_load_vector, assemble_system_vectorized, default_source_function
+from calculate_errors import calculate_errors
+from hierarchical_basis import check_basis, hierarchical_to_nodal, nodal_to_hierarchical
+from mesh_topology import Mesh
+from quadrature_selection import quadrature_report
+from renumbering import inverse_permutation, renumber_mesh, restore_numbering
+
+class PoissonProblem:
+    """
+    Problema de Poisson -div(k grad u) = f no quadrado [0, size]^2 com condição de Dirichlet
+    u = g no contorno, que guarda os resultados intermediários e recalcula apenas o que depende
+    das entradas alteradas:
+
+    - malha ou ordem: tudo é recalculado;
+    - coeficiente ou quadratura: apenas a montagem numérica de K (o padrão de esparsidade fica em cache);
+    - fonte: apenas o vetor F;
+    - nós de contorno: a eliminação de Dirichlet e a fatoração;
+    - valores de contorno: apenas o lado direito.
+
+    Em todos os casos a fatoração de K é reaproveitada enquanto a matriz com as condições de
+    contorno não muda; cada nova fonte ou valor de contorno custa apenas uma substituição.
+    """
+
+    def __init__(self, size, refinement_level, element_type, order, source_function=None, coefficient=1.0,
+                 boundary_values=0.0, boundary_nodes=None, mesh_generator=None, basis='lagrange', quadrature_degree=None,
+                 renumbering=None, boundary_tags=None):
+        """
+        Args:
+        - size (float): Tamanho do lado do domínio quadrado.
+        - refinement_level (int): Nível de refinamento da malha.
+        - element_type (str): Tipo de elemento ('tri' ou 'quad').
+        - order (int): Ordem do polinômio de Lagrange.
+        - source_function (callable): Função de fonte f(x, y). Se None, usa default_source_function.
+        - coefficient (float ou callable): Coeficiente de difusão k ou função k(x, y).
+        - boundary_values (float ou callable): Valor de Dirichlet g ou função g(x, y).
+        - boundary_nodes (array): Índices dos nós de Dirichlet. Se None, os nós do contorno da malha
+          (arestas de um único elemento, com os nós de ordem alta; ver mesh_topology.Mesh).
+        - mesh_generator (callable): Função (size, refinement_level, element_type, order) -> (nós, elementos).
+          Se None, usa mesh.generate_mesh (malha estruturada do quadrado).
+        - basis (str): 'lagrange' (u nos nós) ou 'hierarchical' (u são coeficientes modais associados aos
+          nós da malha; ver nodal_values).
+        - quadrature_degree (int ou dict): Grau da quadratura (None: escolha pelo grau da base e pelo integrando;
+          ver quadrature_selection e quadrature_report).
+        - renumbering (str): Renumeração dos nós após a geração da malha ('rcm', 'hilbert' ou 'morton';
+          None mantém a ordem do gerador; ver renumbering). nodes, elements e as soluções ficam na nova
+          numeração, e boundary_nodes é dado na numeração do gerador (ver original_numbering).
+        - boundary_tags (int ou iterável): Lados com condição de Dirichlet (structured_mesh.BOUNDARY_TAGS
+          ou grupos físicos do gmsh); None usa todo o contorno. Exige o gerador padrão.
+        """
+        if element_type not in ['tri', 'quad']:
+            raise ValueError("Tipo de elemento inválido. Deve ser 'tri' ou 'quad'")
+        check_basis(basis)
+
+        self.size = size
+        self.refinement_level = refinement_level
+        self.element_type = element_type
+        self.order = order
+        self.source_function = default_source_function if source_function is None else source_function
+        self.coefficient = coefficient
+        self.boundary_values = boundary_values
+        self.user_boundary_nodes = boundary_nodes
+        self.boundary_tags = boundary_tags
+        self.mesh_generator = mesh_generator
+        self.basis = basis
+        self.quadrature_degree = quadrature_degree
+        self.renumbering = renumbering
+
+        self.mesh = None
+        self.nodes = None
+        self.permutation = None
+        self.elements = None
+        self.boundary_nodes = None
+        self.K = None
+        self.F = None
+        self.K_bc = None
+        self.F_bc = None
+        self._solve = None
+
+        # Partes a recalcular e partes recalculadas na última atualização
+        self._dirty = {'mesh'}
+        self.last_updates = []
+
+    def set_mesh(self, size=None, refinement_level=None, element_type=None):
+        """
+        Altera os parâmetros da malha (todos os resultados serão recalculados).
+        """
+        if element_type is not None and element_type not in ['tri', 'quad']:
+            raise ValueError("Tipo de elemento inválido. Deve ser 'tri' ou 'quad'")
+        for name, value in (('size', size), ('refinement_level', refinement_level), ('element_type', element_type)):
+            if value is not None and value != getattr(self, name):
+                setattr(self, name, value)
+                self._dirty.add('mesh')
+
+    def set_order(self, order):
+        """
+        Altera a ordem do polinômio de Lagrange (a malha de ordem alta é gerada novamente).
+        """
+        if order != self.order:
+            self.order = order
+            self._dirty.add('mesh')
+
+    def set_renumbering(self, renumbering):
+        """
+        Altera a renumeração dos nós (todos os resultados serão recalculados).
+        """
+        if renumbering != self.renumbering:
+            self.renumbering = renumbering
+            self._dirty.add('mesh')
+
+    def set_coefficient(self, coefficient):
+        """
+        Altera o coeficiente de difusão (apenas K é montada novamente).
+        """
+        self.coefficient = coefficient
+        self._dirty.add('stiffness')
+
+    def set_quadrature(self, quadrature_degree):
+        """
+        Altera o grau da quadratura (None volta à escolha automática; K e F são montados novamente).
+        """
+        if quadrature_degree != self.quadrature_degree:
+            self.quadrature_degree = quadrature_degree
+            self._dirty.add('stiffness')
+
+    def set_source(self, source_function):
+        """
+        Altera a função de fonte (apenas F é montado novamente).
+        """
+        self.source_function = source_function
+        self._dirty.add('load')
+
+    def set_boundary(self, boundary_values=None, boundary_nodes=None, boundary_tags=None):
+        """
+        Altera os valores e/ou os nós da condição de Dirichlet.
+
+        Args:
+        - boundary_values (float ou callable): Novo valor g ou função g(x, y) (None mantém o atual).
+        - boundary_nodes (array): Novos nós de Dirichlet (None mantém os atuais).
+        - boundary_tags (int ou iterável): Novos lados de Dirichlet (None mantém os atuais).
+        """
+        if boundary_values is not None:
+            self.boundary_values = boundary_values
+            self._dirty.add('boundary_values')
+        if boundary_nodes is not None:
+            self.user_boundary_nodes = boundary_nodes
+            self._dirty.add('boundary_nodes')
+        if boundary_tags is not None:
+            self.boundary_tags = boundary_tags
+            self._dirty.add('boundary_nodes')
+
+    def update(self):
+        """
+        Recalcula somente as partes afetadas pelas entradas alteradas desde a última atualização.
+
+        Returns:
+        - last_updates (list): Nomes das partes recalculadas, na ordem em que foram recalculadas.
+        """
+        dirty = self._dirty
+        self.last_updates = []
+
+        if 'mesh' in dirty:
+            self._build_mesh()
+            dirty |= {'boundary_nodes', 'stiffness'}
+
+        if 'boundary_nodes' in dirty:
+            self._find_boundary_nodes()
+            dirty |= {'constraints', 'boundary_values'}
+
+        # A montagem de K também produz F com a fonte atual
+        if 'stiffness' in dirty:
+            self.K, self.F = assemble_system_vectorized(self.nodes, self.elements, self.order, self.element_type,
+                                                        self.source_function, self.coefficient, basis=self.basis,
+                                                        quadrature_degree=self.quadrature_degree)
+            self.last_updates.append('stiffness')
+            dirty.discard('load')
+            dirty |= {'constraints', 'rhs'}
+
+        if 'load' in dirty:
+            self.F = assemble_load_vector(self.nodes, self.elements, self.order, self.element_type, self.source_function,
+                                          self.basis, self.quadrature_degree)
+            self.last_updates.append('load')
+            dirty.add('rhs')
+
+        if 'constraints' in dirty:
+            self._apply_constraints()
+            dirty.add('rhs')
+
+        if 'boundary_values' in dirty or 'rhs' in dirty:
+            self._apply_rhs()
+
+        dirty.clear()
+        return self.last_updates
+
+    def solve(self):
+        """
+        Atualiza o sistema e resolve K u = F reaproveitando a fatoração sempre que possível.
+
+        Returns:
+        - u (ndarray): Solução numérica nos nós da malha.
+        """
+        self.update()
+        return self._solve(self.F_bc)
+
+    def errors(self, u_numeric, **kwargs):
+        """
+        Erros L2 e de energia da solução numérica em relação à solução exata sin(pi x) sin(pi y).
+
+        Args:
+        - u_numeric (ndarray): Solução numérica nos nós.
+        - kwargs: Opções repassadas a calculate_errors (engine, num_workers, quadrature_degree).
+
+        Returns:
+        - l2_error (float), energy_error (float)
+        """
+        kwargs.setdefault('quadrature_degree', self.quadrature_degree)
+        u_exact = np.sin(np.pi * self.nodes[:, 0]) * np.sin(np.pi * self.nodes[:, 1])
+        return calculate_errors(self.nodes, self.elements, u_numeric, u_exact, self.order, self.element_type,
+                                basis=self.basis, **kwargs)
+
+    def quadrature_report(self, verbose=True):
+        """
+        Grau e número de pontos da quadratura de cada integrando na malha atual.
+
+        Returns:
+        - report (dict): Integrando -> (grau da quadratura, número de pontos).
+        """
+        # A malha é gerada se necessário; o restante fica para a próxima atualização
+        if 'mesh' in self._dirty:
+            self._build_mesh()
+            self._dirty.discard('mesh')
+            self._dirty |= {'boundary_nodes', 'stiffness'}
+        return quadrature_report(self.nodes, self.elements, self.element_type, quadrature_degree=self.quadrature_degree,
+                                 verbose=verbose)
+
+    def original_numbering(self, u):
+        """
+        Valores nodais na numeração do gerador de malha (desfaz a renumeração, se houver).
+        """
+        return np.asarray(u) if self.permutation is None else restore_numbering(u, self.permutation)
+
+    def nodal_values(self, u):
+        """
+        Valores da solução nos nós da malha (com a base hierárquica, u contém coeficientes modais).
+        """
+        if self.basis == 'hierarchical':
+            return hierarchical_to_nodal(u, self.elements, self.element_type)
+        return np.asarray(u)
+
+    def _build_mesh(self):
+        """
+        Gera a malha e descarta todos os resultados que dependem dela.
+        """
+        # O gerador padrão fornece também as arestas de cada lado do quadrado (tags de contorno)
+        boundary_facets = boundary_tags = None
+        if self.mesh_generator is None:
+            from mesh import generate_mesh
+            nodes, elements, boundary_facets, boundary_tags = generate_mesh(self.size, self.refinement_level,
+                                                                            self.element_type, self.order,
+                                                                            return_boundary=True)
+        else:
+            nodes, elements = self.mesh_generator(self.size, self.refinement_level, self.element_type, self.order)
+        nodes = np.asarray(nodes)[:, :2]
+        elements = np.asarray(elements)
+
+        self.permutation = None
+        if self.renumbering is not None:
+            nodes, elements, _, self.permutation = renumber_mesh(nodes, elements, self.renumbering)
+            if boundary_facets is not None:
+                boundary_facets = inverse_permutation(self.permutation)[boundary_facets]
+
+        # Topologia (contorno e nós de cada lado) calculada uma vez por malha
+        self.mesh = Mesh(nodes, elements, self.element_type)
+        if boundary_facets is not None:
+            self.mesh.set_boundary_tags(boundary_facets, boundary_tags)
+        self.nodes, self.elements = self.mesh.nodes, self.mesh.elements
+
+        self.K = self.F = self.K_bc = self.F_bc = self._solve = None
+        self.last_updates.append('mesh')
+
+    def _find_boundary_nodes(self):
+        """
+        Nós de Dirichlet: os fornecidos pelo usuário ou os nós do contorno (dos lados boundary_tags).
+        """
+        if self.user_boundary_nodes is not None:
+            self.boundary_nodes = np.unique(np.asarray(self.user_boundary_nodes, dtype=np.int64))
+            if self.permutation is not None:
+                self.boundary_nodes = np.sort(inverse_permutation(self.permutation)[self.boundary_nodes])
+        else:
+            self.boundary_nodes = self.mesh.boundary_nodes(self.boundary_tags)
+        self.last_updates.append('boundary_nodes')
+
+    def _apply_constraints(self):
+        """
+        Eliminação de Dirichlet (linhas e colunas dos nós restritos anuladas, diagonal 1, como em
+        apply_dirichlet) e fatoração da matriz resultante.
+        """
+        free = np.ones(len(self.nodes))
+        free[self.boundary_nodes] = 0.0
+        self.K_bc = (sp.diags(free) @ self.K @ sp.diags(free) + sp.diags(1.0 - free)).tocsc()
+        self._solve = spla.factorized(self.K_bc)
+        self.last_updates.append('constraints')
+
+    def _apply_rhs(self):
+        """
+        Lado direito com os valores de Dirichlet: F - K g nos nós livres e g nos nós restritos.
+        """
+        g = np.zeros(len(self.nodes))
+        nodes = self.nodes[self.boundary_nodes]
+        if callable(self.boundary_values):
+            g[self.boundary_nodes] = self.boundary_values(nodes[:, 0], nodes[:, 1])
+        else:
+            g[self.boundary_nodes] = self.boundary_values
+
+        # Base hierárquica: coeficientes do interpolante de g (os de vértice e aresta do contorno
+        # dependem apenas dos valores no contorno)
+        if self.basis == 'hierarchical' and np.any(g):
+            g_modes = nodal_to_hierarchical(g, self.elements, self.element_type)
+            g = np.zeros(len(self.nodes))
+            g[self.boundary_nodes] = g_modes[self.boundary_nodes]
+
+        F_bc = self.F - self.K @ g
+        F_bc[self.boundary_nodes] = g[self.boundary_nodes]
+        self.F_bc = F_bc
+        self.last_updates.append('rhs')
@@ -0,0 +1,157 @@
+from functools import lru_cache
+from math import gamma
+import numpy as np
+
+def _read_only(*arrays):
+    """
+    Torna C-contíguos e somente leitura os arrays guardados em cache.
+    """
+    arrays = tuple(np.ascontiguousarray(array, dtype=float) for array in arrays)
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+@lru_cache(maxsize=None)
+def gauss_jacobi(num_points, alpha=0.0, beta=0.0):
+    """
+    Regra de Gauss-Jacobi em [-1, 1] com peso (1 - x)^alpha (1 + x)^beta pelo algoritmo de
+    Golub-Welsch: os pontos são os autovalores da matriz de Jacobi (tridiagonal simétrica da
+    recorrência de três termos) e os pesos vêm da primeira componente dos autovetores. Exata para
+    polinômios de grau até 2 n - 1 (vezes o peso).
+
+    Args:
+    - num_points (int): Número de pontos n.
+    - alpha, beta (float): Expoentes do peso (alpha = beta = 0 é Gauss-Legendre).
+
+    Returns:
+    - points (ndarray): Pontos em ordem crescente, tamanho n (somente leitura).
+    - weights (ndarray): Pesos, tamanho n (somente leitura).
+    """
+    if not isinstance(num_points, (int, np.integer)) or num_points < 1:
+        raise ValueError("O número de pontos deve ser um inteiro positivo.")
+    if alpha <= -1 or beta <= -1:
+        raise ValueError("Os expoentes do peso devem ser maiores que -1.")
+
+    n = np.arange(num_points, dtype=float)
+    ab = alpha + beta
+
+    # Diagonal: a_n = (beta^2 - alpha^2) / ((2n + ab)(2n + ab + 2)), com a_0 = (beta - alpha) / (ab + 2)
+    diagonal = np.empty(num_points)
+    diagonal[0] = (beta - alpha) / (ab + 2)
+    m = n[1:]
+    diagonal[1:] = (beta**2 - alpha**2) / ((2 * m + ab) * (2 * m + ab + 2))
+
+    # Subdiagonal: b_n = sqrt(4n(n + alpha)(n + beta)(n + ab) / ((2n + ab)^2 (2n + ab + 1)(2n + ab - 1)))
+    off_diagonal = np.sqrt(4 * m * (m + alpha) * (m + beta) * (m + ab)
+                           / ((2 * m + ab) ** 2 * (2 * m + ab + 1) * (2 * m + ab - 1)))
+
+    jacobi_matrix = np.diag(diagonal) + np.diag(off_diagonal, 1) + np.diag(off_diagonal, -1)
+    points, vectors = np.linalg.eigh(jacobi_matrix)
+
+    # Momento de ordem zero do peso
+    mu0 = 2 ** (ab + 1) * gamma(alpha + 1) * gamma(beta + 1) / gamma(ab + 2)
+    weights = mu0 * vectors[0] ** 2
+
+    # Regras simétricas (alpha = beta): simetria exata dos pontos e pesos
+    if alpha == beta:
+        points = (points - points[::-1]) / 2
+        weights = (weights + weights[::-1]) / 2
+
+    return _read_only(points, weights)
+
+def gauss_legendre_rule(num_points):
+    """
+    Regra de Gauss-Legendre 1D com num_points pontos (exata até o grau 2 n - 1).
+    """
+    return gauss_jacobi(num_points)
+
+@lru_cache(maxsize=None)
+def quadrature_rule(type_element, degree):
+    """
+    Regra de quadratura exata para polinômios até o grau dado no elemento de referência.
+
+    - 'tri' (triângulo (0, 0), (1, 0), (0, 1)): regra colapsada (Duffy) xi = (1 + a)(1 - b)/4,
+      eta = (1 + b)/2, com Gauss-Legendre em a e Gauss-Jacobi (1, 0) em b (o fator (1 - b) do
+      Jacobiano fica no peso). Exata para o grau total dado; pesos positivos, soma 1/2.
+    - 'quad' (quadrado [-1, 1]^2): produto tensorial de Gauss-Legendre, exato até o grau dado em
+      cada variável (portanto para Q_grau). Pontos com xi variando mais devagar.
+
+    Args:
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - degree (int): Grau polinomial a integrar exatamente (>= 0).
+
+    Returns:
+    - points (ndarray): Pontos, formato (n_pontos, 2), C-contíguo e somente leitura.
+    - weights (ndarray): Pesos, tamanho n_pontos, somente leitura.
+    """
+    if not isinstance(degree, (int, np.integer)) or degree < 0:
+        raise ValueError("O grau da quadratura deve ser um inteiro não negativo.")
+
+    num_points_1d = int(degree) // 2 + 1
+    if type_element == 'tri':
+        a, wa = gauss_jacobi(num_points_1d)
+        b, wb = gauss_jacobi(num_points_1d, 1.0, 0.0)
+        A, B = np.meshgrid(a, b, indexing='ij')
+        points = np.stack([(1 + A) * (1 - B) / 4, (1 + B) / 2], axis=-1).reshape(-1, 2)
+        weights = np.outer(wa, wb).ravel() / 8
+    elif type_element == 'quad':
+        x, w = gauss_jacobi(num_points_1d)
+        X, Y = np.meshgrid(x, x, indexing='ij')
+        points = np.stack([X, Y], axis=-1).reshape(-1, 2)
+        weights = np.outer(w, w).ravel()
+    else:
+        raise ValueError("O elemento deve ser triângulo ('tri') ou quadrilátero ('quad').")
+
+    return _read_only(points, weights)
+
+# Regras simétricas do triângulo de referência por número de pontos (pesos somam 1/2): centróide
+# (grau 1), pontos médios das arestas (grau 2), regra de 4 pontos com peso negativo no centróide
+# (grau 3), Dunavant de 6 (grau 4) e de 7 pontos (grau 5)
+def _symmetric_triangle_rules():
+    rules = {}
+    rules[1] = ([(1 / 3, 1 / 3)], [1 / 2])
+    rules[3] = ([(1 / 2, 0), (0, 1 / 2), (1 / 2, 1 / 2)], [1 / 6] * 3)
+    rules[4] = ([(1 / 3, 1 / 3), (0.6, 0.2), (0.2, 0.6), (0.2, 0.2)], [-27 / 96] + [25 / 96] * 3)
+
+    a, b, w1 = 0.091576213509771, 0.816847572980459, 0.109951743655322 / 2
+    c, d, w2 = 0.445948490915965, 0.108103018168070, 0.223381589678011 / 2
+    rules[6] = ([(a, a), (b, a), (a, b), (c, c), (d, c), (c, d)], [w1] * 3 + [w2] * 3)
+
+    sqrt15 = np.sqrt(15.0)
+    a, w1 = (6 - sqrt15) / 21, (155 - sqrt15) / 2400
+    c, w2 = (6 + sqrt15) / 21, (155 + sqrt15) / 2400
+    rules[7] = ([(1 / 3, 1 / 3), (a, a), (1 - 2 * a, a), (a, 1 - 2 * a), (c, c), (1 - 2 * c, c), (c, 1 - 2 * c)],
+                [9 / 80] + [w1] * 3 + [w2] * 3)
+    return rules
+
+_TRIANGLE_RULES = _symmetric_triangle_rules()
+
+@lru_cache(maxsize=None)
+def rule_by_points(type_element, num_points):
+    """
+    Regra de quadratura pelo número de pontos (convenção de gauss_quadrature_points2).
+
+    - 'tri': num_points pontos no triângulo; apenas as regras simétricas com 1, 3, 4, 6 e 7 pontos.
+      Para outros graus, use quadrature_rule('tri', grau).
+    - 'quad': num_points pontos de Gauss-Legendre em cada direção.
+
+    Returns:
+    - points (ndarray): Pontos, formato (n_pontos, 2), C-contíguo e somente leitura.
+    - weights (ndarray): Pesos, tamanho n_pontos, somente leitura.
+
+    Raises:
+    - ValueError: Se não houver regra com esse número de pontos (para triângulo, se não houver regra
+      simétrica com esse número de pontos).
+    """
+    if not isinstance(num_points, (int, np.integer)) or num_points < 1:
+        raise ValueError("O número de pontos deve ser um inteiro positivo.")
+
+    if type_element == 'tri':
+        if num_points not in _TRIANGLE_RULES:
+            raise ValueError("Número de pontos não suportado para triângulo")
+        points, weights = _TRIANGLE_RULES[num_points]
+        return _read_only(points, weights)
+    elif type_element == 'quad':
+        return quadrature_rule('quad', 2 * int(num_points) - 1)
+    else:
+        raise ValueError("O elemento deve ser triângulo ('tri') ou quadrilátero ('quad').")
@@ -0,0 +1,142 @@
+import numpy as np
+from element_geometry import detect_affine_elements
+from lagrange_basis import basis_degree, reference_nodes, tabulate_basis
+from quadrature import quadrature_rule
+
+# Integrandos com escolha automática da quadratura
+INTEGRANDS = ('stiffness', 'mass', 'load', 'error')
+
+def non_affine_extra_degree(type_element, degree):
+    """
+    Acréscimo de grau da quadratura em malhas não afins, igual ao grau de detJ na geometria
+    isoparamétrica de ordem p: 2(p - 1) em triângulos e 2p (por variável) em quadriláteros.
+
+    Com Jacobiano variável a rigidez é racional e nenhuma regra é exata; o acréscimo é uma
+    heurística que cresce com a ordem da geometria, pois elementos curvos de ordem alta precisam de
+    regras bem mais finas que os de ordem baixa (P3 curvo: grau 8 em vez de 6 reduz o erro
+    relativo de K de cerca de 0.14 para 0.03).
+    """
+    return 2 * (degree - 1) if type_element == 'tri' else 2 * degree
+
+def integrand_degree(type_element, degree, integrand, affine=True):
+    """
+    Grau polinomial de cada integrando em função da ordem p da base.
+
+    - 'stiffness' (grad N_a . grad N_b): 2p - 2 em triângulos afins. Em quadriláteros Q_p cada
+      derivada mantém o grau p na outra variável, e a regra tensorial precisa do grau 2p em cada
+      variável.
+    - 'mass' (N_a N_b): 2p.
+    - 'load' (f N_a, com f aproximada em grau p): 2p.
+    - 'error' ((u - u_h)^2 e |grad(u - u_h)|^2, com u aproximada em grau p + 1): 2p + 2.
+
+    Em malhas não afins todos os graus recebem non_affine_extra_degree(type_element, p).
+
+    Args:
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - degree (int): Ordem p da base.
+    - integrand (str): Um dos nomes de INTEGRANDS.
+    - affine (bool): Se todos os elementos da malha são afins.
+
+    Returns:
+    - quadrature_degree (int): Grau que a regra de quadratura deve integrar exatamente.
+    """
+    if type_element not in ['tri', 'quad']:
+        raise ValueError("O elemento deve ser triângulo ('tri') ou quadrilátero ('quad').")
+
+    if integrand == 'stiffness':
+        quadrature_degree = 2 * degree - 2 if type_element == 'tri' else 2 * degree
+    elif integrand in ('mass', 'load'):
+        quadrature_degree = 2 * degree
+    elif integrand == 'error':
+        quadrature_degree = 2 * degree + 2
+    else:
+        raise ValueError(f"Integrando inválido: {integrand!r}. Deve ser um de {INTEGRANDS}.")
+
+    return quadrature_degree if affine else quadrature_degree + non_affine_extra_degree(type_element, degree)
+
+def is_affine_mesh(node_coords, type_element, tol=1e-8):
+    """
+    Verifica se todos os elementos têm mapeamento afim (triângulos de lados retos, paralelogramos).
+
+    Cada componente do Jacobiano é um polinômio do espaço da base; ele é constante se coincide em
+    todos os nós de referência, que são unisolventes para esse espaço. A tolerância é mais folgada
+    que a de element_geometry: em ordens altas os nós gerados têm erros de arredondamento da ordem
+    de 1e-12, e aqui a classificação só escolhe o grau da quadratura. O arredondamento do tipo das
+    coordenadas (float32 no modo 'compact') é somado à tolerância (ver detect_affine_elements).
+
+    Args:
+    - node_coords (ndarray): Coordenadas dos nós de cada elemento, formato (n_elementos, n_nos, 2).
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - tol (float): Tolerância relativa da variação do Jacobiano.
+
+    Returns:
+    - affine (bool): True se todos os elementos forem afins.
+    """
+    degree = basis_degree(type_element, node_coords.shape[1])
+    _, dN = tabulate_basis(type_element, degree, reference_nodes(type_element, degree))
+    J = np.einsum('eai,qaj->eqij', node_coords, dN)
+    return bool(np.all(detect_affine_elements(J, tol, node_coords, dN)))
+
+def quadrature_degrees(vertices, elements, type_element, integrands, affine='auto', quadrature_degree=None):
+    """
+    Escolhe o grau da quadratura de cada integrando.
+
+    Args:
+    - vertices (ndarray): Coordenadas dos nós da malha, formato (n_nos, 2).
+    - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento).
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - integrands (tuple): Nomes dos integrandos (ver INTEGRANDS).
+    - affine (bool ou str): True declara a malha afim; 'auto' ou False verificam a geometria.
+    - quadrature_degree (int ou dict): None escolhe todos os graus pelo integrando; um inteiro é
+      usado em todos os integrandos; um dicionário integrando -> grau substitui apenas os listados.
+
+    Returns:
+    - degrees (dict): Integrando -> grau da quadratura.
+    """
+    if quadrature_degree is not None and not isinstance(quadrature_degree, dict):
+        return {integrand: _check_degree(quadrature_degree) for integrand in integrands}
+
+    overrides = {} if quadrature_degree is None else quadrature_degree
+    for integrand in overrides:
+        if integrand not in INTEGRANDS:
+            raise ValueError(f"Integrando inválido: {integrand!r}. Deve ser um de {INTEGRANDS}.")
+
+    # A geometria só é verificada se algum integrando ficar com a escolha automática
+    mesh_affine = None
+    degrees = {}
+    for integrand in integrands:
+        if integrand in overrides:
+            degrees[integrand] = _check_degree(overrides[integrand])
+            continue
+        if mesh_affine is None:
+            elements = np.asarray(elements)
+            degree = basis_degree(type_element, elements.shape[1])
+            mesh_affine = affine is True or is_affine_mesh(np.asarray(vertices)[:, :2][elements], type_element)
+        degrees[integrand] = integrand_degree(type_element, degree, integrand, mesh_affine)
+
+    return degrees
+
+def _check_degree(quadrature_degree):
+    if not isinstance(quadrature_degree, (int, np.integer)) or quadrature_degree < 0:
+        raise ValueError("O grau da quadratura deve ser um inteiro não negativo.")
+    return int(quadrature_degree)
+
+def quadrature_report(vertices, elements, type_element, affine='auto', quadrature_degree=None, verbose=True):
+    """
+    Grau e número de pontos da quadratura escolhida para cada integrando.
+
+    Args:
+    - vertices, elements, type_element, affine, quadrature_degree: ver quadrature_degrees.
+    - verbose (bool): Se True, imprime a tabela.
+
+    Returns:
+    - report (dict): Integrando -> (grau da quadratura, número de pontos).
+    """
+    degrees = quadrature_degrees(vertices, elements, type_element, INTEGRANDS, affine, quadrature_degree)
+    report = {integrand: (degree, len(quadrature_rule(type_element, degree)[1])) for integrand, degree in degrees.items()}
+
+    if verbose:
+        for integrand, (degree, num_points) in report.items():
+            print(f"{integrand:<12} grau {degree:<4} {num_points:6d} pontos")
+
+    return report
@@ -0,0 +1,46 @@
+from functools import lru_cache
+from hierarchical_basis import check_basis, tabulate
+from lagrange_basis import basis_degree
+from quadrature import quadrature_rule
+from tabulation_cache import cached_tables
+
+@lru_cache(maxsize=None)
+def reference_tables(type_element, quadrature_degree, num_element_nodes, basis='lagrange'):
+    """
+    Calcula os pontos de Gauss, os pesos e a tabela das funções de forma e gradientes no
+    elemento de referência (triângulo (0, 0), (1, 0), (0, 1) ou quadrado [-1, 1]^2).
+
+    As tabelas ficam em memória e, se o cache em disco estiver ativo (ver tabulation_cache), em
+    arquivos .npy compartilhados entre processos. Os arrays retornados são somente leitura.
+
+    Args:
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - quadrature_degree (int): Grau polinomial integrado exatamente pela quadratura (ver quadrature_selection).
+    - num_element_nodes (int): Número de nós (funções de forma) por elemento.
+    - basis (str): 'lagrange' (nodal, também usada na geometria) ou 'hierarchical' (ver hierarchical_basis).
+
+    Returns:
+    - points (ndarray): Pontos de Gauss, formato (n_pontos, 2).
+    - weights (ndarray): Pesos de Gauss, tamanho n_pontos.
+    - N (ndarray): Funções de forma nos pontos de Gauss, formato (n_pontos, n_nos).
+    - dN (ndarray): Gradientes das funções de forma nos pontos de Gauss, formato (n_pontos, n_nos, 2).
+    """
+    check_basis(basis)
+    degree = basis_degree(type_element, num_element_nodes)
+
+    def compute():
+        # Pontos de Gauss e pesos como arrays
+        points, weights = quadrature_rule(type_element, quadrature_degree)
+
+        # Tabela das funções de forma e gradientes em todos os pontos de Gauss
+        N, dN = tabulate(type_element, degree, points, basis)
+        return points, weights, N, dN
+
+    tables = cached_tables('reference_tables', (type_element, degree, quadrature_degree, basis), ('points', 'weights', 'N', 'dN'), compute)
+
+    # Os resultados ficam em cache: protege contra alterações acidentais
+    for table in tables:
+        if table.flags.writeable:
+            table.setflags(write=False)
+
+    return tables
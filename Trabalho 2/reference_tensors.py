@@ -0,0 +1,76 @@
+from functools import lru_cache
+import numpy as np
+from element_geometry import inverse_2x2
+from lagrange_basis import basis_degree
+from reference_tables import reference_tables
+from tabulation_cache import cached_tables
+
+@lru_cache(maxsize=None)
+def reference_stiffness_tensors(type_element, quadrature_degree, num_element_nodes, basis='lagrange'):
+    """
+    Pré-calcula, uma única vez por (tipo de elemento, ordem, grau da quadratura), os tensores de referência da
+    matriz de rigidez de Poisson em elementos afins:
+
+        R_ij[a, b] = sum_q w_q * dN_a/dxi_i(q) * dN_b/dxi_j(q)
+
+    Como G = invJ @ invJ.T * |detJ| é simétrica, a matriz do elemento é
+    K_e = G_00 * R_00 + G_01 * (R_01 + R_10) + G_11 * R_11.
+
+    Args:
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - quadrature_degree (int): Grau da quadratura (2p - 2 integra exatamente a base de grau p em triângulos).
+    - num_element_nodes (int): Número de nós (funções de forma) por elemento.
+    - basis (str): Base das funções de forma ('lagrange' ou 'hierarchical'); o Jacobiano usa sempre a de Lagrange.
+
+    Returns:
+    - R (ndarray): Tensores de referência, formato (3, n_nos * n_nos), linhas R_00, R_01 + R_10, R_11.
+    - dN_ref (ndarray): Gradientes das funções de forma em um ponto de referência, formato (n_nos, 2),
+      usados para calcular o Jacobiano (constante) de cada elemento.
+    """
+    def compute():
+        _, weights, _, dN = reference_tables(type_element, quadrature_degree, num_element_nodes)
+        _, _, _, dN_basis = reference_tables(type_element, quadrature_degree, num_element_nodes, basis)
+        R_full = np.einsum('q,qai,qbj->ijab', weights, dN_basis, dN_basis)
+        R = np.stack([R_full[0, 0], R_full[0, 1] + R_full[1, 0], R_full[1, 1]]).reshape(3, -1)
+        return R, np.array(dN[0])
+
+    degree = basis_degree(type_element, num_element_nodes)
+    R, dN_ref = cached_tables('reference_stiffness', (type_element, degree, quadrature_degree, basis), ('R', 'dN_ref'), compute)
+
+    # Os resultados ficam em cache: protege contra alterações acidentais
+    for table in (R, dN_ref):
+        if table.flags.writeable:
+            table.setflags(write=False)
+
+    return R, dN_ref
+
+def affine_stiffness_matrices(node_coords, type_element, quadrature_degree, coefficient=1.0, basis='lagrange'):
+    """
+    Monta as matrizes de rigidez de elementos afins como um único produto matricial
+    (n_elementos x 3) @ (3 x n_nos**2), sem laço de quadratura.
+
+    Args:
+    - node_coords (ndarray): Coordenadas dos nós de cada elemento afim, formato (n_elementos, n_nos, 2).
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - quadrature_degree (int): Grau da quadratura dos tensores de referência.
+    - coefficient (float): Coeficiente de difusão constante.
+    - basis (str): Base das funções de forma ('lagrange' ou 'hierarchical').
+
+    Returns:
+    - K_local (ndarray): Matrizes de rigidez dos elementos, formato (n_elementos, n_nos, n_nos).
+    """
+    num_elements, num_element_nodes = node_coords.shape[:2]
+    R, dN_ref = reference_stiffness_tensors(type_element, quadrature_degree, num_element_nodes, basis)
+
+    # Jacobiano constante de cada elemento
+    J = np.einsum('eai,aj->eij', node_coords, dN_ref)
+    detJ, invJ = inverse_2x2(J)
+
+    # Pesos G = invJ @ invJ.T * |detJ| (entradas 00, 01 e 11)
+    scale = coefficient * np.abs(detJ)
+    G = np.empty((num_elements, 3))
+    G[:, 0] = (invJ[:, 0, 0] ** 2 + invJ[:, 0, 1] ** 2) * scale
+    G[:, 1] = (invJ[:, 0, 0] * invJ[:, 1, 0] + invJ[:, 0, 1] * invJ[:, 1, 1]) * scale
+    G[:, 2] = (invJ[:, 1, 0] ** 2 + invJ[:, 1, 1] ** 2) * scale
+
+    return (G @ R).reshape(num_elements, num_element_nodes, num_element_nodes)
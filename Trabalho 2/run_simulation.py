@@ -1,20 +1,12 @@
 import numpy as np
-import assemble_system
-from assemble_system import assemble_system
-import apply_dirichlet
-from apply_dirichlet import apply_dirichlet
-import calculate_errors
-from calculate_errors import calculate_errors
-from calculate_polygon_vertices import calculate_polygon_vertices
-from mesh import generate_mesh
 import plot_convergence
 from plot_convergence import plot_convergence
 import plot_numerical_contour
 from plot_numerical_contour import plot_numerical_contour
-import solve_system
-from solve_system import solve_system
+from mesh_refinement import nested_mesh_generator
+from poisson_problem import PoissonProblem
 
-def run_simulation(order, refinement_level, max_refinement_level, element_type, size):
+def run_simulation(order, refinement_level, max_refinement_level, element_type, size, nested=False):
     """
     Função para executar a simulação para uma ordem de Lagrange e nível de refinamento dados.
 
@@ -24,8 +16,15 @@ def run_simulation(order, refinement_level, max_refinement_level, element_type,
         Ordem do polinômio de Lagrange.
     refinement_level : int
         Nível de refinamento da malha.
-    type_element : string
+    max_refinement_level : int
+        Nível de refinamento máximo.
+    element_type : string
         Tipo de elemento (tri ou quad).
+    size : float
+        Tamanho do lado do domínio quadrado.
+    nested : bool
+        Se True, as malhas são obtidas por refinamento uniforme da malha anterior (nível L com
+        2**(L - 1) células por lado; ver mesh_refinement.nested_mesh_generator).
 
     Returns
     -------
@@ -40,31 +39,29 @@ def run_simulation(order, refinement_level, max_refinement_level, element_type,
     energy_errors =[]
     h_values =[]
 
+    # Problema com os resultados intermediários em cache (apenas a malha muda a cada refinamento)
+    mesh_generator = nested_mesh_generator() if nested else None
+    problem = PoissonProblem(size, 1, element_type, order, mesh_generator=mesh_generator)
+
     # Para o refinamento 1 até o máximo
     for refinement_level in range(1, max_refinement_level +1):
 
-        #Gera a malha refinada
-        nodes, elements = generate_mesh(size, refinement_level, element_type, order)
-
-        # Vertices do elemento
-        vertices = calculate_polygon_vertices(element_type)
-
-        #Monta o sistema
-        K, F = assemble_system(vertices, elements, order, element_type)
-        K, F = apply_dirichlet(K, F, vertices)
-        u_numeric = solve_system(K, F)
+        #Gera a malha refinada, monta e resolve o sistema
+        problem.set_mesh(refinement_level=refinement_level)
+        u_numeric = problem.solve()
+        vertices, elements = problem.nodes, problem.elements
         #plot_solution(vertices, elements, u_numeric, order)
 
         #Solução exata
         u_exact= np.sin(np.pi * vertices[:,0]) * np.sin( np.pi * vertices[:,1])
 
         #Calcula erros
-        l2_error, energy_error = calculate_errors(vertices, elements, u_numeric, u_exact, order)
+        l2_error, energy_error = problem.errors(u_numeric)
         l2_errors.append(l2_error)
         energy_errors.append(energy_error)
 
         #Calcula o tamanho da malha e adiciona à lista
-        h = np.sqrt(2)/refinement_level
+        h = np.sqrt(2) * size / 2 ** (refinement_level - 1) if nested else np.sqrt(2)/refinement_level
         h_values.append(h)
 
         if refinement_level==max_refinement_level:
@@ -1,6 +1,5 @@
 
 import numpy as np
-from sympy import lambdify, simplify, symbols
 
 # Definição da função shape_functions
 def shape_functions(num_total_nodes):
@@ -17,6 +16,9 @@ def shape_functions(num_total_nodes):
     if num_total_nodes <= 0:
         raise ValueError("O número total de nós deve ser maior que zero.")
 
+    # O sympy é importado apenas aqui, pois sua carga é lenta
+    from sympy import lambdify, simplify, symbols
+
     # Cria variáveis simbólicas
     x, y = symbols('x y')
     # Pontos de interpolação no polígono regular
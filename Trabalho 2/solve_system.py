@@ -4,13 +4,19 @@ import scipy.linalg as lil
 import scipy.sparse as dok
 
 #Função para resolver o sistema
-def solve_system(K, F):
+def solve_system(K, F, rtol=1e-10, maxiter=None):
     """
     Resolve o sistema linear Ku = F, onde K é uma matriz esparsa e F é um vetor.
 
+    Se K for um operador sem matriz montada (scipy.sparse.linalg.LinearOperator, por exemplo
+    MatrixFreeStiffness), o sistema é resolvido pelo método dos gradientes conjugados, com
+    pré-condicionador de Jacobi quando o operador fornece diagonal().
+
     Parâmetros:
-    K (scipy.sparse matrix): Matriz de rigidez do sistema.
+    K (scipy.sparse matrix ou LinearOperator): Matriz de rigidez do sistema.
     F (numpy array): Vetor de for a do sistema.
+    rtol (float): Tolerância relativa do resíduo para o método iterativo.
+    maxiter (int): Número máximo de iterações do método iterativo.
 
     Retorna:
     u (numpy array): Vetor de deslocamento do sistema.
@@ -18,6 +24,7 @@ def solve_system(K, F):
     Exce es:
     ValueError: se K ou F forem nulos.
     TypeError: se K ou F tiverem tipos errados.
+    RuntimeError: se o método iterativo não convergir.
     """
     if K is None or F is None:
         raise ValueError("K e F não podem ser nulos")
@@ -25,6 +32,17 @@ def solve_system(K, F):
     #     raise TypeError("K deve ser uma matriz esparsa")
     if not isinstance(F, np.ndarray):
         raise TypeError("F deve ser um vetor numpy")
+
+    # Operador sem matriz montada: gradientes conjugados com pré-condicionador de Jacobi
+    if isinstance(K, spla.LinearOperator):
+        M = None
+        if hasattr(K, 'diagonal'):
+            inverse_diagonal = 1.0 / K.diagonal()
+            M = spla.LinearOperator(K.shape, matvec=lambda r: inverse_diagonal * np.ravel(r), dtype=np.float64)
+        u, info = spla.cg(K, F, rtol=rtol, maxiter=maxiter, M=M)
+        if info != 0:
+            raise RuntimeError(f"Gradientes conjugados não convergiram (info = {info})")
+        return u
     
     # u = lil.solve(K, F)
     u = spla.spsolve(K,F)
@@ -0,0 +1,102 @@
+import hashlib
+from collections import OrderedDict
+import numpy as np
+from scipy.sparse import csr_matrix
+from memory_mode import get_memory_mode, index_dtype
+
+# Cache dos padrões de esparsidade já calculados, indexado pela malha. Cada padrão guarda um mapa
+# de n_elementos * n_nos_elemento**2 índices, então só os mais recentes são mantidos (LRU): uma
+# varredura de níveis e ordens não acumula os padrões de todas as malhas já montadas
+PATTERN_CACHE_SIZE = 4
+_pattern_cache = OrderedDict()
+
+def symbolic_assembly(elements, num_nodes):
+    """
+    Fase simbólica da montagem: calcula o padrão CSR da matriz global e o mapa de cada
+    entrada local (e, i, j) para a posição correspondente em K.data.
+
+    No modo de memória 'compact', indptr, indices e scatter_map são armazenados como int32
+    sempre que o número de nós e de entradas não nulas permite.
+
+    Args:
+    - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento).
+    - num_nodes (int): Número total de nós da malha.
+
+    Returns:
+    - pattern (tuple): Tupla (indptr, indices, scatter_map) onde:
+        - indptr (ndarray): Ponteiros de linha do formato CSR, tamanho num_nodes + 1.
+        - indices (ndarray): Índices de coluna do formato CSR, ordenados em cada linha.
+        - scatter_map (ndarray): Posição em K.data de cada entrada local, tamanho n_elementos * n_nos_elemento**2.
+    """
+    elements = np.asarray(elements, dtype=np.int64)
+    num_element_nodes = elements.shape[1]
+
+    # Índices globais (linha, coluna) de cada entrada local
+    rows = np.repeat(elements, num_element_nodes, axis=1).ravel()
+    cols = np.tile(elements, (1, num_element_nodes)).ravel()
+
+    # Chaves únicas em ordem linha-coluna correspondem exatamente à ordem CSR
+    keys = rows * num_nodes + cols
+    unique_keys, scatter_map = np.unique(keys, return_inverse=True)
+
+    # Estrutura CSR (índices em 32 bits quando o modo de memória e os tamanhos permitem)
+    dtype = index_dtype(max(num_nodes, unique_keys.size))
+    indices = (unique_keys % num_nodes).astype(dtype)
+    indptr = np.zeros(num_nodes + 1, dtype=dtype)
+    np.cumsum(np.bincount(unique_keys // num_nodes, minlength=num_nodes), out=indptr[1:])
+
+    return indptr, indices, scatter_map.ravel().astype(dtype)
+
+def numeric_assembly(pattern, K_local, num_nodes):
+    """
+    Fase numérica da montagem: soma as matrizes locais diretamente em K.data usando o mapa
+    calculado na fase simbólica.
+
+    Args:
+    - pattern (tuple): Padrão (indptr, indices, scatter_map) retornado por symbolic_assembly.
+    - K_local (ndarray): Matrizes locais, formato (n_elementos, n_nos_elemento, n_nos_elemento).
+    - num_nodes (int): Número total de nós da malha.
+
+    Returns:
+    - K (scipy.sparse.csr_matrix): A matriz global montada.
+    """
+    indptr, indices, scatter_map = pattern
+    if K_local.size != scatter_map.size:
+        raise ValueError("As matrizes locais não correspondem ao padrão de esparsidade.")
+
+    data = np.bincount(scatter_map, weights=K_local.ravel(), minlength=indices.size)
+
+    return csr_matrix((data, indices, indptr), shape=(num_nodes, num_nodes))
+
+def get_sparsity_pattern(elements, num_nodes):
+    """
+    Retorna o padrão de esparsidade da malha, executando a fase simbólica apenas na primeira
+    vez que a malha é vista (entre as PATTERN_CACHE_SIZE usadas mais recentemente).
+
+    Args:
+    - elements (ndarray): Conectividade da malha, formato (n_elementos, n_nos_elemento).
+    - num_nodes (int): Número total de nós da malha.
+
+    Returns:
+    - pattern (tuple): Padrão (indptr, indices, scatter_map), ver symbolic_assembly.
+    """
+    # A chave inclui o tipo da conectividade e o modo de memória (que define o tipo dos índices)
+    elements = np.ascontiguousarray(elements)
+    key = (num_nodes, elements.shape, elements.dtype.str, get_memory_mode(),
+           hashlib.blake2b(elements.data, digest_size=16).hexdigest())
+
+    if key in _pattern_cache:
+        _pattern_cache.move_to_end(key)
+        return _pattern_cache[key]
+
+    pattern = symbolic_assembly(elements, num_nodes)
+    _pattern_cache[key] = pattern
+    while len(_pattern_cache) > PATTERN_CACHE_SIZE:
+        _pattern_cache.popitem(last=False)
+    return pattern
+
+def clear_sparsity_pattern_cache():
+    """
+    Esvazia o cache de padrões de esparsidade.
+    """
+    _pattern_cache.clear()
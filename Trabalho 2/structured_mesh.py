@@ -0,0 +1,174 @@
+import numpy as np
+from lagrange_basis import reference_nodes
+
+# Tags dos lados do retângulo (mesma ordem das linhas l1..l4 do gmsh em mesh.generate_mesh)
+BOUNDARY_TAGS = {'bottom': 1, 'right': 2, 'top': 3, 'left': 4}
+
+# Triângulos de cada célula por padrão de diagonal, em vértices da célula unitária (sentido anti-horário)
+_CELL_TRIANGLES = {
+    'right': np.array([[[0, 0], [1, 0], [1, 1]], [[0, 0], [1, 1], [0, 1]]]),
+    'left': np.array([[[0, 0], [1, 0], [0, 1]], [[1, 0], [1, 1], [0, 1]]]),
+}
+
+def structured_rectangle_mesh(nx, ny, element_type='tri', order=1, width=1.0, height=1.0, origin=(0.0, 0.0), pattern='right'):
+    """
+    Gera uma malha estruturada de um retângulo sem gmsh, com todos os arrays montados de uma só vez.
+
+    Os nós formam a grade (order * nx + 1) x (order * ny + 1), numerada com x variando mais rápido;
+    cada célula é um quadrilátero Q_order ou dois triângulos P_order, cujos nós são os pontos da grade
+    na numeração local de lagrange_basis.reference_nodes.
+
+    Args:
+    - nx, ny (int): Número de células nas direções x e y.
+    - element_type (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - order (int): Ordem do polinômio de Lagrange.
+    - width, height (float): Dimensões do retângulo.
+    - origin (tuple): Canto inferior esquerdo do retângulo.
+    - pattern (str): Diagonal das células com triângulos: 'right' (de (0, 0) a (1, 1)), 'left'
+      (de (1, 0) a (0, 1)) ou 'alternate' (alternadas em xadrez).
+
+    Returns:
+    - nodes (ndarray): Coordenadas dos nós, formato (n_nos, 2).
+    - elements (ndarray): Conectividade com índices a partir de zero, formato (n_elementos, n_nos_elemento),
+      int32 (int64 se o número de nós não couber em 32 bits).
+    - boundary_facets (ndarray): Nós de cada aresta do contorno (as duas extremidades e depois os nós
+      internos, no sentido anti-horário do contorno), formato (n_arestas, order + 1).
+    - boundary_tags (ndarray): Lado de cada aresta do contorno (ver BOUNDARY_TAGS), int32.
+    """
+    layout = structured_rectangle_layout(nx, ny, element_type, order)
+    arrays = {name: np.empty(shape, dtype) for name, (dtype, shape) in layout.items()}
+    fill_structured_rectangle(arrays, nx, ny, element_type, order, width, height, origin, pattern)
+    return arrays['nodes'], arrays['elements'], arrays['boundary_facets'], arrays['boundary_tags']
+
+def structured_rectangle_layout(nx, ny, element_type='tri', order=1, node_dtype=np.float64):
+    """
+    Tipos e formatos dos arrays da malha estruturada, para alocá-los antes do preenchimento (por
+    exemplo, como arquivos mapeados em memória; ver mesh_store).
+
+    Returns:
+    - layout (dict): Nome -> (dtype, formato) de 'nodes', 'elements', 'boundary_facets' e 'boundary_tags'.
+    """
+    if not isinstance(nx, (int, np.integer)) or not isinstance(ny, (int, np.integer)) or nx < 1 or ny < 1:
+        raise ValueError("O número de células em cada direção deve ser um inteiro positivo.")
+    if element_type not in ['tri', 'quad']:
+        raise ValueError("Tipo de elemento inválido. Deve ser 'tri' ou 'quad'")
+    if not isinstance(order, (int, np.integer)) or order < 1:
+        raise ValueError("A ordem do polinômio de Lagrange deve ser um inteiro positivo.")
+
+    k = int(order)
+    num_x, num_y = k * nx + 1, k * ny + 1
+    dtype = np.dtype(np.int32 if num_x * num_y - 1 <= np.iinfo(np.int32).max else np.int64)
+    num_element_nodes = (k + 1) * (k + 2) // 2 if element_type == 'tri' else (k + 1) ** 2
+    cells_per_square = 2 if element_type == 'tri' else 1
+
+    return {
+        'nodes': (np.dtype(node_dtype), (num_x * num_y, 2)),
+        'elements': (dtype, (cells_per_square * nx * ny, num_element_nodes)),
+        'boundary_facets': (dtype, (2 * (nx + ny), k + 1)),
+        'boundary_tags': (np.dtype(np.int32), (2 * (nx + ny),)),
+    }
+
+def fill_structured_rectangle(arrays, nx, ny, element_type='tri', order=1, width=1.0, height=1.0, origin=(0.0, 0.0), pattern='right',
+                              block_size=None):
+    """
+    Preenche os arrays alocados com structured_rectangle_layout, por blocos de linhas de células, de
+    modo que malhas maiores que a memória possam ser escritas diretamente em arquivos mapeados.
+
+    Args:
+    - arrays (dict): Arrays de destino ('nodes', 'elements', 'boundary_facets', 'boundary_tags').
+    - nx, ny, element_type, order, width, height, origin, pattern: ver structured_rectangle_mesh.
+    - block_size (int): Número aproximado de elementos por bloco (None: toda a malha de uma vez).
+    """
+    if width <= 0 or height <= 0:
+        raise ValueError("As dimensões do retângulo devem ser maiores que zero.")
+    if pattern not in ['right', 'left', 'alternate']:
+        raise ValueError("Padrão de diagonal inválido. Deve ser 'right', 'left' ou 'alternate'")
+
+    layout = structured_rectangle_layout(nx, ny, element_type, order)
+    dtype = layout['elements'][0]
+    k = int(order)
+    num_x, num_y = k * nx + 1, k * ny + 1
+    cells_per_square = 2 if element_type == 'tri' else 1
+
+    # Linhas de células por bloco
+    rows = ny if block_size is None else max(1, int(block_size) // (cells_per_square * nx))
+
+    # Deslocamento de cada nó local na grade: (i, j) -> j * num_x + i
+    offsets = _cell_offsets(element_type, k, num_x, pattern, dtype)
+
+    # Grade de nós com x variando mais rápido, em blocos de linhas da grade
+    x = origin[0] + np.linspace(0.0, width, num_x)
+    y = origin[1] + np.linspace(0.0, height, num_y)
+    nodes = arrays['nodes'].reshape(num_y, num_x, 2)
+    for start in range(0, num_y, rows * k):
+        stop = min(start + rows * k, num_y)
+        nodes[start:stop, :, 0] = x[None, :]
+        nodes[start:stop, :, 1] = y[start:stop, None]
+
+    # Elementos das células das linhas [start, stop)
+    elements = arrays['elements']
+    cell_x = np.arange(nx, dtype=dtype) * k
+    for start in range(0, ny, rows):
+        stop = min(start + rows, ny)
+
+        # Índice do canto inferior esquerdo de cada célula, formato (linhas, nx)
+        corners = (np.arange(start, stop, dtype=dtype) * k)[:, None] * num_x + cell_x[None, :]
+        if pattern == 'alternate' and element_type == 'tri':
+            # Xadrez: as células com (i + j) par usam a diagonal 'right', as demais a 'left'
+            parity = (np.arange(start, stop)[:, None] + np.arange(nx)[None, :]) % 2 == 0
+            block_offsets = np.where(parity[..., None, None], offsets[0], offsets[1])
+        else:
+            block_offsets = offsets
+        block = corners[:, :, None, None] + block_offsets
+        elements[start * nx * cells_per_square:stop * nx * cells_per_square] = block.reshape(-1, elements.shape[1])
+
+    boundary_facets, boundary_tags = _boundary_facets(nx, ny, k, num_x, num_y, dtype)
+    arrays['boundary_facets'][:] = boundary_facets
+    arrays['boundary_tags'][:] = boundary_tags
+
+def _cell_offsets(element_type, k, num_x, pattern, dtype):
+    """
+    Deslocamentos na grade dos nós locais dos elementos de uma célula: formato (1, n_nos) para
+    quadriláteros, (2, n_nos) para os dois triângulos, ou (2, 2, n_nos) com as diagonais 'right' e
+    'left' no padrão 'alternate'.
+    """
+    if element_type == 'quad':
+        lattice = np.rint((reference_nodes('quad', k) + 1.0) * k / 2).astype(dtype)
+        return (lattice[:, 1] * num_x + lattice[:, 0])[None]
+    if pattern == 'alternate':
+        return np.stack([_triangle_offsets(_CELL_TRIANGLES['right'], k, num_x, dtype),
+                         _triangle_offsets(_CELL_TRIANGLES['left'], k, num_x, dtype)])
+    return _triangle_offsets(_CELL_TRIANGLES[pattern], k, num_x, dtype)
+
+def _triangle_offsets(triangles, k, num_x, dtype):
+    """
+    Deslocamentos na grade dos nós P_k de cada triângulo da célula, formato (n_triangulos, n_nos).
+    """
+    reference = reference_nodes('tri', k)
+    v0, v1, v2 = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    # Ponto da célula unitária v0 + xi (v1 - v0) + eta (v2 - v0), em unidades da grade
+    points = (v0[:, None] + reference[None, :, :1] * (v1 - v0)[:, None] + reference[None, :, 1:] * (v2 - v0)[:, None]) * k
+    lattice = np.rint(points).astype(dtype)
+    return lattice[..., 1] * num_x + lattice[..., 0]
+
+def _boundary_facets(nx, ny, k, num_x, num_y, dtype):
+    """
+    Arestas do contorno no sentido anti-horário: inferior, direito, superior e esquerdo.
+    """
+    local = np.array([0, k] + list(range(1, k)), dtype=dtype)
+    facets, tags = [], []
+
+    # Posições (i, j) na grade dos nós de cada aresta de cada lado
+    starts = np.arange(nx, dtype=dtype)[:, None] * k
+    facets.append(starts + local)                                      # inferior: j = 0, i crescente
+    starts = np.arange(ny, dtype=dtype)[:, None] * k
+    facets.append((starts + local) * num_x + (num_x - 1))              # direito: i = num_x - 1, j crescente
+    starts = (nx - np.arange(nx, dtype=dtype))[:, None] * k
+    facets.append((num_y - 1) * num_x + (starts - local))              # superior: j = num_y - 1, i decrescente
+    starts = (ny - np.arange(ny, dtype=dtype))[:, None] * k
+    facets.append((starts - local) * num_x)                            # esquerdo: i = 0, j decrescente
+
+    for tag, side in zip(BOUNDARY_TAGS.values(), facets):
+        tags.append(np.full(len(side), tag, dtype=np.int32))
+
+    return np.ascontiguousarray(np.concatenate(facets), dtype=dtype), np.concatenate(tags)
@@ -0,0 +1,312 @@
+from functools import lru_cache
+import numpy as np
+from element_geometry import inverse_2x2
+from quadrature import gauss_legendre_rule
+from tabulation_cache import cached_tables
+
+@lru_cache(maxsize=None)
+def tensor_tables(order, num_points_1d):
+    """
+    Tabelas 1D do elemento quadrilátero Q_p de produto tensorial: funções de Lagrange em nós
+    igualmente espaçados de [-1, 1] e suas derivadas nos pontos de Gauss-Legendre.
+
+    As funções de forma do quadrilátero são N_(i,j)(xi, eta) = L_i(xi) * L_j(eta). A numeração
+    local dos nós é: vértices (-1,-1), (1,-1), (1,1), (-1,1); nós internos de cada aresta
+    (0-1, 1-2, 2-3, 3-0) no sentido da aresta; nós interiores em ordem lexicográfica (xi varia
+    mais rápido).
+
+    Args:
+    - order (int): Ordem p do polinômio de Lagrange.
+    - num_points_1d (int): Número de pontos de Gauss em cada direção.
+
+    Returns:
+    - B (ndarray): Valores L_i nos pontos de Gauss, formato (n_pontos_1d, p + 1).
+    - D (ndarray): Derivadas L_i' nos pontos de Gauss, formato (n_pontos_1d, p + 1).
+    - weights (ndarray): Pesos de Gauss 1D, tamanho n_pontos_1d.
+    - tensor_index (ndarray): Índice tensorial i * (p + 1) + j de cada nó local, tamanho (p + 1)**2.
+    """
+    if not isinstance(order, int) or order < 1:
+        raise ValueError("A ordem deve ser um inteiro positivo.")
+    if not isinstance(num_points_1d, int) or num_points_1d < 1:
+        raise ValueError("O número de pontos de Gauss deve ser um inteiro positivo.")
+
+    def compute():
+        points, weights = gauss_legendre_rule(num_points_1d)
+        B, D = lagrange_1d(order, points)
+        return B, D, weights, quad_tensor_index(order)
+
+    B, D, weights, tensor_index = cached_tables('tensor_tables', ('quad', order, num_points_1d),
+                                                ('B', 'D', 'weights', 'tensor_index'), compute)
+
+    for table in (B, D, weights, tensor_index):
+        if table.flags.writeable:
+            table.setflags(write=False)
+
+    return B, D, weights, tensor_index
+
+def lagrange_1d(order, points):
+    """
+    Avalia os polinômios de Lagrange 1D de nós igualmente espaçados em [-1, 1] e suas derivadas.
+
+    Args:
+    - order (int): Ordem p do polinômio.
+    - points (ndarray): Pontos de avaliação em [-1, 1].
+
+    Returns:
+    - B (ndarray): Valores, formato (n_pontos, p + 1).
+    - D (ndarray): Derivadas, formato (n_pontos, p + 1).
+    """
+    nodes = np.linspace(-1.0, 1.0, order + 1)
+    points = np.asarray(points, dtype=float)
+    differences = points[:, None] - nodes[None, :]
+    B = np.ones((len(points), order + 1))
+    D = np.zeros((len(points), order + 1))
+
+    for i in range(order + 1):
+        others = [m for m in range(order + 1) if m != i]
+        denominator = np.prod(nodes[i] - nodes[others])
+        B[:, i] = np.prod(differences[:, others], axis=1) / denominator
+        # Derivada do produto: soma dos produtos omitindo um fator de cada vez
+        for k in others:
+            rest = [m for m in others if m != k]
+            D[:, i] += np.prod(differences[:, rest], axis=1) / denominator
+
+    return B, D
+
+def quad_tensor_index(order):
+    """
+    Índice tensorial i * (p + 1) + j de cada nó local do quadrilátero Q_p (ver tensor_tables).
+
+    Args:
+    - order (int): Ordem p do polinômio.
+
+    Returns:
+    - tensor_index (ndarray): Índices tensoriais na numeração local, tamanho (p + 1)**2.
+    """
+    p = order
+    positions = [(0, 0), (p, 0), (p, p), (0, p)]
+    positions += [(k, 0) for k in range(1, p)]
+    positions += [(p, k) for k in range(1, p)]
+    positions += [(p - k, p) for k in range(1, p)]
+    positions += [(0, p - k) for k in range(1, p)]
+    positions += [(i, j) for j in range(1, p) for i in range(1, p)]
+    return np.array([i * (p + 1) + j for i, j in positions], dtype=np.int64)
+
+def to_tensor(values, tensor_index, order):
+    """
+    Reordena valores nodais por elemento da numeração local para o formato tensorial.
+
+    Args:
+    - values (ndarray): Valores na numeração local, formato (n_elementos, (p + 1)**2, ...).
+    - tensor_index (ndarray): Índices tensoriais retornados por quad_tensor_index.
+    - order (int): Ordem p do polinômio.
+
+    Returns:
+    - tensor (ndarray): Valores em formato (n_elementos, p + 1, p + 1, ...), eixos (i, j).
+    """
+    tensor = np.empty_like(values)
+    tensor[:, tensor_index] = values
+    return tensor.reshape((values.shape[0], order + 1, order + 1) + values.shape[2:])
+
+def from_tensor(tensor, tensor_index):
+    """
+    Reordena valores em formato tensorial (n_elementos, p + 1, p + 1, ...) para a numeração local.
+    """
+    flat = tensor.reshape((tensor.shape[0], -1) + tensor.shape[3:])
+    return flat[:, tensor_index]
+
+def interpolate_2d(U, A, B):
+    """
+    Contrai U[e, i, j] com A[q, i] e B[s, j] em duas etapas 1D (custo O(p³) por elemento).
+
+    Returns:
+    - V (ndarray): V[e, q, s] = sum_ij A[q, i] * B[s, j] * U[e, i, j].
+    """
+    T = np.einsum('sj,eij...->eis...', B, U)
+    return np.einsum('qi,eis...->eqs...', A, T)
+
+def project_2d(V, A, B):
+    """
+    Operação transposta de interpolate_2d, também em duas etapas 1D.
+
+    Returns:
+    - U (ndarray): U[e, i, j] = sum_qs A[q, i] * B[s, j] * V[e, q, s].
+    """
+    T = np.einsum('qi,eqs...->eis...', A, V)
+    return np.einsum('sj,eis...->eij...', B, T)
+
+def sum_factorized_geometry(node_coords, order, num_points_1d, coefficient=1.0):
+    """
+    Calcula, por fatoração de somas, as coordenadas dos pontos de Gauss, |detJ| ponderado e o
+    fator geométrico D = k * w * |detJ| * invJ @ invJ.T de elementos quadriláteros Q_p.
+
+    Args:
+    - node_coords (ndarray): Coordenadas dos nós de cada elemento na numeração local, formato (n_elementos, (p + 1)**2, 2).
+    - order (int): Ordem p do polinômio.
+    - num_points_1d (int): Número de pontos de Gauss em cada direção.
+    - coefficient (float ou callable): Coeficiente de difusão k ou função k(x, y).
+
+    Returns:
+    - x_gauss (ndarray): Coordenadas físicas dos pontos de Gauss, formato (n_elementos, n_1d, n_1d, 2).
+    - dx (ndarray): Medida w * |detJ| em cada ponto de Gauss, formato (n_elementos, n_1d, n_1d).
+    - factors (ndarray): Entradas 00, 01 e 11 de D, formato (n_elementos, n_1d, n_1d, 3).
+    """
+    B, D, weights, tensor_index = tensor_tables(order, num_points_1d)
+    X = to_tensor(node_coords, tensor_index, order)
+
+    # Coordenadas e derivadas da transformação geométrica nos pontos de Gauss
+    x_gauss = interpolate_2d(X, B, B)
+    x_xi = interpolate_2d(X, D, B)
+    x_eta = interpolate_2d(X, B, D)
+    J = np.stack([x_xi, x_eta], axis=-1)
+
+    detJ, invJ = inverse_2x2(J)
+    dx = np.abs(detJ) * np.outer(weights, weights)
+
+    if callable(coefficient):
+        k_dx = coefficient(x_gauss[..., 0], x_gauss[..., 1]) * dx
+    else:
+        k_dx = coefficient * dx
+
+    factors = np.empty(dx.shape + (3,))
+    factors[..., 0] = (invJ[..., 0, 0] ** 2 + invJ[..., 0, 1] ** 2) * k_dx
+    factors[..., 1] = (invJ[..., 0, 0] * invJ[..., 1, 0] + invJ[..., 0, 1] * invJ[..., 1, 1]) * k_dx
+    factors[..., 2] = (invJ[..., 1, 0] ** 2 + invJ[..., 1, 1] ** 2) * k_dx
+
+    return x_gauss, dx, factors
+
+def sum_factorized_apply(U, factors, order, num_points_1d):
+    """
+    Aplica o operador de rigidez local a valores nodais em formato tensorial, por fatoração
+    de somas (custo O(p³) por elemento).
+
+    Args:
+    - U (ndarray): Valores nodais, formato (n_elementos, p + 1, p + 1) ou (n_elementos, p + 1, p + 1, n_vetores).
+    - factors (ndarray): Fator geométrico retornado por sum_factorized_geometry.
+    - order (int): Ordem p do polinômio.
+    - num_points_1d (int): Número de pontos de Gauss em cada direção.
+
+    Returns:
+    - Y (ndarray): K_e @ U em formato tensorial, mesmo formato de U.
+    """
+    B, D, _, _ = tensor_tables(order, num_points_1d)
+    extra = (None,) * (U.ndim - 3)
+
+    # Gradientes de referência nos pontos de Gauss
+    u_xi = interpolate_2d(U, D, B)
+    u_eta = interpolate_2d(U, B, D)
+
+    # Fluxos
+    f0, f1, f2 = (factors[(..., k) + extra] for k in range(3))
+    flux_xi = f0 * u_xi + f1 * u_eta
+    flux_eta = f1 * u_xi + f2 * u_eta
+
+    # Projeção de volta nos nós
+    return project_2d(flux_xi, D, B) + project_2d(flux_eta, B, D)
+
+def sum_factorized_diagonal(factors, order, num_points_1d):
+    """
+    Diagonal das matrizes de rigidez locais em formato tensorial, por fatoração de somas.
+
+    Returns:
+    - diagonal (ndarray): Diagonal de K_e, formato (n_elementos, p + 1, p + 1).
+    """
+    B, D, _, _ = tensor_tables(order, num_points_1d)
+    return (project_2d(factors[..., 0], D ** 2, B ** 2)
+            + 2 * project_2d(factors[..., 1], D * B, B * D)
+            + project_2d(factors[..., 2], B ** 2, D ** 2))
+
+def sum_factorized_local_systems(node_coords, order, num_points_1d, source_function, coefficient=1.0):
+    """
+    Calcula as matrizes de rigidez e os vetores de força de elementos Q_p por fatoração de
+    somas: cada coluna de K_e é a aplicação do operador local a um vetor unitário
+    (custo O(p⁵) por elemento, em vez de O(p⁶)).
+
+    Args:
+    - node_coords (ndarray): Coordenadas dos nós de cada elemento, formato (n_elementos, (p + 1)**2, 2).
+    - order (int): Ordem p do polinômio.
+    - num_points_1d (int): Número de pontos de Gauss em cada direção.
+    - source_function (callable): Função de fonte f(x, y).
+    - coefficient (float ou callable): Coeficiente de difusão k ou função k(x, y).
+
+    Returns:
+    - K_local (ndarray): Matrizes de rigidez locais, formato (n_elementos, n_nos, n_nos).
+    - F_local (ndarray): Vetores de força locais, formato (n_elementos, n_nos).
+    """
+    B, _, _, tensor_index = tensor_tables(order, num_points_1d)
+    num_elements, num_element_nodes = node_coords.shape[:2]
+
+    x_gauss, dx, factors = sum_factorized_geometry(node_coords, order, num_points_1d, coefficient)
+
+    # Vetores unitários em formato tensorial: (n_elementos, p + 1, p + 1, n_nos)
+    identity = np.broadcast_to(np.eye(num_element_nodes), (num_elements, num_element_nodes, num_element_nodes))
+    columns = sum_factorized_apply(to_tensor(identity, tensor_index, order), factors, order, num_points_1d)
+    K_local = from_tensor(columns, tensor_index)
+
+    # Vetor de força: projeção de f * w * |detJ| nas funções de forma
+    f_dx = source_function(x_gauss[..., 0], x_gauss[..., 1]) * dx
+    F_local = from_tensor(project_2d(f_dx, B, B), tensor_index)
+
+    return K_local, F_local
+
+def sum_factorized_element_errors(node_coords, u_local, order, num_points_1d, exact_solution, exact_gradient):
+    """
+    Calcula as contribuições de cada elemento Q_p para os quadrados dos erros L2 e de energia
+    por fatoração de somas (custo O(p³) por elemento).
+
+    Args:
+    - node_coords (ndarray): Coordenadas dos nós de cada elemento, formato (n_elementos, (p + 1)**2, 2).
+    - u_local (ndarray): Solução numérica nos nós de cada elemento, formato (n_elementos, (p + 1)**2).
+    - order (int): Ordem p do polinômio.
+    - num_points_1d (int): Número de pontos de Gauss em cada direção.
+    - exact_solution (callable): Solução exata u(x, y).
+    - exact_gradient (callable): Gradiente exato, retorna (..., 2).
+
+    Returns:
+    - l2_sq (ndarray): Quadrado do erro L2 em cada elemento.
+    - energy_sq (ndarray): Quadrado do erro de energia em cada elemento.
+    """
+    B, D, weights, tensor_index = tensor_tables(order, num_points_1d)
+    X = to_tensor(node_coords, tensor_index, order)
+    U = to_tensor(u_local, tensor_index, order)
+
+    # Geometria nos pontos de Gauss
+    x_gauss = interpolate_2d(X, B, B)
+    J = np.stack([interpolate_2d(X, D, B), interpolate_2d(X, B, D)], axis=-1)
+    detJ, invJ = inverse_2x2(J)
+    dx = np.abs(detJ) * np.outer(weights, weights)
+
+    # Solução numérica e gradiente físico nos pontos de Gauss
+    u_gauss = interpolate_2d(U, B, B)
+    grad_ref = np.stack([interpolate_2d(U, D, B), interpolate_2d(U, B, D)], axis=-1)
+    grad_u = np.einsum('eqsji,eqsj->eqsi', invJ, grad_ref)
+
+    # Erros por elemento
+    u_exact = exact_solution(x_gauss[..., 0], x_gauss[..., 1])
+    grad_exact = exact_gradient(x_gauss[..., 0], x_gauss[..., 1])
+    l2_sq = np.sum((u_exact - u_gauss) ** 2 * dx, axis=(1, 2))
+    energy_sq = np.sum(np.sum((grad_exact - grad_u) ** 2, axis=-1) * dx, axis=(1, 2))
+
+    return l2_sq, energy_sq
+
+def check_sum_factorization(type_element, num_element_nodes):
+    """
+    Verifica se os elementos admitem o núcleo de fatoração de somas (quadriláteros Q_p completos)
+    e obtém a ordem p a partir do número de nós por elemento.
+
+    Args:
+    - type_element (str): O tipo de elemento: 'tri' para triângulo ou 'quad' para quadrilátero.
+    - num_element_nodes (int): Número de nós por elemento, (p + 1)**2.
+
+    Returns:
+    - degree (int): Ordem p do polinômio de Lagrange.
+
+    Raises:
+    - ValueError: Se os elementos não forem quadriláteros com (p + 1)**2 nós.
+    """
+    if type_element != 'quad':
+        raise ValueError("A fatoração de somas só está disponível para quadriláteros ('quad').")
+    degree = int(round(np.sqrt(num_element_nodes))) - 1
+    if degree < 1 or (degree + 1) ** 2 != num_element_nodes:
+        raise ValueError(f"Elementos Q_p devem ter (p + 1)**2 nós, mas têm {num_element_nodes}.")
+    return degree
@@ -0,0 +1,158 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# Versão do código das tabulações: altere sempre que a base, a quadratura ou a numeração local
+# mudarem, para que entradas antigas não sejam reaproveitadas
+CACHE_VERSION = '3'
+
+# Diretório e limite de tamanho lidos do ambiente, para que processos filhos herdem a configuração
+CACHE_DIR_ENV = 'FEM_TABULATION_CACHE'
+CACHE_MAX_BYTES_ENV = 'FEM_TABULATION_CACHE_MAX_BYTES'
+DEFAULT_MAX_BYTES = 512 * 2**20
+
+def set_cache_dir(path, max_bytes=None):
+    """
+    Ativa (ou desativa, com path=None) o cache em disco das tabulações de base e quadratura.
+
+    A configuração é guardada em variáveis de ambiente, de modo que processos de trabalho
+    iniciados depois (por exemplo, em parallel_assembly) usem o mesmo diretório.
+
+    Args:
+    - path (str): Diretório do cache; None desativa o cache.
+    - max_bytes (int): Tamanho máximo do cache; as entradas usadas há mais tempo são removidas.
+    """
+    if path is None:
+        os.environ.pop(CACHE_DIR_ENV, None)
+    else:
+        os.environ[CACHE_DIR_ENV] = os.fspath(path)
+    if max_bytes is not None:
+        if max_bytes <= 0:
+            raise ValueError("O tamanho máximo do cache deve ser positivo.")
+        os.environ[CACHE_MAX_BYTES_ENV] = str(int(max_bytes))
+
+def get_cache_dir():
+    """
+    Retorna o diretório da versão atual do cache, ou None se o cache estiver desativado.
+    """
+    root = os.environ.get(CACHE_DIR_ENV)
+    if not root:
+        return None
+    return os.path.join(root, f"v{CACHE_VERSION}")
+
+def cached_tables(kind, key, names, compute):
+    """
+    Retorna as tabelas de uma entrada do cache, calculando-as e gravando-as se necessário.
+
+    Cada entrada é um diretório com um arquivo .npy por array, carregado com mmap_mode='r': os
+    processos que leem a mesma entrada compartilham as páginas do arquivo. A gravação é atômica
+    (diretório temporário renomeado), então processos concorrentes podem preencher o cache.
+
+    Args:
+    - kind (str): Tipo da tabela (por exemplo 'reference_tables').
+    - key (tuple): Parâmetros da tabela: (tipo de elemento, ordem, grau/ordem da quadratura, ...).
+    - names (tuple): Nomes dos arrays retornados por compute.
+    - compute (callable): Função sem argumentos que calcula a tupla de arrays.
+
+    Returns:
+    - arrays (tuple): Arrays da entrada (somente leitura), na ordem de names.
+    """
+    directory = get_cache_dir()
+    if directory is None:
+        return compute()
+
+    entry = os.path.join(directory, '-'.join([kind] + [str(part) for part in key]))
+    arrays = _load_entry(entry, names)
+    if arrays is not None:
+        return arrays
+
+    arrays = compute()
+    try:
+        _store_entry(directory, entry, names, arrays)
+        evict_cache(directory)
+    except OSError:
+        # Cache indisponível (disco cheio, sem permissão): segue com as tabelas calculadas
+        return arrays
+
+    loaded = _load_entry(entry, names)
+    return arrays if loaded is None else loaded
+
+def _load_entry(entry, names):
+    """
+    Carrega uma entrada com mmap_mode='r' e marca seu último uso (para a remoção LRU).
+    """
+    try:
+        arrays = tuple(np.load(os.path.join(entry, f"{name}.npy"), mmap_mode='r') for name in names)
+        os.utime(entry)
+    except (OSError, ValueError):
+        return None
+    return arrays
+
+def _store_entry(directory, entry, names, arrays):
+    """
+    Grava uma entrada em um diretório temporário e o renomeia para o nome final.
+    """
+    os.makedirs(directory, exist_ok=True)
+    temporary = tempfile.mkdtemp(dir=directory, prefix='.tmp-')
+    try:
+        for name, array in zip(names, arrays):
+            np.save(os.path.join(temporary, f"{name}.npy"), np.asarray(array))
+        try:
+            os.rename(temporary, entry)
+        except OSError:
+            # Outro processo gravou a mesma entrada primeiro
+            if not os.path.isdir(entry):
+                raise
+    finally:
+        shutil.rmtree(temporary, ignore_errors=True)
+
+def cache_size(directory=None):
+    """
+    Tamanho em bytes de cada entrada do cache.
+
+    Returns:
+    - sizes (dict): Caminho da entrada -> (último uso, bytes).
+    """
+    directory = get_cache_dir() if directory is None else directory
+    sizes = {}
+    if directory is None or not os.path.isdir(directory):
+        return sizes
+
+    for name in os.listdir(directory):
+        entry = os.path.join(directory, name)
+        if name.startswith('.tmp-') or not os.path.isdir(entry):
+            continue
+        try:
+            nbytes = sum(os.path.getsize(os.path.join(entry, file)) for file in os.listdir(entry))
+            sizes[entry] = (os.path.getmtime(entry), nbytes)
+        except OSError:
+            continue
+    return sizes
+
+def evict_cache(directory=None, max_bytes=None):
+    """
+    Remove as entradas usadas há mais tempo até o cache caber em max_bytes.
+
+    Args:
+    - directory (str): Diretório do cache (padrão: o da versão atual).
+    - max_bytes (int): Limite em bytes (padrão: FEM_TABULATION_CACHE_MAX_BYTES ou 512 MiB).
+    """
+    if max_bytes is None:
+        max_bytes = int(os.environ.get(CACHE_MAX_BYTES_ENV, DEFAULT_MAX_BYTES))
+
+    sizes = cache_size(directory)
+    total = sum(nbytes for _, nbytes in sizes.values())
+    for entry, (_, nbytes) in sorted(sizes.items(), key=lambda item: item[1][0]):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= nbytes
+
+def clear_cache(directory=None):
+    """
+    Remove todas as entradas do cache da versão atual.
+    """
+    directory = get_cache_dir() if directory is None else directory
+    if directory is not None:
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Os módulos usam importações planas (from memory_mode import ...): os testes os importam a partir
+# do diretório do trabalho, como os scripts executados nele
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
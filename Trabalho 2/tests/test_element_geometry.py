@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from element_geometry import element_geometry
+from memory_mode import set_memory_mode
+from mesh import generate_mesh
+from quadrature_selection import quadrature_degrees
+from reference_tables import reference_tables
+
+@pytest.fixture
+def compact_mode():
+    set_memory_mode('compact')
+    yield
+    set_memory_mode('standard')
+
+@pytest.mark.parametrize('element_type', ['tri', 'quad'])
+@pytest.mark.parametrize('order', [2, 3])
+def test_compact_structured_mesh_is_affine(compact_mode, element_type, order):
+    nodes, elements = generate_mesh(1.0, 4, element_type, order)
+    assert nodes.dtype == np.float32
+
+    # As rotinas de montagem convertem as coordenadas para float64 antes da geometria
+    vertices = np.asarray(nodes, dtype=float)
+    _, _, _, dN = reference_tables(element_type, 2 * order, elements.shape[1])
+    _, _, _, is_affine = element_geometry(vertices[elements], dN)
+    assert np.all(is_affine)
+
+    degrees = quadrature_degrees(vertices, elements, element_type, ('stiffness',))
+    assert degrees == quadrature_degrees(vertices, elements, element_type, ('stiffness',), affine=True)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from assemble_system_vectorized import assemble_system_vectorized
+from mesh import generate_mesh
+from numba_kernels import NUMBA_AVAILABLE, element_coloring, set_backend
+
+pytestmark = pytest.mark.skipif(not NUMBA_AVAILABLE, reason="Numba não está instalado")
+
+# Tolerância documentada em numba_kernels.set_backend, relativa ao maior |K_ij| e |F_i|
+TOLERANCE = 1e-12
+
+@pytest.fixture
+def backends():
+    yield
+    set_backend('numpy')
+
+@pytest.mark.parametrize('element_type', ['tri', 'quad'])
+@pytest.mark.parametrize('order', [1, 2, 3])
+def test_numba_matches_numpy_within_tolerance(backends, element_type, order):
+    nodes, elements = generate_mesh(1.0, 4, element_type, order)
+
+    set_backend('numpy')
+    K_numpy, F_numpy = assemble_system_vectorized(nodes, elements, order, element_type)
+    set_backend('numba')
+    K_numba, F_numba = assemble_system_vectorized(nodes, elements, order, element_type)
+
+    assert abs(K_numba - K_numpy).max() <= TOLERANCE * abs(K_numpy).max()
+    assert np.abs(F_numba - F_numpy).max() <= TOLERANCE * np.abs(F_numpy).max()
+
+def test_coloring_beyond_64_colors():
+    # Leque de triângulos em torno de um nó: todos os elementos se tocam e precisam de cores distintas
+    num_triangles = 150
+    angles = np.linspace(0, 2 * np.pi, num_triangles, endpoint=False)
+    nodes = np.vstack([[0.0, 0.0], np.column_stack([np.cos(angles), np.sin(angles)])])
+    elements = np.array([[0, 1 + i, 1 + (i + 1) % num_triangles] for i in range(num_triangles)])
+
+    order_by_color, color_offsets = element_coloring(elements, len(nodes))
+    assert len(color_offsets) - 1 == num_triangles
+    assert np.array_equal(np.sort(order_by_color), np.arange(num_triangles))
@@ -0,0 +1,17 @@
+import numpy as np
+import parallel_assembly
+from mesh import generate_mesh
+from parallel_assembly import assemble_system_parallel
+
+def test_parallel_assembly_is_identical_for_any_number_of_workers(monkeypatch):
+    # Blocos pequenos: as fronteiras dos blocos caem no meio da malha
+    monkeypatch.setattr(parallel_assembly, 'ASSEMBLY_BLOCK_SIZE', 37)
+    nodes, elements = generate_mesh(1.0, 4, 'tri', 2)
+
+    K_reference, F_reference = assemble_system_parallel(nodes, elements, 2, 'tri', num_workers=1)
+    for num_workers in (2, 3, 4):
+        K, F = assemble_system_parallel(nodes, elements, 2, 'tri', num_workers=num_workers)
+        assert np.array_equal(K.indptr, K_reference.indptr)
+        assert np.array_equal(K.indices, K_reference.indices)
+        assert np.array_equal(K.data, K_reference.data)
+        assert np.array_equal(F, F_reference)
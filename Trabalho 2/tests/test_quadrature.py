@@ -0,0 +1,22 @@
+from math import factorial
+
+import numpy as np
+import pytest
+from quadrature import rule_by_points
+
+@pytest.mark.parametrize('num_points, degree', [(1, 1), (3, 2), (4, 3), (6, 4), (7, 5)])
+def test_symmetric_triangle_rules_are_exact(num_points, degree):
+    points, weights = rule_by_points('tri', num_points)
+    assert len(weights) == num_points
+
+    # Integral de x^i y^j no triângulo de referência: i! j! / (i + j + 2)!
+    for i in range(degree + 1):
+        for j in range(degree + 1 - i):
+            exact = factorial(i) * factorial(j) / factorial(i + j + 2)
+            approx = np.sum(weights * points[:, 0] ** i * points[:, 1] ** j)
+            assert approx == pytest.approx(exact, abs=1e-14)
+
+@pytest.mark.parametrize('num_points', [2, 5, 9, 10, 16])
+def test_triangle_without_symmetric_rule_raises(num_points):
+    with pytest.raises(ValueError):
+        rule_by_points('tri', num_points)